@@ -0,0 +1,449 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import timedelta
+from itertools import zip_longest
+from typing import List, Dict, Any, Optional, Iterable, AsyncIterator, Callable, Awaitable, Tuple
+import requests
+from requests.structures import CaseInsensitiveDict
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
+from .inserter import HubSpotInserter, EncodedBody, BatchTooLarge, SubBatch, MARKETING_OBJECT_TYPES, _before_retry
+from .rate_limiter import AsyncTokenBucket
+from .journal import RunJournal
+from .retry import is_retryable, is_payload_too_large, wait_retry_after
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only needed for the asyncio backend (--async-io)
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a job iterator read from a worker thread
+_DONE = object()
+
+
+def _as_response(raw: Any, content: bytes, url: str, elapsed: float) -> requests.Response:
+    """
+    Copy an aiohttp response into a requests.Response, so retry predicates, Retry-After handling,
+    error parsing and batch splitting treat responses from both backends the same way.
+    """
+    response = requests.Response()
+    response.status_code = raw.status
+    response.reason = raw.reason
+    response.headers = CaseInsensitiveDict(raw.headers)
+    response._content = content
+    response.encoding = raw.charset
+    response.url = url
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+class AsyncHubSpotInserter(HubSpotInserter):
+    """
+    HubSpotInserter on asyncio and aiohttp. batch_insert, insert_campaign_sub_items and
+    associate_assets_to_campaigns are coroutines with the same arguments and results; requests are
+    tasks instead of threads, so hundreds can wait on the network at once (bounded by `concurrency`
+    through a semaphore) without a thread each.
+    This mostly helps the endpoints without a batch API (forms, marketing emails, marketing events,
+    budget/spend items and asset links), which are sent one record per request.
+    Batching, journaling, dead-lettering, validation and metrics work as in HubSpotInserter.
+    Must be used from a single event loop; BlockingAsyncInserter drives it from synchronous code.
+    Archiving and the Imports API upload stay synchronous: use HubSpotInserter for them.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        if aiohttp is None:
+            raise ImportError("The asyncio backend requires aiohttp. Install it with: pip install aiohttp")
+        super().__init__(*args, **kwargs)
+        # Paces tasks without blocking the event loop; rate_limit is requests per 10 seconds
+        self.limiter = AsyncTokenBucket(self.limiter.rate)
+        # The requests session of HubSpotInserter is never used; requests go through this client
+        self.session.close()
+        self.client: Optional["aiohttp.ClientSession"] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        if self.schema is not None:
+            self.schema.fetch = self._fetch_from_thread
+
+    def _client(self) -> "aiohttp.ClientSession":
+        """The keep-alive client, created on first use inside the running event loop."""
+        if self.client is None:
+            self.loop = asyncio.get_running_loop()
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            # No total timeout: time spent queued for a pooled connection doesn't count against a request
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+            self.client = aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout)
+        return self.client
+
+    async def close(self):
+        """Release pooled connections."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    async def _request(self, method: str, url: str, json_data: Any = None) -> requests.Response:
+        """
+        Send a single rate-limited request and record its latency. At most `concurrency` are in flight.
+        aiohttp errors are raised as the requests exceptions HubSpotInserter handles.
+        """
+        client = self._client()
+        self.metrics.inc("rate_limit_wait_seconds_total", await self.limiter.acquire())
+
+        headers = {}
+        body = None
+        if json_data is not None:
+            if not isinstance(json_data, EncodedBody):
+                json_data = self._encode(json_data)
+            body = json_data.data
+            headers.update(json_data.headers)
+
+        endpoint = self._endpoint(url)
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                async with client.request(method, url, data=body, headers=headers) as raw:
+                    content = await raw.read()
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    error = requests.exceptions.ReadTimeout(f"{method} {url} timed out after {self.timeout}s")
+                else:
+                    error = requests.exceptions.ConnectionError(f"{method} {url} failed: {e}")
+                self.metrics.inc("http_requests_total", endpoint=endpoint, method=method, status=type(error).__name__)
+                raise error from e
+            elapsed = time.perf_counter() - start
+
+        response = _as_response(raw, content, url, elapsed)
+        self.metrics.observe("http_request_duration_seconds", elapsed, endpoint=endpoint, method=method)
+        self.metrics.inc("http_requests_total", endpoint=endpoint, method=method, status=response.status_code)
+        logger.debug(f"{method} {url} -> {response.status_code} in {elapsed * 1000:.1f} ms")
+
+        self._apply_rate_limit_headers(response)
+        response.raise_for_status()
+        return response
+
+    async def _post_with_retry(self, url: str, json_data: Any) -> requests.Response:
+        return await self._post_encoded_with_retry(url, self._encode(json_data))
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(5),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    async def _post_encoded_with_retry(self, url: str, body: EncodedBody) -> requests.Response:
+        return await self._request("POST", url, body)
+
+    @retry(
+        retry=retry_if_exception(lambda e: is_retryable(e) and not is_payload_too_large(e)),
+        stop=stop_after_attempt(5),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    async def _post_batch_with_retry(self, url: str, body: EncodedBody) -> requests.Response:
+        return await self._request("POST", url, body)
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    async def _put_with_retry(self, url: str) -> requests.Response:
+        return await self._request("PUT", url)
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(5),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    async def _get_with_retry(self, url: str) -> requests.Response:
+        return await self._request("GET", url)
+
+    def _post_file_with_retry(self, *args: Any, **kwargs: Any):
+        raise NotImplementedError("The asyncio backend can't upload import files; use HubSpotInserter.")
+
+    def _delete_with_retry(self, url: str):
+        raise NotImplementedError("The asyncio backend can't delete records; use HubSpotInserter.")
+
+    def _fetch_from_thread(self, url: str) -> requests.Response:
+        """SchemaCache fetch, called on a worker thread by _load_schema; the GET itself runs on the event loop."""
+        return asyncio.run_coroutine_threadsafe(self._get_with_retry(url), self.loop).result()
+
+    async def _dispatch(self, fn: Callable[[Any], Awaitable[Any]], jobs: Iterable[Any]) -> AsyncIterator[Any]:
+        """
+        Run `fn` over `jobs` as tasks, yielding results in job order. Like HubSpotInserter._dispatch,
+        jobs are pulled lazily into a bounded window of 2 x concurrency. Lazy job iterators (which may
+        be generating records) are advanced on a worker thread, so they don't stall requests in flight.
+        """
+        lazy = not isinstance(jobs, (list, tuple))
+        jobs = iter(jobs)
+        pending = deque()
+        try:
+            while True:
+                job = await asyncio.to_thread(next, jobs, _DONE) if lazy else next(jobs, _DONE)
+                if job is _DONE:
+                    break
+                pending.append(asyncio.ensure_future(fn(job)))
+                if len(pending) >= self.concurrency * 2:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def batch_insert(self, object_type: str, records: Iterable[Dict[str, Any]], start_offset: int = 0,
+                           on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        """Batch insert records. Returns list of IDs of created objects, as HubSpotInserter.batch_insert."""
+        if not self.token and object_type != "dry_run":
+            raise ValueError("HubSpot Access Token is missing. Please set HUBSPOT_ACCESS_TOKEN.")
+
+        if object_type == "forms":
+            return await self._insert_sequential(object_type, records, f"{self.base_marketing_url}/forms",
+                                                 start_offset, on_created)
+        elif object_type == "marketing_emails":
+            return await self._insert_sequential(object_type, records, f"{self.base_marketing_url}/emails",
+                                                 start_offset, on_created)
+        elif object_type == "marketing_events":
+            return await self._insert_sequential(object_type, records,
+                                                 f"{self.base_marketing_url}/marketing-events/events", start_offset,
+                                                 on_created)
+        elif object_type == "campaigns":
+            return await self._insert_batch_generic(object_type, records,
+                                                    f"{self.base_marketing_url}/campaigns/batch/create", start_offset,
+                                                    on_created)
+        else:
+            return await self._insert_batch_generic(object_type, records, self._crm_batch_url(object_type),
+                                                    start_offset, on_created)
+
+    async def _insert_batch_generic(self, object_type: str, records: Iterable[Dict[str, Any]], url: str,
+                                    start_offset: int = 0,
+                                    on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        total = f"{len(records)} " if hasattr(records, "__len__") else ""
+        logger.info(f"Starting batch insert for {total}{object_type} "
+                    f"(concurrency={self.concurrency}, rate limit={self.limiter.rate}/10s, asyncio)...")
+        all_created_ids = self._resumed_ids(object_type, start_offset)
+        if all_created_ids and on_created:
+            on_created(list(all_created_ids))
+
+        jobs = self._batch_jobs(object_type, records, url, start_offset)
+        async for placed in self._dispatch(lambda job: self._send_batch(*job), jobs):
+            ids = [record_id for _, record_id in placed]
+            all_created_ids.extend(ids)
+            if on_created:
+                on_created(ids)
+
+        logger.info(f"Finished batch insert for {object_type}: {len(all_created_ids)} records created.")
+        return all_created_ids
+
+    async def batch_insert_many(self, datasets: Dict[str, Iterable[Dict[str, Any]]],
+                                start_offsets: Optional[Dict[str, int]] = None) -> Dict[str, List[Tuple[int, str]]]:
+        """Batch insert several CRM object types through one dispatch window, as HubSpotInserter.batch_insert_many."""
+        start_offsets = start_offsets or {}
+        logger.info(f"Starting batch insert for {', '.join(datasets)} "
+                    f"(concurrency={self.concurrency}, rate limit={self.limiter.rate}/10s, asyncio)...")
+        created = {
+            object_type: self._resumed_placed_ids(object_type, start_offsets.get(object_type, 0))
+            for object_type in datasets
+        }
+
+        streams = [
+            self._batch_jobs(object_type, records, self._crm_batch_url(object_type), start_offsets.get(object_type, 0))
+            for object_type, records in datasets.items()
+        ]
+        jobs = (job for round_jobs in zip_longest(*streams) for job in round_jobs if job is not None)
+
+        async def send(job):
+            return job[0], await self._send_batch(*job)
+
+        async for object_type, placed in self._dispatch(send, jobs):
+            created[object_type].extend(placed)
+
+        for object_type, placed in created.items():
+            logger.info(f"Finished batch insert for {object_type}: {len(placed)} records created.")
+        return created
+
+    async def _send_batch(self, object_type: str, url: str, offset: int, chunk: List[Dict[str, Any]],
+                          validated: bool = False) -> List[Tuple[int, str]]:
+        """
+        Send a single batch/create request, as HubSpotInserter._send_batch.
+        Returns the (position, ID) of each created record (none on failure).
+        """
+        label = f"batch of records {offset + 1}-{offset + len(chunk)}"
+        key = str(offset)
+        payload_hash, done = self._journal_lookup(object_type, key, chunk)
+        if done:
+            logger.info(f"Skipping {label} (completed in run {self.journal.run_id}).")
+            return RunJournal.placed_ids(done)
+
+        positions, settled = [], []
+        try:
+            await self._load_schema(object_type)
+            positions, records = self._preflight_positions(object_type, chunk, report=not validated)
+            if records:
+                await self._create_with_bisection(object_type, url, records, label, settled, split_too_large=True)
+        except BatchTooLarge:
+            middle = len(chunk) // 2
+            return (await self._send_batch(object_type, url, offset, chunk[:middle], validated=True) +
+                    await self._send_batch(object_type, url, offset + middle, chunk[middle:], validated=True))
+        except requests.exceptions.RequestException as e:
+            return self._batch_failed(object_type, label, e, offset, chunk, positions, settled)
+        placed = [pair for sub in sorted(settled) for pair in self._placed(offset, positions, sub)]
+        self._chunk_created(object_type, key, placed, payload_hash, offset, len(chunk))
+        return placed
+
+    async def _load_schema(self, object_type: str):
+        """Load the schema _preflight_positions validates against, if any, without blocking the event loop."""
+        if self.schema is not None and object_type not in MARKETING_OBJECT_TYPES:
+            # SchemaCache blocks (disk cache, fetch), so the schema is loaded once on a worker thread.
+            # Its GET is scheduled back onto this loop, which _client() records.
+            self._client()
+            await asyncio.to_thread(self.schema.validator, object_type)
+
+    async def _create_with_bisection(self, object_type: str, url: str, chunk: List[Dict[str, Any]], label: str,
+                                     settled: List[SubBatch], start: int = 0,
+                                     split_too_large: bool = False) -> List[str]:
+        """POST a batch/create, splitting rejected batches as HubSpotInserter._create_with_bisection does."""
+        body = self._batch_body(object_type, chunk)
+        try:
+            response = await self._batch_poster(chunk, split_too_large)(url, body)
+        except requests.exceptions.RequestException as e:
+            if not self._should_split(object_type, chunk, body, label, e, split_too_large, settled, start):
+                return []
+            middle = len(chunk) // 2
+            # Both halves finish before an error is raised, so `settled` is complete when it is journaled
+            halves = await asyncio.gather(
+                self._create_with_bisection(object_type, url, chunk[:middle], label, settled, start),
+                self._create_with_bisection(object_type, url, chunk[middle:], label, settled, start + middle),
+                return_exceptions=True)
+            for half in halves:
+                if isinstance(half, BaseException):
+                    raise half
+            return halves[0] + halves[1]
+        return self._batch_created(object_type, chunk, body, label, response, settled, start)
+
+    async def _insert_sequential(self, object_type: str, records: Iterable[Dict[str, Any]], url: str,
+                                 start_offset: int = 0,
+                                 on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        """One POST per record, `concurrency` of them at a time. IDs are returned in record order."""
+        logger.info(f"Starting insert of one {object_type} per request (concurrency={self.concurrency}, asyncio)...")
+        created_ids = self._resumed_ids(object_type, start_offset)
+        if created_ids and on_created:
+            on_created(list(created_ids))
+        jobs = enumerate(records, start=start_offset)
+        if isinstance(records, (list, tuple)):
+            jobs = list(jobs)
+        async for ids in self._dispatch(lambda job: self._insert_one(object_type, url, *job), jobs):
+            created_ids.extend(ids)
+            if on_created and ids:
+                on_created(ids)
+        logger.info(f"Finished insert for {object_type}: {len(created_ids)} records created.")
+        return created_ids
+
+    async def _insert_one(self, object_type: str, url: str, index: int, record: Dict[str, Any]) -> List[str]:
+        key = str(index)
+        payload_hash, done = self._journal_lookup(object_type, key, record)
+        if done:
+            return done["ids"]
+
+        try:
+            response = await self._post_with_retry(url, record)
+        except requests.exceptions.RequestException as e:
+            self._insert_one_failed(object_type, key, index, record, e, payload_hash)
+            return []
+        return self._inserted_one(object_type, key, index, record, response, payload_hash)
+
+    async def insert_campaign_sub_items(self, campaign_ids: List[str], generator):
+        """Add Budget and Spend items to created campaigns."""
+        logger.info(f"Adding Budget and Spend items to {len(campaign_ids)} campaigns...")
+        jobs = self._campaign_sub_item_jobs(campaign_ids, generator)
+        async for _ in self._dispatch(lambda job: self._add_campaign_sub_item(*job), jobs):
+            pass
+
+    async def _add_campaign_sub_item(self, kind: str, campaign_id: str, item: Dict[str, Any]) -> bool:
+        try:
+            await self._post_with_retry(f"{self.base_marketing_url}/campaigns/{campaign_id}/{kind}", item)
+        except Exception as e:
+            return self._link_finished(f"campaign_{kind}", campaign_id, f"adding {kind} to campaign {campaign_id}", e)
+        return self._link_finished(f"campaign_{kind}", campaign_id)
+
+    async def associate_assets_to_campaigns(self, campaign_ids: List[str], asset_map: Dict[str, List[str]]):
+        """Associate assets to campaigns."""
+        logger.info("Associating assets to campaigns...")
+        if not campaign_ids:
+            return
+        await self.link_assets(self._asset_links(campaign_ids, asset_map))
+
+    async def link_assets(self, links: Iterable[Tuple[str, str, str]]) -> int:
+        """Link (campaign_id, asset_type, asset_id) triples through one dispatch window, as HubSpotInserter.link_assets."""
+        jobs = ((campaign_id, asset_type, asset_id) for campaign_id, asset_type, asset_id in links
+                if not self._already_done("campaign_asset", f"{campaign_id}/{asset_type}/{asset_id}"))
+        results = [ok async for ok in self._dispatch(lambda job: self._link_asset(*job), jobs)]
+        logger.info(f"Linked {sum(results)}/{len(results)} assets to campaigns.")
+        return sum(results)
+
+    async def _link_asset(self, campaign_id: str, asset_type: str, asset_id: str) -> bool:
+        url = f"{self.base_marketing_url}/campaigns/{campaign_id}/assets/{asset_type}/{asset_id}"
+        key = f"{campaign_id}/{asset_type}/{asset_id}"
+        try:
+            await self._put_with_retry(url)
+        except Exception as e:
+            return self._link_finished("campaign_asset", key, f"linking {asset_type} {asset_id} to {campaign_id}", e)
+        logger.info(f"Linked {asset_type} {asset_id} to campaign {campaign_id}")
+        return self._link_finished("campaign_asset", key)
+
+    def archive(self, object_type: str, ids: List[str]) -> int:
+        raise NotImplementedError("The asyncio backend can't archive records; use HubSpotInserter.")
+
+
+class BlockingAsyncInserter:
+    """
+    Blocking facade over an AsyncHubSpotInserter for the CLI's run functions (and PortalFanOut threads).
+    Its coroutines run on an event loop owned by a background thread; each call waits for its result.
+    """
+
+    def __init__(self, inserter: AsyncHubSpotInserter):
+        self.inserter = inserter
+        self.journal = inserter.journal
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="async-inserter", daemon=True)
+        self.thread.start()
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def batch_insert(self, object_type: str, records: Iterable[Dict[str, Any]], start_offset: int = 0,
+                     on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        # on_created is called on the event loop thread
+        return self._run(self.inserter.batch_insert(object_type, records, start_offset, on_created))
+
+    def insert_campaign_sub_items(self, campaign_ids: List[str], generator):
+        return self._run(self.inserter.insert_campaign_sub_items(campaign_ids, generator))
+
+    def associate_assets_to_campaigns(self, campaign_ids: List[str], asset_map: Dict[str, List[str]]):
+        return self._run(self.inserter.associate_assets_to_campaigns(campaign_ids, asset_map))
+
+    def link_assets(self, links: Iterable[Tuple[str, str, str]]) -> int:
+        # A lazy `links` iterator is advanced on a worker thread of the event loop
+        return self._run(self.inserter.link_assets(links))
+
+    def log_timing_summary(self):
+        self.inserter.log_timing_summary()
+
+    def close(self):
+        """Release pooled connections and stop the event loop."""
+        try:
+            self._run(self.inserter.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
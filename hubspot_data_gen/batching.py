@@ -0,0 +1,69 @@
+import threading
+from typing import Optional
+from .config import MAX_BATCH_SIZE, MAX_BATCH_BYTES, SLOW_BATCH_SECONDS
+
+# Weight of the latest batch in the running bytes-per-record estimate
+RECORD_BYTES_SMOOTHING = 0.3
+# Fraction of a rejected body's size kept as the byte target, so growing back doesn't hit the same limit
+TOO_LARGE_BACKOFF = 0.9
+
+
+class AdaptiveBatchSizer:
+    """
+    Thread-safe batch size controller for one object type.
+    Batches hold as many records as fit in `max_bytes` (estimated from the encoded size of earlier
+    batches), up to a ceiling that halves when HubSpot rejects a batch as too large, times out or
+    answers slower than `slow_seconds`, and grows back by a tenth of `max_size` after every fast batch.
+    A batch rejected as too large also lowers `max_bytes` below its size for the rest of the run.
+    """
+
+    def __init__(self, max_size: int = MAX_BATCH_SIZE, max_bytes: Optional[int] = MAX_BATCH_BYTES,
+                 slow_seconds: float = SLOW_BATCH_SECONDS):
+        if max_size <= 0:
+            raise ValueError("Batch size must be positive.")
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.slow_seconds = slow_seconds
+        self.step = max(1, max_size // 10)
+        self.ceiling = max_size
+        self.record_bytes: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def size(self) -> int:
+        """Records to put in the next batch."""
+        with self.lock:
+            size = self.ceiling
+            if self.max_bytes and self.record_bytes:
+                size = min(size, int(self.max_bytes // self.record_bytes))
+            return max(1, size)
+
+    def needs_sample(self) -> bool:
+        with self.lock:
+            return self.record_bytes is None
+
+    def sample(self, record_bytes: int):
+        """Initial bytes-per-record estimate, before any batch has been sent."""
+        with self.lock:
+            if self.record_bytes is None:
+                self.record_bytes = float(max(1, record_bytes))
+
+    def observe(self, count: int, body_bytes: int, seconds: float):
+        """Feed back a successful batch of `count` records: its encoded size and response time."""
+        with self.lock:
+            per_record = body_bytes / max(1, count)
+            if self.record_bytes is None:
+                self.record_bytes = per_record
+            else:
+                self.record_bytes += RECORD_BYTES_SMOOTHING * (per_record - self.record_bytes)
+            if seconds > self.slow_seconds:
+                self.ceiling = max(1, min(self.ceiling, count) // 2)
+            else:
+                self.ceiling = min(self.max_size, self.ceiling + self.step)
+
+    def shrink(self, count: int, body_bytes: int) -> int:
+        """A batch of `count` records and `body_bytes` was too large for HubSpot. Returns the new ceiling."""
+        with self.lock:
+            self.ceiling = max(1, min(self.ceiling, count // 2))
+            limit = int(body_bytes * TOO_LARGE_BACKOFF)
+            self.max_bytes = min(self.max_bytes, limit) if self.max_bytes else limit
+            return self.ceiling
@@ -0,0 +1,20 @@
+import logging
+from typing import List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Scenarios whose throughput fell more than `tolerance` below the baseline run."""
+    previous = {result["scenario"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if not before or not before["records_per_sec"]:
+            continue
+        change = result["records_per_sec"] / before["records_per_sec"] - 1
+        logger.info(f"{result['scenario']}: {before['records_per_sec']} -> {result['records_per_sec']} "
+                    f"records/sec ({change:+.1%})")
+        if change < -tolerance:
+            regressions.append(result["scenario"])
+    return regressions
@@ -0,0 +1,181 @@
+"""
+Generator micro-benchmark: records/sec and memory per record for every generator class,
+with the time of each record broken down by Faker provider / RNG call.
+
+    python -m hubspot_data_gen.benchmarks.generators --count 2000 --output generators.json
+    python -m hubspot_data_gen.benchmarks.generators --count 2000 --baseline generators.json
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from collections import defaultdict
+from typing import List, Dict, Any, Type
+from faker import Faker
+
+from .. import generators
+from ..generators.base import BaseGenerator
+from . import compare
+
+logger = logging.getLogger(__name__)
+
+GENERATORS: Dict[str, Type[BaseGenerator]] = {name: getattr(generators, name) for name in generators.__all__}
+
+# Bookkeeping calls that aren't part of producing a record
+UNTIMED = {"seed_instance", "seed", "getstate", "setstate"}
+
+
+class _TimedProxy:
+    """Stands in for a Faker or Random instance and accumulates the time spent in each method it forwards."""
+
+    def __init__(self, target: Any, prefix: str, stats: Dict[str, List[float]]):
+        self._target = target
+        self._prefix = prefix
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if not callable(value) or name in UNTIMED:
+            return value
+        stat = self._stats[f"{self._prefix}.{name}"]
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                stat[0] += time.perf_counter() - start
+                stat[1] += 1
+        return timed
+
+
+def build(cls: Type[BaseGenerator], seed: int, fast: bool) -> BaseGenerator:
+    """A ready generator. Fast mode pools are a one-off cost per generator, so they're built here, not measured."""
+    generator = cls(seed=seed, fast=fast)
+    if generator.fast:
+        generator.generate(1)
+    return generator
+
+
+def measure_throughput(cls: Type[BaseGenerator], count: int, seed: int, fast: bool) -> Dict[str, float]:
+    start = time.perf_counter()
+    generator = build(cls, seed, fast)
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generator.generate(count)
+    elapsed = time.perf_counter() - start
+    return {"setup_seconds": round(setup, 3), "seconds": round(elapsed, 3), "records_per_sec": round(count / elapsed, 1)}
+
+
+def measure_memory(cls: Type[BaseGenerator], count: int, seed: int, fast: bool) -> Dict[str, float]:
+    """Bytes retained per generated record, and peak allocation per record while generating."""
+    generator = build(cls, seed, fast)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records = generator.generate(count)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del records
+    return {
+        "bytes_per_record": round((retained - before) / count),
+        "peak_bytes_per_record": round((peak - before) / count),
+    }
+
+
+def profile_calls(cls: Type[BaseGenerator], count: int, seed: int, fast: bool) -> Dict[str, Any]:
+    """Time per record spent in each Faker provider and RNG method; the rest is building the records."""
+    stats: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+    generator = cls(seed=seed, fast=fast)
+    generator.fake = _TimedProxy(generator.fake, "faker", stats)
+    generator.random = _TimedProxy(generator.random, "random", stats)
+    if generator.fast:
+        # Pool values come from a separate Faker built on first use; pool building is setup, not per-record cost
+        generator._pool_fake = _TimedProxy(Faker(generator.locale), "pool", stats)
+        generator.generate(1)
+        stats.clear()
+
+    start = time.perf_counter()
+    generator.generate(count)
+    total = time.perf_counter() - start
+
+    calls = sorted(stats.items(), key=lambda item: item[1][0], reverse=True)
+    breakdown = [
+        {"call": name, "us_per_record": round(seconds / count * 1e6, 2),
+         "calls_per_record": round(calls / count, 3), "share": round(seconds / total, 4)}
+        for name, (seconds, calls) in calls
+    ]
+    other = total - sum(seconds for seconds, _ in stats.values())
+    breakdown.append({"call": "other", "us_per_record": round(other / count * 1e6, 2),
+                      "calls_per_record": None, "share": round(other / total, 4)})
+    return {"profiled_us_per_record": round(total / count * 1e6, 2), "calls": breakdown}
+
+
+def run_benchmark(name: str, count: int, seed: int, fast: bool) -> Dict[str, Any]:
+    cls = GENERATORS[name]
+    return {
+        "scenario": f"{name} (fast)" if fast else name,
+        "generator": name,
+        "fast": fast,
+        "records": count,
+        **measure_throughput(cls, count, seed, fast),
+        **measure_memory(cls, count, seed, fast),
+        **profile_calls(cls, count, seed, fast),
+    }
+
+
+def print_report(results: List[Dict[str, Any]], top: int):
+    for result in results:
+        setup = f", {result['setup_seconds']}s pool setup" if result["fast"] else ""
+        print(f"{result['scenario']}: {result['records_per_sec']} records/sec{setup}, "
+              f"{result['bytes_per_record']} B/record (peak {result['peak_bytes_per_record']} B)")
+        for call in result["calls"][:top]:
+            per_record = f"{call['calls_per_record']} calls, " if call["calls_per_record"] is not None else ""
+            print(f"    {call['call']:<32} {call['share']:>6.1%}  {per_record}{call['us_per_record']} us/record")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark record generators with per-call profiling.")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--count", type=int, default=1000, help="Records per generator.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=["standard", "fast", "both"], default="both",
+                        help="Per-record generation, --fast pools (where supported), or both.")
+    parser.add_argument("--top", type=int, default=8, help="Calls shown per generator.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", help="JSON results of an earlier run; exit 1 on a throughput regression.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed records/sec drop vs the baseline.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    results = []
+    for name in args.generators:
+        modes = {"standard": [False], "fast": [True], "both": [False, True]}[args.mode]
+        for fast in modes:
+            if fast and not GENERATORS[name].supports_fast():
+                continue
+            logger.info(f"Benchmarking {name}{' (fast)' if fast else ''}...")
+            results.append(run_benchmark(name, args.count, args.seed, fast))
+
+    print_report(results, args.top)
+    report = {"config": vars(args), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            logger.error(f"Throughput regression in: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+End-to-end ingestion benchmark: runs the CLI flows against the bundled mock HubSpot API
+and reports records/sec, request latency and API calls per record.
+
+    python -m hubspot_data_gen.benchmarks.ingestion --count 5000 --concurrency 8 --output bench.json
+    python -m hubspot_data_gen.benchmarks.ingestion --count 5000 --concurrency 8 --baseline bench.json
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import List, Dict, Any, Callable
+
+from ..flows import run_single_object, run_graph, run_marketing_orchestration
+from ..inserter import HubSpotInserter
+from ..mock_server import MockHubSpotServer
+from ..metrics import Metrics
+from ..config import MAX_BATCH_BYTES
+from . import compare
+
+logger = logging.getLogger(__name__)
+
+# Each scenario drives one CLI flow with `count` as its size
+SCENARIOS: Dict[str, Callable[[HubSpotInserter, int, int], None]] = {
+    "contacts": lambda inserter, count, seed: run_single_object(
+        inserter, "contacts", count, False, seed=seed, stream=True, fast=True),
+    "notes": lambda inserter, count, seed: run_single_object(
+        inserter, "notes", count, False, seed=seed, stream=True, fast=True),
+    "forms": lambda inserter, count, seed: run_single_object(
+        inserter, "forms", max(1, count // 100), False, seed=seed),
+    "marketing": lambda inserter, count, seed: run_marketing_orchestration(
+        inserter, max(1, count // 100), False, seed=seed),
+    "graph": lambda inserter, count, seed: run_graph(
+        inserter, max(1, count // 10), False, seed=seed, fast=True),
+}
+
+
+def run_scenario(name: str, server: MockHubSpotServer, args) -> Dict[str, Any]:
+    server.reset()
+    inserter = HubSpotInserter(token="mock", base_url=server.url, concurrency=args.concurrency,
+                               rate_limit=args.rate_limit, pool_size=args.pool_size, gzip_requests=args.gzip,
+                               metrics=Metrics(), max_batch_bytes=args.batch_bytes)
+    start = time.perf_counter()
+    try:
+        SCENARIOS[name](inserter, args.count, args.seed)
+    finally:
+        inserter.close()
+    elapsed = time.perf_counter() - start
+
+    stats = server.snapshot()
+    timings = inserter.timing_summary()
+    records = stats.get("records", 0)
+    return {
+        "scenario": name,
+        "records": records,
+        "seconds": round(elapsed, 3),
+        "records_per_sec": round(records / elapsed, 1) if elapsed else 0.0,
+        "requests": stats.get("requests", 0),
+        "calls_per_record": round(stats.get("requests", 0) / records, 4) if records else None,
+        "p50_ms": round(timings.get("p50", 0) * 1000, 1),
+        "p99_ms": round(timings.get("p99", 0) * 1000, 1),
+        "encode_ms": round(inserter.metrics.counter_total("encode_seconds_total") * 1000, 1),
+        "throttled": stats.get("throttled", 0),
+        "errors": stats.get("errors", 0),
+        "rejected": stats.get("rejected", 0),
+        "too_large": stats.get("too_large", 0),
+    }
+
+
+def print_table(results: List[Dict[str, Any]]):
+    columns = ["scenario", "records", "seconds", "records_per_sec", "requests", "calls_per_record",
+               "p50_ms", "p99_ms", "encode_ms", "throttled", "errors", "rejected", "too_large"]
+    widths = {column: max(len(column), *(len(str(result[column])) for result in results)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for result in results:
+        print("  ".join(str(result[column]).ljust(widths[column]) for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion flows against the mock HubSpot API.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--count", type=int, default=2000, help="Size of each scenario (CRM records).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate-limit", type=int, default=10000, help="Client-side limit, requests per 10 seconds.")
+    parser.add_argument("--pool-size", type=int, default=None)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server latency per request (seconds).")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--server-rate-limit", type=int, default=None, help="Mock server limit per 10 seconds.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--max-body-bytes", type=int, default=None, help="Mock server answers larger bodies with 413.")
+    parser.add_argument("--latency-per-kb", type=float, default=0.0, help="Mock server latency per KB of body.")
+    parser.add_argument("--batch-bytes", type=int, default=MAX_BATCH_BYTES, help="Client-side target body size.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", help="JSON results of an earlier run; exit 1 on a throughput regression.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed records/sec drop vs the baseline.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the flows' INFO logging.")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    server = MockHubSpotServer(latency=args.latency, jitter=args.jitter, rate_limit=args.server_rate_limit,
+                               throttle_rate=args.throttle_rate, error_rate=args.error_rate,
+                               reject_rate=args.reject_rate, seed=args.seed, max_body_bytes=args.max_body_bytes,
+                               latency_per_kb=args.latency_per_kb)
+    with server:
+        results = [run_scenario(name, server, args) for name in args.scenarios]
+
+    print_table(results)
+    report = {"config": vars(args), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            logger.error(f"Throughput regression in: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,77 @@ import os
 
 # HubSpot API Configuration
 ACCESS_TOKEN = os.getenv("HUBSPOT_ACCESS_TOKEN", "")
+API_BASE_URL = os.getenv("HUBSPOT_API_BASE_URL", "https://api.hubapi.com")
 
 # Generation Configuration
 DEFAULT_BATCH_SIZE = 10
 MAX_BATCH_SIZE = 100
+
+# Adaptive Batch Sizing Configuration
+# Target request body per batch; object types with large records get fewer than MAX_BATCH_SIZE per batch
+MAX_BATCH_BYTES = 512 * 1024
+# Batches answered slower than this are halved (requests time out at 60s); faster ones grow back to the max
+SLOW_BATCH_SECONDS = 15.0
+
+# Rate Limiting Configuration
+# HubSpot expresses burst limits per rolling 10 second window (100 for private apps on most tiers).
+RATE_LIMIT_WINDOW = 10.0
+DEFAULT_RATE_LIMIT = 100
+DEFAULT_CONCURRENCY = 1
+
+# Connection Configuration
+# Request bodies at least this large are gzip-compressed when --gzip is enabled.
+GZIP_MIN_BYTES = 32 * 1024
+
+# Parallel Generation Configuration
+# Records per independently-seeded shard; fixed so output doesn't depend on worker count.
+GENERATION_SHARD_SIZE = 1000
+# Distinct values pre-generated per Faker provider in --fast mode
+FAST_POOL_SIZE = 5000
+
+# Upsert Configuration (--upsert)
+# Unique-value property HubSpot matches records on; must exist on every object type upserted besides contacts
+EXTERNAL_ID_PROPERTY = "data_gen_id"
+# Object types with a natural unique property used instead
+UPSERT_ID_PROPERTIES = {
+    "contacts": "email",
+}
+
+# Run Journal Configuration
+# Append-only per-run journals used by --resume
+JOURNAL_DIR = os.getenv("HUBSPOT_JOURNAL_DIR", "runs")
+
+# Schema Validation Configuration (--validate)
+# Property definitions from /crm/v3/properties, cached per portal and object type
+SCHEMA_CACHE_DIR = os.getenv("HUBSPOT_SCHEMA_CACHE_DIR", os.path.join(JOURNAL_DIR, "schemas"))
+SCHEMA_CACHE_TTL = 24 * 60 * 60  # Seconds before cached definitions are fetched again
+
+# Multi-Portal Configuration (--portals)
+# Records a streamed dataset may run ahead of the slowest portal
+PORTAL_QUEUE_SIZE = 1000
+
+# Marketing Orchestration Configuration (--all-marketing)
+# Steps (inserting forms, campaigns, budget/spend items, links) that may run at the same time
+ORCHESTRATION_WORKERS = 4
+
+# Offline Sink Configuration (--sink ndjson/csv/parquet)
+SINK_OUTPUT_DIR = "output"
+SINK_CHUNK_SIZE = 1000
+
+# Bulk Import Configuration (CRM Imports API)
+# Loads at or above this many records switch from batch/create to a CSV import (0 disables)
+IMPORT_THRESHOLD = 100000
+IMPORT_POLL_INTERVAL = 10.0  # Seconds between import status checks
+IMPORT_TIMEOUT = 6 * 60 * 60  # Give up polling after 6 hours
+
+# Graph Orchestration Configuration (--graph)
+# Contacts per company; deals and each engagement type per contact
+GRAPH_FAN_OUT = {
+    "contacts": 3.0,
+    "deals": 0.5,
+    "calls": 1.0,
+    "emails": 0.5,
+    "meetings": 0.5,
+    "notes": 1.0,
+    "tasks": 0.5,
+}
@@ -0,0 +1,85 @@
+"""
+The generate-and-insert flows behind the CLI, shared by main.py and the ingestion benchmark.
+Each takes an inserter (HubSpotInserter, a file sink, HubSpotImporter or PortalFanOut) and drives
+one kind of run through its batch_insert surface.
+"""
+import logging
+from functools import partial
+from typing import Optional
+
+from .generators import (
+    ContactGenerator, CompanyGenerator, DealGenerator, TicketGenerator,
+    CampaignGenerator, FormGenerator, MeetingGenerator,
+    EmailEngagementGenerator, MarketingEventGenerator,
+    CallGenerator, TaskGenerator, NoteGenerator, ProductGenerator,
+    MarketingEmailGenerator
+)
+from .inserter import MARKETING_OBJECT_TYPES
+from .graph import GraphOrchestrator
+from .marketing import MarketingOrchestrator
+from .timeline import Timeline
+
+logger = logging.getLogger(__name__)
+
+
+def get_generator(obj_type: str, seed: Optional[int] = None, fast: bool = False, keyed: bool = False,
+                  timeline: Optional[Timeline] = None):
+    if obj_type == "contacts": return ContactGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "companies": return CompanyGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "deals": return DealGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "tickets": return TicketGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "campaigns": return CampaignGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "forms": return FormGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "meetings": return MeetingGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "emails": return EmailEngagementGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "marketing_events": return MarketingEventGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "calls": return CallGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "tasks": return TaskGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "notes": return NoteGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "products": return ProductGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    elif obj_type == "marketing_emails": return MarketingEmailGenerator(seed=seed, fast=fast, keyed=keyed, timeline=timeline)
+    return None
+
+
+def run_single_object(inserter, obj_type, count, dry_run, workers=1, seed=None, stream=False, fast=False,
+                      upsert=False, timeline=None):
+    generator = get_generator(obj_type, seed, fast, keyed=upsert and obj_type not in MARKETING_OBJECT_TYPES,
+                              timeline=timeline)
+    if not generator:
+        logger.error(f"Unknown Object: {obj_type}")
+        return
+
+    # When resuming, records already inserted by earlier attempts aren't regenerated
+    start = inserter.journal.completed_prefix(obj_type) if inserter.journal and not dry_run else 0
+    if start:
+        logger.info(f"Skipping {start} {obj_type} already inserted in run {inserter.journal.run_id}.")
+
+    if stream:
+        # Records are produced lazily while earlier batches are in flight
+        logger.info(f"Streaming {count} {obj_type}...")
+        data = generator.iter_generate(count, workers=workers, start=start)
+    else:
+        logger.info(f"Generating {count} {obj_type}...")
+        try:
+            data = generator.generate(count, workers=workers, start=start)
+        except Exception as e:
+             logger.error(f"Failed to generate data for {obj_type}: {e}")
+             return
+
+    if dry_run:
+        logger.info(f"Dry run for {obj_type}. Example:")
+        example = next(iter(data), None)
+        print(example if example else "No data") # Keep print for data output to be clean
+    else:
+        inserter.batch_insert(obj_type, data, start_offset=start)
+
+
+def run_graph(inserter, companies, dry_run, workers=1, seed=None, fast=False, fan_out=None, timeline=None):
+    orchestrator = GraphOrchestrator(inserter, partial(get_generator, timeline=timeline), fan_out=fan_out,
+                                     seed=seed, fast=fast, workers=workers)
+    orchestrator.run(companies, dry_run=dry_run)
+
+
+def run_marketing_orchestration(inserter, count, dry_run, workers=1, seed=None, timeline=None):
+    orchestrator = MarketingOrchestrator(inserter, seed=seed, workers=workers, timeline=timeline)
+    orchestrator.run(count, dry_run=dry_run)
@@ -1,16 +1,219 @@
+import time
+import uuid
+import random
+import logging
+from collections import deque
+from itertools import islice
 from faker import Faker
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from ..config import GENERATION_SHARD_SIZE, FAST_POOL_SIZE, EXTERNAL_ID_PROPERTY
+from ..metrics import METRICS
+from ..timeline import Timeline
+
+logger = logging.getLogger(__name__)
+
+# Generators built inside pool workers, reused across the shards a worker process handles
+_worker_generators: Dict[Tuple, "BaseGenerator"] = {}
+# Fast mode pools built by the parent process, handed to every worker once by _init_worker
+_worker_pools: Dict[Tuple, List[Any]] = {}
+
+
+def _init_worker(pools: Dict[Tuple, List[Any]]):
+    """Process-pool initializer: keep the parent's pools so workers don't each rebuild them."""
+    _worker_pools.update(pools)
+
+
+def _generate_shard(generator_cls, init_kwargs: Dict[str, Any], seed: int, count: int) -> List[Dict[str, Any]]:
+    """Process-pool entry point: build (or reuse) a generator in the worker and produce one shard."""
+    key = (generator_cls, tuple(sorted(init_kwargs.items())))
+    generator = _worker_generators.get(key)
+    if generator is None:
+        generator = _worker_generators[key] = generator_cls(**init_kwargs)
+        generator._pools.update(_worker_pools)
+    generator.reseed(seed)
+    return generator._generate_block(count)
+
 
 class BaseGenerator(ABC):
-    def __init__(self, locale: str = 'en_US'):
+    # Set by subclasses that implement generate_columns, i.e. have a fast mode
+    SUPPORTS_FAST = False
+
+    def __init__(self, locale: str = 'en_US', seed: Optional[int] = None, fast: bool = False,
+                 pool_size: int = FAST_POOL_SIZE, keyed: bool = False, timeline: Optional[Timeline] = None):
+        self.locale = locale
+        self.seed = seed
+        # Stamp every record with a unique key derived from (seed, position), for batch/upsert
+        self.keyed = keyed
+        # Spread record timestamps over a period (--time-range) instead of stamping them with the current time
+        self.timeline = timeline
         self.fake = Faker(locale)
-    
+        self.random = random.Random(seed)
+        if seed is not None:
+            self.fake.seed_instance(seed)
+
+        self.fast = fast and self.supports_fast()
+        if fast and not self.fast:
+            logger.warning(f"{type(self).__name__} has no fast mode, falling back to per-record generation.")
+        self.pool_size = pool_size
+        self._pools: Dict[Tuple, List[Any]] = {}
+        self._pool_fake: Optional[Faker] = None
+
+    def reseed(self, seed: int):
+        """Reset both the Faker instance and the generator's own RNG to `seed`."""
+        self.fake.seed_instance(seed)
+        self.random.seed(seed)
+
     @abstractmethod
     def generate_one(self) -> Dict[str, Any]:
         """Generate a single record dictionary."""
         pass
 
-    def generate(self, count: int) -> List[Dict[str, Any]]:
-        """Generate a list of records."""
-        return [self.generate_one() for _ in range(count)]
+    def generate_columns(self, count: int) -> Dict[str, List[Any]]:
+        """
+        Fast mode: generate `count` values per field at once, as {field: [values]}.
+        Subclasses implement this (and set SUPPORTS_FAST) by drawing from `sample()` pools instead of
+        calling Faker per record.
+        """
+        raise NotImplementedError
+
+    def record_key(self, index: int) -> str:
+        """Stable key of the record at `index`: same seed and position, same key."""
+        return uuid.uuid5(uuid.NAMESPACE_OID, f"{self.seed}:{type(self).__name__}:{index}").hex
+
+    def apply_key(self, record: Dict[str, Any], key: str):
+        """Write `key` into the record's upsert ID property. Overridden where a natural key exists."""
+        record[EXTERNAL_ID_PROPERTY] = key
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        """Set each record's date properties from its timestamp (epoch milliseconds) drawn from the timeline."""
+
+    @classmethod
+    def supports_fast(cls) -> bool:
+        return cls.SUPPORTS_FAST
+
+    @classmethod
+    def uses_timeline(cls) -> bool:
+        return cls.apply_timeline is not BaseGenerator.apply_timeline
+
+    def sample(self, provider: str, k: int, **kwargs) -> List[Any]:
+        """Draw `k` values of a Faker provider from a pool built once per generator."""
+        return self.random.choices(self._pool(provider, **kwargs), k=k)
+
+    def _pool(self, provider: str, **kwargs) -> List[Any]:
+        key = (provider, tuple(sorted(kwargs.items())))
+        pool = self._pools.get(key)
+        if pool is None:
+            # Pools come from their own Faker, seeded per provider from the master seed, so they are
+            # identical in every worker process and independent of the order fields are first used.
+            if self._pool_fake is None:
+                self._pool_fake = Faker(self.locale)
+            if self.seed is not None:
+                self._pool_fake.seed_instance(f"{self.seed}:{key}")
+            make = getattr(self._pool_fake, provider)
+            pool = self._pools[key] = [make(**kwargs) for _ in range(self.pool_size)]
+        return pool
+
+    def _build_pools(self):
+        """Build every pool generate_columns samples from, without changing what the generator draws next."""
+        state = self.random.getstate()
+        self.generate_columns(1)
+        self.random.setstate(state)
+
+    def _generate_block(self, count: int) -> List[Dict[str, Any]]:
+        if not self.fast:
+            records = [self.generate_one() for _ in range(count)]
+        else:
+            columns = self.generate_columns(count)
+            fields = list(columns)
+            records = [dict(zip(fields, row)) for row in zip(*columns.values())]
+        if self.timeline is not None and self.uses_timeline():
+            # Drawn for the whole block at once, after the records so their other fields don't change
+            self.apply_timeline(records, self.timeline.sample(self.random, count))
+        return records
+
+    def generate(self, count: int, workers: int = 1, start: int = 0) -> List[Dict[str, Any]]:
+        """
+        Generate a list of records.
+        With a seed or multiple workers, `count` is split into fixed-size shards, each seeded from the
+        master seed, so the output only depends on the seed and never on the number of workers.
+        """
+        return list(self.iter_generate(count, workers, start))
+
+    def iter_generate(self, count: int, workers: int = 1, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield records, same output as `generate`.
+        With workers, at most 2 shards per worker are generated ahead of the consumer,
+        so memory stays bounded however large `count` is.
+        `start` skips the first records (used when resuming); with a seed, shards that lie
+        entirely before it are never generated.
+        """
+        records = self._iter_records(count, workers, start)
+        index = start
+        elapsed = 0.0
+        try:
+            while True:
+                # Only time spent producing records is measured, not the consumer's work between them
+                began = time.perf_counter()
+                record = next(records, None)
+                if record is None:
+                    break
+                if self.keyed:
+                    self.apply_key(record, self.record_key(index))
+                elapsed += time.perf_counter() - began
+                index += 1
+                yield record
+        finally:
+            name = type(self).__name__
+            METRICS.inc("generation_seconds_total", elapsed, generator=name)
+            METRICS.inc("records_generated_total", index - start, generator=name)
+
+    def _iter_records(self, count: int, workers: int = 1, start: int = 0) -> Iterator[Dict[str, Any]]:
+        if self.seed is None and workers <= 1:
+            blocks = (
+                self._generate_block(min(GENERATION_SHARD_SIZE, count - offset))
+                for offset in range(0, count, GENERATION_SHARD_SIZE)
+            )
+            yield from islice((record for block in blocks for record in block), start, None)
+            return
+
+        shards = self._shards(count, start)
+        if workers <= 1:
+            for shard_seed, shard_size, skip in shards:
+                self.reseed(shard_seed)
+                yield from self._generate_block(shard_size)[skip:]
+            return
+
+        if self.fast:
+            # Pools are seeded per provider, so the parent's are the ones each worker would build
+            self._build_pools()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self._pools,)) as pool:
+            pending = deque()
+            for shard_seed, shard_size, skip in shards:
+                future = pool.submit(_generate_shard, type(self), self._init_kwargs(), shard_seed, shard_size)
+                pending.append((future, skip))
+                if len(pending) >= workers * 2:
+                    future, skip = pending.popleft()
+                    yield from future.result()[skip:]
+            while pending:
+                future, skip = pending.popleft()
+                yield from future.result()[skip:]
+
+    def _shards(self, count: int, start: int = 0) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (seed, size, skip) for each shard overlapping [start, count).
+        Shard seeds are derived from the master seed in order, so skipped shards still advance it.
+        """
+        master = random.Random(self.seed)
+        for offset in range(0, count, GENERATION_SHARD_SIZE):
+            shard_seed = master.getrandbits(64)
+            size = min(GENERATION_SHARD_SIZE, count - offset)
+            if offset + size <= start:
+                continue
+            yield shard_seed, size, max(0, start - offset)
+
+    def _init_kwargs(self) -> Dict[str, Any]:
+        """Constructor arguments needed to rebuild this generator inside a worker process."""
+        return {"locale": self.locale, "seed": self.seed, "fast": self.fast, "pool_size": self.pool_size,
+                "timeline": self.timeline}
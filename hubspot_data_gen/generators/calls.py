@@ -1,13 +1,16 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 from .base import BaseGenerator
 
 class CallGenerator(BaseGenerator):
+    SUPPORTS_FAST = True
+
+    STATUSES = ["COMPLETED", "BUSY", "NO_ANSWER", "MISSED", "CANCELED"]
+
     def generate_one(self) -> Dict[str, Any]:
         # Properties for Calls (CRM Object)
         start_ts = str(int(datetime.now().timestamp() * 1000))
-        duration = random.randint(60000, 3600000) # 1 min to 60 mins in ms
+        duration = self.random.randint(60000, 3600000) # 1 min to 60 mins in ms
         
         return {
             "hs_timestamp": start_ts, # REQUIRED: When the engagement happened
@@ -15,7 +18,7 @@ class CallGenerator(BaseGenerator):
             "hs_call_title": f"Call with {self.fake.name()}",
             "hs_call_body": self.fake.paragraph(),
             "hs_call_duration": str(duration),
-            "hs_call_status": random.choice(["COMPLETED", "BUSY", "NO_ANSWER", "MISSED", "CANCELED"]),
+            "hs_call_status": self.random.choice(self.STATUSES),
             "hs_call_from_number": self.fake.phone_number(),
             "hs_call_to_number": self.fake.phone_number(),
             "hs_call_recording_url": self.fake.url(),
@@ -23,3 +26,20 @@ class CallGenerator(BaseGenerator):
             # "hubspot_owner_id": "...",
             # "hubspot_owner_id": "...", 
         }
+
+    def generate_columns(self, count: int) -> Dict[str, List[Any]]:
+        start_ts = str(int(datetime.now().timestamp() * 1000))
+        return {
+            "hs_timestamp": [start_ts] * count,
+            "hs_call_title": [f"Call with {name}" for name in self.sample("name", count)],
+            "hs_call_body": self.sample("paragraph", count),
+            "hs_call_duration": [str(duration) for duration in self.random.choices(range(60000, 3600001), k=count)],
+            "hs_call_status": self.random.choices(self.STATUSES, k=count),
+            "hs_call_from_number": self.sample("phone_number", count),
+            "hs_call_to_number": self.sample("phone_number", count),
+            "hs_call_recording_url": self.sample("url", count),
+        }
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            record["hs_timestamp"] = str(timestamp)
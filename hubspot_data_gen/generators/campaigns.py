@@ -1,14 +1,14 @@
-import random
-from typing import Dict, Any
-from datetime import datetime, timedelta
+from typing import Dict, Any, List
+from datetime import datetime, timedelta, date
 from .base import BaseGenerator
+from ..timeline import DAY_MS, to_date
 
 class CampaignGenerator(BaseGenerator):
     def generate_one(self) -> Dict[str, Any]:
-        start_date = datetime.now() + timedelta(days=random.randint(1, 30))
-        end_date = start_date + timedelta(days=random.randint(30, 90))
+        start_date = datetime.now() + timedelta(days=self.random.randint(1, 30))
+        end_date = start_date + timedelta(days=self.random.randint(30, 90))
         
-        name_val = f"{self.fake.bs().title()} Campaign {random.randint(1000, 9999)}"
+        name_val = f"{self.fake.bs().title()} Campaign {self.random.randint(1000, 9999)}"
         # Standard HubSpot Campaign Properties
         # API usually expects these in the key-value map or under a 'properties' key depending on endpoint version.
         # We will provide a flat dictionary which the inserter can then format as needed (e.g. into 'properties': {...})
@@ -19,30 +19,37 @@ class CampaignGenerator(BaseGenerator):
             "hs_start_date": start_date.strftime("%Y-%m-%d"),
             "hs_end_date": end_date.strftime("%Y-%m-%d"),
             "hs_notes": self.fake.sentence(),
-            "hs_audience": random.choice(["Existing Customers", "New Leads", "Churned Users", "High Value"]),
+            "hs_audience": self.random.choice(["Existing Customers", "New Leads", "Churned Users", "High Value"]),
             "hs_currency_code": "USD",
-            "hs_campaign_status": random.choice(["draft", "scheduled", "in_progress", "completed"]), # Standardized values
+            "hs_campaign_status": self.random.choice(["draft", "scheduled", "in_progress", "completed"]), # Standardized values
             "hs_color_hex": self.fake.hex_color(),
             
             # UTM Parameters (standardized keys)
             "hs_utm_campaign": self.fake.slug(),
-            "hs_utm_source": random.choice(["facebook", "google", "linkedin", "email"]),
-            "hs_utm_medium": random.choice(["cpc", "organic", "social", "email"]),
-            "hs_utm_content": "variation_" + random.choice(["a", "b", "c"]),
+            "hs_utm_source": self.random.choice(["facebook", "google", "linkedin", "email"]),
+            "hs_utm_medium": self.random.choice(["cpc", "organic", "social", "email"]),
+            "hs_utm_content": "variation_" + self.random.choice(["a", "b", "c"]),
             "hs_utm_term": self.fake.word(),
         }
 
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            # The campaign starts on the drawn day and keeps its drawn length
+            days = (date.fromisoformat(record["hs_end_date"]) - date.fromisoformat(record["hs_start_date"])).days
+            record["hs_start_date"] = to_date(timestamp)
+            record["hs_end_date"] = to_date(timestamp + days * DAY_MS)
+
     def generate_budget_item(self) -> Dict[str, Any]:
         return {
             "name": f"Budget: {self.fake.bs()}",
-            "amount": str(random.randint(1000, 50000)),
+            "amount": str(self.random.randint(1000, 50000)),
             "description": self.fake.sentence()
         }
 
     def generate_spend_item(self) -> Dict[str, Any]:
         return {
             "name": f"Spend: {self.fake.bs()}",
-            "amount": str(random.randint(100, 5000)),
+            "amount": str(self.random.randint(100, 5000)),
             "date": datetime.now().strftime("%Y-%m-%d"),
             "description": self.fake.sentence()
         }
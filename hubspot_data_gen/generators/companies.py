@@ -1,8 +1,9 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .base import BaseGenerator
 
 class CompanyGenerator(BaseGenerator):
+    SUPPORTS_FAST = True
+
     INDUSTRIES = [
         "COMPUTER_SOFTWARE", "INFORMATION_TECHNOLOGY_AND_SERVICES", "INTERNET", "MARKETING_AND_ADVERTISING",
         "FINANCIAL_SERVICES", "HOSPITAL_HEALTH_CARE", "RETAIL", "CONSTRUCTION",
@@ -15,7 +16,7 @@ class CompanyGenerator(BaseGenerator):
         return {
             "name": self.fake.company(),
             "domain": self.fake.domain_name(),
-            "industry": random.choice(self.INDUSTRIES),
+            "industry": self.random.choice(self.INDUSTRIES),
             "phone": self.fake.phone_number(),
             "address": self.fake.street_address(),
             "address2": self.fake.secondary_address(),
@@ -24,9 +25,31 @@ class CompanyGenerator(BaseGenerator):
             "zip": self.fake.zipcode(),
             "country": self.fake.country(),
             "website": self.fake.url(),
-            "numberofemployees": random.randint(1, 10000),
-            "annualrevenue": random.randint(10000, 100000000),
+            "numberofemployees": self.random.randint(1, 10000),
+            "annualrevenue": self.random.randint(10000, 100000000),
             "description": self.fake.bs(),
-            "founded_year": random.randint(1900, 2024),
-            # "lifecyclestage": random.choice(["subscriber", "lead", "marketingqualifiedlead", "salesqualifiedlead", "opportunity", "customer", "evangelist", "other"]),
+            "founded_year": self.random.randint(1900, 2024),
+            # "lifecyclestage": self.random.choice(["subscriber", "lead", "marketingqualifiedlead", "salesqualifiedlead", "opportunity", "customer", "evangelist", "other"]),
+        }
+
+    def generate_columns(self, count: int) -> Dict[str, List[Any]]:
+        domain_words = self.sample("domain_word", count)
+        tlds = self.sample("tld", count)
+        return {
+            "name": self.sample("company", count),
+            # Suffix keeps pooled domain words from colliding across large runs
+            "domain": [f"{word}-{self.random.getrandbits(24):06x}.{tld}" for word, tld in zip(domain_words, tlds)],
+            "industry": self.random.choices(self.INDUSTRIES, k=count),
+            "phone": self.sample("phone_number", count),
+            "address": self.sample("street_address", count),
+            "address2": self.sample("secondary_address", count),
+            "city": self.sample("city", count),
+            "state": self.sample("state", count),
+            "zip": self.sample("zipcode", count),
+            "country": self.sample("country", count),
+            "website": self.sample("url", count),
+            "numberofemployees": self.random.choices(range(1, 10001), k=count),
+            "annualrevenue": self.random.choices(range(10000, 100000001), k=count),
+            "description": self.sample("bs", count),
+            "founded_year": self.random.choices(range(1900, 2025), k=count),
         }
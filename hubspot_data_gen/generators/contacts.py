@@ -1,8 +1,16 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .base import BaseGenerator
 
 class ContactGenerator(BaseGenerator):
+    SUPPORTS_FAST = True
+
+    LIFECYCLE_STAGES = [
+        "subscriber", "lead", "marketingqualifiedlead", 
+        "salesqualifiedlead", "opportunity", "customer", 
+        "evangelist", "other"
+    ]
+    GENDERS = ["Male", "Female", "Other", "Prefer not to say"] # Usually custom
+
     def generate_one(self) -> Dict[str, Any]:
         return {
             "email": self.fake.email(),
@@ -18,12 +26,41 @@ class ContactGenerator(BaseGenerator):
             "state": self.fake.state(),
             "zip": self.fake.zipcode(),
             "country": self.fake.country(),
-            "lifecyclestage": random.choice([
-                "subscriber", "lead", "marketingqualifiedlead", 
-                "salesqualifiedlead", "opportunity", "customer", 
-                "evangelist", "other"
-            ]),
-            # "lead_status": random.choice(["NEW", "OPEN", "IN_PROGRESS", "OPEN_DEAL", "UNQUALIFIED", "ATTEMPTED_TO_CONTACT", "CONNECTED", "BAD_TIMING"]), # Standard but often customized
+            "lifecyclestage": self.random.choice(self.LIFECYCLE_STAGES),
+            # "lead_status": self.random.choice(["NEW", "OPEN", "IN_PROGRESS", "OPEN_DEAL", "UNQUALIFIED", "ATTEMPTED_TO_CONTACT", "CONNECTED", "BAD_TIMING"]), # Standard but often customized
             "salutation": self.fake.prefix(),
-            "gender": random.choice(["Male", "Female", "Other", "Prefer not to say"]), # Usually custom
+            "gender": self.random.choice(self.GENDERS),
+        }
+
+    def apply_key(self, record: Dict[str, Any], key: str):
+        # Email is the contact's upsert key, so the key goes into it rather than a custom property
+        domain = record["email"].rsplit("@", 1)[-1]
+        record["email"] = f"{record['firstname']}.{record['lastname']}.{key[:12]}@{domain}".lower().replace(" ", "")
+
+    def generate_columns(self, count: int) -> Dict[str, List[Any]]:
+        firstnames = self.sample("first_name", count)
+        lastnames = self.sample("last_name", count)
+        domains = self.sample("free_email_domain", count)
+        # Pooled names repeat, so emails get a random suffix to stay unique (HubSpot dedupes on email)
+        emails = [
+            f"{first}.{last}{self.random.getrandbits(32):08x}@{domain}".lower()
+            for first, last, domain in zip(firstnames, lastnames, domains)
+        ]
+        return {
+            "email": emails,
+            "firstname": firstnames,
+            "lastname": lastnames,
+            "phone": self.sample("phone_number", count),
+            "mobilephone": self.sample("phone_number", count),
+            "company": self.sample("company", count),
+            "website": self.sample("url", count),
+            "jobtitle": self.sample("job", count),
+            "address": self.sample("street_address", count),
+            "city": self.sample("city", count),
+            "state": self.sample("state", count),
+            "zip": self.sample("zipcode", count),
+            "country": self.sample("country", count),
+            "lifecyclestage": self.random.choices(self.LIFECYCLE_STAGES, k=count),
+            "salutation": self.sample("prefix", count),
+            "gender": self.random.choices(self.GENDERS, k=count),
         }
@@ -1,24 +1,43 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from .base import BaseGenerator
 
 class DealGenerator(BaseGenerator):
+    SUPPORTS_FAST = True
+
+    # Standard 'default' pipeline stages
+    STAGES = [
+        "appointmentscheduled", "qualifiedtobuy", "presentationscheduled", 
+        "decisionmakerboughtin", "contractsent", "closedwon", "closedlost"
+    ]
+    DEAL_TYPES = ["newbusiness", "existingbusiness"]
+
     def generate_one(self) -> Dict[str, Any]:
-        # Standard 'default' pipeline stages
-        stages = [
-            "appointmentscheduled", "qualifiedtobuy", "presentationscheduled", 
-            "decisionmakerboughtin", "contractsent", "closedwon", "closedlost"
-        ]
-        
-        future_date = datetime.now() + timedelta(days=random.randint(1, 90))
+        future_date = datetime.now() + timedelta(days=self.random.randint(1, 90))
         
         return {
             "dealname": f"{self.fake.company()} Deal",
-            "amount": str(random.randint(1000, 50000)),
-            "dealstage": random.choice(stages),
+            "amount": str(self.random.randint(1000, 50000)),
+            "dealstage": self.random.choice(self.STAGES),
             "pipeline": "default",
             "closedate": str(int(future_date.timestamp() * 1000)), # HubSpot expects milliseconds
-            "dealtype": random.choice(["newbusiness", "existingbusiness"]),
+            "dealtype": self.random.choice(self.DEAL_TYPES),
             "description": self.fake.text(max_nb_chars=200)
         }
+
+    def generate_columns(self, count: int) -> Dict[str, List[Any]]:
+        now_ms = int(datetime.now().timestamp() * 1000)
+        day_ms = 24 * 60 * 60 * 1000
+        return {
+            "dealname": [f"{company} Deal" for company in self.sample("company", count)],
+            "amount": [str(amount) for amount in self.random.choices(range(1000, 50001), k=count)],
+            "dealstage": self.random.choices(self.STAGES, k=count),
+            "pipeline": ["default"] * count,
+            "closedate": [str(now_ms + days * day_ms) for days in self.random.choices(range(1, 91), k=count)],
+            "dealtype": self.random.choices(self.DEAL_TYPES, k=count),
+            "description": self.sample("text", count, max_nb_chars=200),
+        }
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            record["closedate"] = str(timestamp)
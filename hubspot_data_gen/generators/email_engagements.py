@@ -1,5 +1,4 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 from .base import BaseGenerator
 
@@ -18,11 +17,15 @@ class EmailEngagementGenerator(BaseGenerator):
             "hs_email_subject": self.fake.sentence(),
             "hs_email_text": email_text,
             "hs_email_html": email_html,
-            "hs_email_direction": random.choice(["INCOMING_EMAIL", "EMAIL"]),
-            "hs_email_status": random.choice(["SENT", "BOUNCED", "FAILED", "SCHEDULED", "SENDING"]),
+            "hs_email_direction": self.random.choice(["INCOMING_EMAIL", "EMAIL"]),
+            "hs_email_status": self.random.choice(["SENT", "BOUNCED", "FAILED", "SCHEDULED", "SENDING"]),
             
             # Standard Headers (JSON String)
             "hs_email_headers": "{\"from\": \"sender@example.com\", \"to\": \"recipient@example.com\"}",
             
             "hs_attachment_ids": ""
         }
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            record["hs_timestamp"] = str(timestamp)
@@ -1,11 +1,10 @@
-import random
 from typing import Dict, Any
 from .base import BaseGenerator
 
 class MarketingEmailGenerator(BaseGenerator):
     def generate_one(self) -> Dict[str, Any]:
         # Unique name to avoid collisions
-        email_name = f"Campaign Email {random.randint(1000, 9999)}: {self.fake.catch_phrase()}"
+        email_name = f"Campaign Email {self.random.randint(1000, 9999)}: {self.fake.catch_phrase()}"
         
         return {
             "name": email_name,
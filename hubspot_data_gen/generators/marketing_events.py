@@ -1,23 +1,22 @@
-import random
 from typing import Dict, Any
 from datetime import datetime, timedelta, timezone
 from .base import BaseGenerator
 
 class MarketingEventGenerator(BaseGenerator):
     def generate_one(self) -> Dict[str, Any]:
-        start_date = datetime.now(timezone.utc) + timedelta(days=random.randint(10, 60))
+        start_date = datetime.now(timezone.utc) + timedelta(days=self.random.randint(10, 60))
         end_date = start_date + timedelta(hours=2)
         
         # REQUIRED Properties
-        external_account_id = f"acc-{random.randint(10000, 99999)}"
-        external_event_id = f"evt-{random.randint(100000, 999999)}"
+        external_account_id = f"acc-{self.random.randint(10000, 99999)}"
+        external_event_id = f"evt-{self.random.randint(100000, 999999)}"
         
         return {
             "eventName": f"Webinar: {self.fake.catch_phrase()}",
             "eventOrganizer": self.fake.company(),
             "eventDescription": self.fake.paragraph(),
             "eventUrl": self.fake.url(),
-            "eventType": random.choice(["webinar", "conference", "tradeshow", "workshop"]),
+            "eventType": self.random.choice(["webinar", "conference", "tradeshow", "workshop"]),
             
             # REQUIRED / Standard Properties
             "externalAccountId": external_account_id,
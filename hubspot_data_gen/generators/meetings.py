@@ -1,12 +1,11 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from .base import BaseGenerator
 
 class MeetingGenerator(BaseGenerator):
     def generate_one(self) -> Dict[str, Any]:
-        start_time = datetime.now() + timedelta(days=random.randint(1, 14))
-        end_time = start_time + timedelta(minutes=random.choice([15, 30, 60]))
+        start_time = datetime.now() + timedelta(days=self.random.randint(1, 14))
+        end_time = start_time + timedelta(minutes=self.random.choice([15, 30, 60]))
         
         start_ts = str(int(start_time.timestamp() * 1000))
         end_ts = str(int(end_time.timestamp() * 1000))
@@ -18,13 +17,20 @@ class MeetingGenerator(BaseGenerator):
             "hs_meeting_title": f"Meeting with {self.fake.company()}",
             "hs_meeting_body": self.fake.paragraph(),
             "hs_internal_meeting_notes": f"Internal Note: {self.fake.sentence()}",
-            "hs_meeting_location": random.choice(["Zoom", "Google Meet", "Office", "Phone"]),
+            "hs_meeting_location": self.random.choice(["Zoom", "Google Meet", "Office", "Phone"]),
             "hs_meeting_start_time": start_ts,
             "hs_meeting_end_time": end_ts,
-            "hs_meeting_outcome": random.choice(["SCHEDULED", "COMPLETED", "RESCHEDULED", "NO_SHOW"]),
+            "hs_meeting_outcome": self.random.choice(["SCHEDULED", "COMPLETED", "RESCHEDULED", "NO_SHOW"]),
             "hs_meeting_external_url": self.fake.url(),
             
             
             # Attachments (Empty for now, but field is standard)
             "hs_attachment_ids": "" 
         }
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            # Keep the drawn meeting length
+            duration = int(record["hs_meeting_end_time"]) - int(record["hs_meeting_start_time"])
+            record["hs_timestamp"] = record["hs_meeting_start_time"] = str(timestamp)
+            record["hs_meeting_end_time"] = str(timestamp + duration)
@@ -1,9 +1,10 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 from .base import BaseGenerator
 
 class NoteGenerator(BaseGenerator):
+    SUPPORTS_FAST = True
+
     def generate_one(self) -> Dict[str, Any]:
         # Properties for Notes (CRM Object)
         ts = str(int(datetime.now().timestamp() * 1000))
@@ -12,3 +13,14 @@ class NoteGenerator(BaseGenerator):
             "hs_timestamp": ts, # REQUIRED
             "hs_note_body": self.fake.paragraph(nb_sentences=5),
         }
+
+    def generate_columns(self, count: int) -> Dict[str, List[Any]]:
+        ts = str(int(datetime.now().timestamp() * 1000))
+        return {
+            "hs_timestamp": [ts] * count,
+            "hs_note_body": self.sample("paragraph", count, nb_sentences=5),
+        }
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            record["hs_timestamp"] = str(timestamp)
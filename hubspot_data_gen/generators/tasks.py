@@ -1,12 +1,12 @@
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from .base import BaseGenerator
+from ..timeline import HOUR_MS
 
 class TaskGenerator(BaseGenerator):
     def generate_one(self) -> Dict[str, Any]:
         # Properties for Tasks (CRM Object)
-        due_date = datetime.now() + timedelta(days=random.randint(1, 7))
+        due_date = datetime.now() + timedelta(days=self.random.randint(1, 7))
         due_ts = str(int(due_date.timestamp() * 1000))
         
         return {
@@ -14,8 +14,13 @@ class TaskGenerator(BaseGenerator):
             
             "hs_task_subject": f"Task: {self.fake.bs().title()}",
             "hs_task_body": self.fake.sentence(),
-            "hs_task_priority": random.choice(["LOW", "MEDIUM", "HIGH"]),
-            "hs_task_status": random.choice(["WAITING", "COMPLETED", "DEFERRED", "NOT_STARTED", "IN_PROGRESS"]),
-            "hs_task_type": random.choice(["TODO", "EMAIL", "CALL"]),
+            "hs_task_priority": self.random.choice(["LOW", "MEDIUM", "HIGH"]),
+            "hs_task_status": self.random.choice(["WAITING", "COMPLETED", "DEFERRED", "NOT_STARTED", "IN_PROGRESS"]),
+            "hs_task_type": self.random.choice(["TODO", "EMAIL", "CALL"]),
             "hs_task_reminders": str(int((due_date - timedelta(hours=1)).timestamp() * 1000)), # Reminder 1 hour before
         }
+
+    def apply_timeline(self, records: List[Dict[str, Any]], timestamps: List[int]):
+        for record, timestamp in zip(records, timestamps):
+            record["hs_timestamp"] = str(timestamp)
+            record["hs_task_reminders"] = str(timestamp - HOUR_MS)
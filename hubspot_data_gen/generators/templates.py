@@ -0,0 +1,42 @@
+from typing import Dict, Any, Optional
+from ..serialization import dumps
+
+
+class PayloadTemplate:
+    """
+    Constant part of a generated payload, built once per generator class.
+    Records rendered from it are shallow dicts whose constant subtrees are shared (never copied),
+    and the JSON of those subtrees is encoded once and spliced into every record's body.
+    Shared subtrees must be treated as read-only.
+    """
+
+    def __init__(self, static: Dict[str, Any]):
+        self.static = static
+        # Encoded members without the enclosing braces, ready to be joined with the variable ones
+        self.fragment = dumps(static)[1:-1]
+
+    def render(self, **slots: Any) -> "TemplatedRecord":
+        """A record made of the template plus the per-record `slots` (which must not redefine template keys)."""
+        record = TemplatedRecord(self.static)
+        record.update(slots)
+        record.template = self
+        return record
+
+    def encode(self, record: Dict[str, Any]) -> Optional[bytes]:
+        """
+        JSON for a record rendered from this template, reusing the cached fragment.
+        None if a template member was replaced since rendering, so the caller encodes it in full.
+        """
+        static = self.static
+        for key, value in static.items():
+            if record.get(key) is not value:
+                return None
+        variable = {key: value for key, value in record.items() if key not in static}
+        if not variable or not self.fragment:
+            return b"{" + self.fragment + b"}" if not variable else dumps(variable)
+        return b"{" + self.fragment + b"," + dumps(variable)[1:]
+
+
+class TemplatedRecord(dict):
+    """A plain dict for every consumer, remembering the template it was rendered from."""
+    template: Optional[PayloadTemplate] = None
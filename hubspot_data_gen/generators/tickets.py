@@ -1,4 +1,3 @@
-import random
 from typing import Dict, Any
 from .base import BaseGenerator
 
@@ -12,7 +11,7 @@ class TicketGenerator(BaseGenerator):
             "subject": f"Support: {self.fake.sentence(nb_words=5)}",
             "content": self.fake.paragraph(),
             "hs_pipeline": "0",
-            "hs_pipeline_stage": random.choice(stages),
-            "hs_ticket_priority": random.choice(priorities),
-            "hs_ticket_priority": random.choice(priorities),
+            "hs_pipeline_stage": self.random.choice(stages),
+            "hs_ticket_priority": self.random.choice(priorities),
+            "hs_ticket_priority": self.random.choice(priorities),
         }
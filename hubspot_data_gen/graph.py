@@ -0,0 +1,171 @@
+import random
+import logging
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from .config import GRAPH_FAN_OUT
+
+logger = logging.getLogger(__name__)
+
+# HubSpot-defined association type IDs, sent inline with batch/create inputs
+ASSOCIATION_TYPE_IDS = {
+    ("contacts", "companies"): 1,  # Primary company
+    ("deals", "contacts"): 3,
+    ("deals", "companies"): 5,  # Primary company
+    ("calls", "contacts"): 194,
+    ("calls", "deals"): 206,
+    ("emails", "contacts"): 198,
+    ("emails", "deals"): 210,
+    ("meetings", "contacts"): 200,
+    ("meetings", "deals"): 212,
+    ("notes", "contacts"): 202,
+    ("notes", "deals"): 214,
+    ("tasks", "contacts"): 204,
+    ("tasks", "deals"): 216,
+}
+
+ENGAGEMENT_TYPES = ("calls", "emails", "meetings", "notes", "tasks")
+
+# Insertion order: every layer only associates to records of earlier layers
+GRAPH_LAYERS = [("companies",), ("contacts",), ("deals",), ENGAGEMENT_TYPES]
+
+
+class GraphOrchestrator:
+    """
+    Builds a related CRM dataset: companies -> contacts -> deals -> calls/emails/meetings/notes/tasks.
+    Layers are inserted in dependency order and associations travel inline in the batch/create
+    inputs, so the graph costs no API calls beyond the creates themselves. Object types within a
+    layer don't depend on each other and are inserted through one shared dispatch window.
+    """
+
+    def __init__(self, inserter, generator_factory: Callable[..., Any], fan_out: Optional[Dict[str, float]] = None,
+                 seed: Optional[int] = None, fast: bool = False, workers: int = 1):
+        self.inserter = inserter
+        self.journal = getattr(inserter, "journal", None)
+        self.generator_factory = generator_factory
+        self.fan_out = {**GRAPH_FAN_OUT, **(fan_out or {})}
+        self.seed = seed
+        self.fast = fast
+        self.workers = workers
+
+        self.ids: Dict[str, List[str]] = {}
+        # Parent contact (or company, for contacts) of every generated record, by position
+        self.parents: Dict[str, List[Optional[str]]] = {}
+        self.contact_company: Dict[str, str] = {}
+        self.contact_deals: Dict[str, List[str]] = {}
+
+    def counts(self, companies: int) -> Dict[str, int]:
+        """Records per object type for a graph rooted at `companies` companies."""
+        counts = {"companies": companies, "contacts": round(companies * self.fan_out["contacts"])}
+        for object_type in ("deals",) + ENGAGEMENT_TYPES:
+            counts[object_type] = round(counts["contacts"] * self.fan_out[object_type])
+        return counts
+
+    def run(self, companies: int, dry_run: bool = False) -> Dict[str, List[str]]:
+        """Generate and insert the whole graph. Returns created IDs per object type."""
+        counts = self.counts(companies)
+        logger.info("=== Building CRM graph: "
+                    + ", ".join(f"{count} {object_type}" for object_type, count in counts.items() if count) + " ===")
+
+        for layer in GRAPH_LAYERS:
+            datasets: Dict[str, List[Dict[str, Any]]] = {}
+            starts: Dict[str, int] = {}
+            for object_type in layer:
+                if not counts[object_type]:
+                    continue
+                start = self.journal.completed_prefix(object_type) if self.journal and not dry_run else 0
+                if start:
+                    logger.info(f"Skipping {start} {object_type} already inserted in run {self.journal.run_id}.")
+                datasets[object_type] = self._build(object_type, counts[object_type], start)
+                starts[object_type] = start
+
+            placed: Dict[str, List[Tuple[int, str]]] = {}
+            if dry_run:
+                for object_type, records in datasets.items():
+                    # Positional placeholders stand in for IDs so later layers can still be shaped
+                    placed[object_type] = [(i, f"{object_type}-{i}") for i in range(counts[object_type])]
+                    logger.info(f"[Dry Run] Generated {len(records)} {object_type}. Example:")
+                    print(records[0])
+            elif datasets:
+                placed = self.inserter.batch_insert_many(datasets, starts)
+
+            for object_type, pairs in placed.items():
+                self.ids[object_type] = [record_id for _, record_id in pairs]
+                self._index(object_type, pairs)
+
+        logger.info("=== CRM graph complete: "
+                    + ", ".join(f"{len(ids)} {object_type}" for object_type, ids in self.ids.items()) + " ===")
+        return self.ids
+
+    def _build(self, object_type: str, count: int, start: int) -> List[Dict[str, Any]]:
+        """Generate records [start, count) of `object_type` shaped as batch inputs with their associations."""
+        # Parents are assigned for the full range so a resumed run draws the same ones
+        rng = random.Random(f"{self.seed}:graph:{object_type}")
+        parent_type = "companies" if object_type == "contacts" else "contacts"
+        parent_ids = self.ids.get(parent_type, [])
+        if not parent_ids and object_type != "companies":
+            logger.warning(f"No {parent_type} available, {object_type} will be created without associations.")
+
+        parents: List[Optional[str]] = []
+        associations: List[List[Tuple[str, str]]] = []
+        for _ in range(count):
+            parent = parent_ids[rng.randrange(len(parent_ids))] if parent_ids else None
+            parents.append(parent)
+            associations.append(self._associations_for(object_type, parent, rng))
+        self.parents[object_type] = parents
+
+        generator = self.generator_factory(object_type, self.seed, self.fast)
+        logger.info(f"Generating {count} {object_type}...")
+        records = generator.generate(count, workers=self.workers, start=start)
+        return [
+            {"properties": record, "associations": [self.association(object_type, to_type, to_id)
+                                                    for to_type, to_id in links]}
+            for record, links in zip(records, associations[start:])
+        ]
+
+    def _associations_for(self, object_type: str, parent: Optional[str], rng: random.Random) -> List[Tuple[str, str]]:
+        if parent is None:
+            return []
+        if object_type == "contacts":
+            return [("companies", parent)]
+
+        links = [("contacts", parent)]
+        if object_type == "deals":
+            company = self.contact_company.get(parent)
+            if company:
+                links.append(("companies", company))
+        else:
+            deals = self.contact_deals.get(parent)
+            if deals:
+                links.append(("deals", rng.choice(deals)))
+        return links
+
+    def _index(self, object_type: str, placed: List[Tuple[int, str]]):
+        """
+        Record which company each contact and which deals each contact got, for the next layers.
+        `placed` holds the (position, ID) of each created record, so rejected ones only lose their own edges.
+        """
+        if object_type not in ("contacts", "deals"):
+            return
+        parents = self.parents.get(object_type, [])
+        if len(placed) < len(parents):
+            logger.warning(f"Only {len(placed)}/{len(parents)} {object_type} were created; "
+                           f"later layers won't be associated through the others.")
+
+        for position, record_id in placed:
+            parent = parents[position]
+            if parent is None:
+                continue
+            if object_type == "contacts":
+                self.contact_company[record_id] = parent
+            else:
+                self.contact_deals.setdefault(parent, []).append(record_id)
+
+    @staticmethod
+    def association(from_type: str, to_type: str, to_id: str) -> Dict[str, Any]:
+        """Inline association in the batch/create input format."""
+        return {
+            "to": {"id": to_id},
+            "types": [{
+                "associationCategory": "HUBSPOT_DEFINED",
+                "associationTypeId": ASSOCIATION_TYPE_IDS[(from_type, to_type)],
+            }],
+        }
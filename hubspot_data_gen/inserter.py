@@ -1,53 +1,313 @@
+import os
+import re
 import requests
 import json
-import math
+import gzip
 import time
+import threading
 import logging
-from typing import List, Dict, Any, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from .config import ACCESS_TOKEN, MAX_BATCH_SIZE
+from bisect import bisect_right
+from collections import deque
+from itertools import zip_longest, islice, chain
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Tuple, NamedTuple
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception, before_sleep_log
+from requests.adapters import HTTPAdapter
+from .config import (
+    ACCESS_TOKEN, API_BASE_URL, MAX_BATCH_SIZE, MAX_BATCH_BYTES, DEFAULT_CONCURRENCY, DEFAULT_RATE_LIMIT,
+    GZIP_MIN_BYTES, EXTERNAL_ID_PROPERTY, UPSERT_ID_PROPERTIES, SCHEMA_CACHE_TTL
+)
+from .rate_limiter import TokenBucket
+from .batching import AdaptiveBatchSizer
+from .schema import SchemaCache
+from .journal import RunJournal
+from .utils import chunked
+from .retry import is_retryable, is_payload_too_large, retry_after_seconds, wait_retry_after
+from .metrics import METRICS, Metrics, percentile
+from .serialization import encode_payload, dumps
+
+# Rejections caused by the payload itself: the batch is split to isolate the offending records
+SPLITTABLE_STATUS_CODES = {400, 409}
+
+# Errors about a property itself rather than a record's value: every record carrying it fails
+PROPERTY_ERROR_CODES = {"PROPERTY_DOESNT_EXIST", "READ_ONLY_VALUE"}
+
+# Created through the marketing APIs, which have no upsert
+MARKETING_OBJECT_TYPES = {"campaigns", "forms", "marketing_emails", "marketing_events"}
+
+# Record IDs in URL paths (numeric IDs, GUIDs), collapsed so metrics group requests by endpoint
+ID_SEGMENT = re.compile(r"/(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})(?=/|$)")
 
 # Logger initialized in main.py or via basicConfig if run independently (though not recommended)
 logger = logging.getLogger(__name__)
 
+
+class EncodedBody(NamedTuple):
+    """A request body serialized (and possibly compressed) once, then sent as-is by every attempt."""
+    data: bytes
+    headers: Dict[str, str]
+    size: int  # Before compression
+
+
+class SubBatch(NamedTuple):
+    """Records of a batch/create settled by one request of its bisection: created, or dead-lettered (no IDs)."""
+    start: int  # Position among the records sent
+    count: int
+    ids: List[str]
+
+
+class BatchTooLarge(Exception):
+    """A batch HubSpot rejected as too large or that timed out, to be resent in smaller batches."""
+
+
+_log_retry = before_sleep_log(logger, logging.WARNING)
+
+
+def _before_retry(retry_state):
+    """tenacity before_sleep hook: log the retry and count it, with its backoff, on the inserter's metrics."""
+    _log_retry(retry_state)
+    inserter = retry_state.args[0]
+    exc = retry_state.outcome.exception()
+    response = getattr(exc, "response", None)
+    reason = response.status_code if response is not None else type(exc).__name__
+    inserter.metrics.inc("retries_total", reason=reason)
+    inserter.metrics.inc("retry_sleep_seconds_total", retry_state.next_action.sleep)
+
 class HubSpotInserter:
-    def __init__(self, token: str = ACCESS_TOKEN):
+    def __init__(self, token: str = ACCESS_TOKEN, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate_limit: int = DEFAULT_RATE_LIMIT, base_url: str = API_BASE_URL,
+                 pool_size: Optional[int] = None, gzip_requests: bool = False,
+                 journal: Optional[RunJournal] = None, dead_letter_path: Optional[str] = None,
+                 upsert: bool = False, metrics: Optional[Metrics] = None,
+                 max_batch_bytes: Optional[int] = MAX_BATCH_BYTES, validate: bool = False,
+                 schema_ttl: float = SCHEMA_CACHE_TTL):
         self.token = token
-        self.base_crm_url = "https://api.hubapi.com/crm/v3/objects"
-        self.base_marketing_url = "https://api.hubapi.com/marketing/v3"
+        self.base_url = base_url.rstrip("/")
+        self.base_crm_url = f"{self.base_url}/crm/v3/objects"
+        self.base_marketing_url = f"{self.base_url}/marketing/v3"
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
         self.timeout = 60 # Seconds, recommended 60-90s by HubSpot
+        self.concurrency = max(1, concurrency)
+        # Shared across all worker threads; rate_limit is requests per 10 seconds
+        self.limiter = TokenBucket(rate_limit)
+
+        # Keep-alive session so batch, budget, spend and linking calls reuse TCP/TLS connections.
+        # The pool must be at least as large as concurrency, otherwise connections get discarded.
+        self.pool_size = max(pool_size or self.concurrency, self.concurrency)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.gzip_requests = gzip_requests
+
+        # Latency, status, retry and wait instrumentation; the process-wide registry unless given one
+        self.metrics = metrics if metrics is not None else METRICS
+
+        # Optional on-disk record of completed work, used to resume interrupted runs
+        self.journal = journal
+        self._hash_mismatch_warned = set()
+
+        # Records HubSpot rejects as invalid are written here (JSONL) instead of being lost
+        self.dead_letter_path = dead_letter_path
+        self._dead_letter_lock = threading.Lock()
+
+        # CRM objects go through batch/upsert keyed on a unique property, so replayed chunks
+        # (timeouts retried by tenacity, resumed or re-seeded runs) update instead of duplicating
+        self.upsert = upsert
+
+        # Records per batch, tuned per object type from payload sizes and response times
+        self.max_batch_bytes = max_batch_bytes
+        self._sizers: Dict[str, AdaptiveBatchSizer] = {}
+        self._sizers_lock = threading.Lock()
+
+        # Pre-flight check of CRM records against the portal's property definitions
+        self.schema = SchemaCache(self.base_url, token, self._get_with_retry, ttl=schema_ttl) if validate else None
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
+    def _encode(self, json_data: Any) -> EncodedBody:
+        """Serialize a JSON body, gzip-compressed when enabled and large enough, and record the time spent."""
+        start = time.perf_counter()
+        # Templated records (forms) splice in their pre-encoded constant part
+        data = encode_payload(json_data)
+        size = len(data)
+        headers = {}
+        if self.gzip_requests and size >= GZIP_MIN_BYTES:
+            data = gzip.compress(data)
+            headers["Content-Encoding"] = "gzip"
+        self.metrics.inc("encode_seconds_total", time.perf_counter() - start)
+        self.metrics.inc("request_body_bytes_total", len(data))
+        return EncodedBody(data, headers, size)
+
+    def _request(self, method: str, url: str, json_data: Any = None,
+                 files: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """
+        Send a single rate-limited request on the pooled session and record its latency.
+        `json_data` may already be an EncodedBody, which is sent unchanged.
+        `files` sends `json_data` as multipart form fields alongside the files instead of a JSON body.
+        """
+        self.metrics.inc("rate_limit_wait_seconds_total", self.limiter.acquire())
+
+        headers = {}
+        body = None
+        if files is not None:
+            # Let requests set the multipart boundary instead of the session's JSON content type
+            headers["Content-Type"] = None
+            body = json_data
+        elif json_data is not None:
+            if not isinstance(json_data, EncodedBody):
+                json_data = self._encode(json_data)
+            body = json_data.data
+            headers.update(json_data.headers)
+
+        endpoint = self._endpoint(url)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, data=body, files=files, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            self.metrics.inc("http_requests_total", endpoint=endpoint, method=method, status=type(e).__name__)
+            raise
+        elapsed = time.perf_counter() - start
+
+        self.metrics.observe("http_request_duration_seconds", elapsed, endpoint=endpoint, method=method)
+        self.metrics.inc("http_requests_total", endpoint=endpoint, method=method, status=response.status_code)
+        logger.debug(f"{method} {url} -> {response.status_code} in {elapsed * 1000:.1f} ms")
+
+        self._apply_rate_limit_headers(response)
+        response.raise_for_status()
+        return response
+
+    def _endpoint(self, url: str) -> str:
+        """Metrics label for a request URL: the path without query string and record IDs."""
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        return ID_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+
+    def _apply_rate_limit_headers(self, response: requests.Response):
+        """Feed HubSpot's quota headers back into client-side pacing."""
+        remaining = response.headers.get("X-HubSpot-RateLimit-Remaining")
+        if remaining is not None:
+            try:
+                self.limiter.update_remaining(int(remaining))
+            except ValueError:
+                pass
+
+        if response.status_code == 429:
+            # Hold back every worker, not just the one that got throttled
+            delay = retry_after_seconds(response)
+            if delay is not None:
+                self.limiter.pause(delay)
+
+    def timing_summary(self) -> Dict[str, float]:
+        """Latency statistics (seconds) over all requests sent so far."""
+        timings = self.metrics.values("http_request_duration_seconds")
+        if not timings:
+            return {"requests": 0}
+        return {
+            "requests": len(timings),
+            "total": sum(timings),
+            "mean": sum(timings) / len(timings),
+            "p50": percentile(timings, 0.5),
+            "p95": percentile(timings, 0.95),
+            "p99": percentile(timings, 0.99),
+            "max": timings[-1],
+        }
+
+    def log_timing_summary(self):
+        summary = self.timing_summary()
+        if not summary["requests"]:
+            return
+        logger.info(
+            f"Sent {summary['requests']} requests: mean {summary['mean'] * 1000:.1f} ms, "
+            f"p50 {summary['p50'] * 1000:.1f} ms, p95 {summary['p95'] * 1000:.1f} ms, p99 {summary['p99'] * 1000:.1f} ms, "
+            f"max {summary['max'] * 1000:.1f} ms"
+        )
+
+    def _post_with_retry(self, url: str, json_data: Any) -> requests.Response:
+        """Helper to perform POST requests with retry logic. The body is encoded once and reused by every attempt."""
+        return self._post_encoded_with_retry(url, self._encode(json_data))
 
     @retry(
-        retry=retry_if_exception_type(requests.exceptions.RequestException),
+        retry=retry_if_exception(is_retryable),
         stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
         reraise=True
     )
-    def _post_with_retry(self, url: str, json_data: Any) -> requests.Response:
-        """Helper to perform POST requests with retry logic."""
-        response = requests.post(url, headers=self.headers, json=json_data, timeout=self.timeout)
-        response.raise_for_status()
-        return response
+    def _post_encoded_with_retry(self, url: str, body: EncodedBody) -> requests.Response:
+        return self._request("POST", url, body)
 
     @retry(
-        retry=retry_if_exception_type(requests.exceptions.RequestException),
+        retry=retry_if_exception(lambda e: is_retryable(e) and not is_payload_too_large(e)),
+        stop=stop_after_attempt(5),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    def _post_batch_with_retry(self, url: str, body: EncodedBody) -> requests.Response:
+        """Like _post_encoded_with_retry, but a batch that is too large or times out is raised at once to be split."""
+        return self._request("POST", url, body)
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
         reraise=True
     )
     def _put_with_retry(self, url: str) -> requests.Response:
          """Helper to perform PUT requests with retry logic."""
-         response = requests.put(url, headers=self.headers, timeout=self.timeout)
-         response.raise_for_status()
-         return response
+         return self._request("PUT", url)
 
-    def batch_insert(self, object_type: str, records: List[Dict[str, Any]]) -> List[str]:
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(5),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    def _get_with_retry(self, url: str) -> requests.Response:
+        """Helper to perform GET requests with retry logic."""
+        return self._request("GET", url)
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    def _post_file_with_retry(self, url: str, fields: Dict[str, str], file_field: str, path: str,
+                              content_type: str) -> requests.Response:
+        """Helper to upload a file as multipart/form-data with retry logic. The file is reopened per attempt."""
+        with open(path, "rb") as f:
+            return self._request("POST", url, fields, files={file_field: (os.path.basename(path), f, content_type)})
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
+        before_sleep=_before_retry,
+        reraise=True
+    )
+    def _delete_with_retry(self, url: str) -> requests.Response:
+        """Helper to perform DELETE requests with retry logic."""
+        return self._request("DELETE", url)
+
+    def batch_insert(self, object_type: str, records: Iterable[Dict[str, Any]], start_offset: int = 0,
+                     on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
         """
         Batch insert records. Returns list of IDs of created objects.
+        `records` may be a list or a lazy iterator (e.g. BaseGenerator.iter_generate) for streaming.
+        `start_offset` is the position of the first record in the full dataset when resuming a run
+        whose leading records were already inserted; their IDs are taken from the journal.
+        `on_created` is called with the IDs of each batch (or record, for the marketing types
+        created one at a time) as soon as it is done, in record order, so later steps can start early.
         """
         if not self.token and object_type != "dry_run": 
              raise ValueError("HubSpot Access Token is missing. Please set HUBSPOT_ACCESS_TOKEN.")
@@ -55,135 +315,622 @@ class HubSpotInserter:
         created_ids = []
 
         if object_type == "forms":
-            return self._insert_sequential(object_type, records, f"{self.base_marketing_url}/forms")
+            return self._insert_sequential(object_type, records, f"{self.base_marketing_url}/forms", start_offset,
+                                           on_created)
         elif object_type == "marketing_emails":
-            return self._insert_sequential(object_type, records, f"{self.base_marketing_url}/emails")
+            return self._insert_sequential(object_type, records, f"{self.base_marketing_url}/emails", start_offset,
+                                           on_created)
         elif object_type == "marketing_events":
-            return self._insert_sequential(object_type, records, f"{self.base_marketing_url}/marketing-events/events")
+            return self._insert_sequential(object_type, records, f"{self.base_marketing_url}/marketing-events/events",
+                                           start_offset, on_created)
         elif object_type == "campaigns":
-            created_ids = self._insert_batch_generic(object_type, records, f"{self.base_marketing_url}/campaigns/batch/create")
+            created_ids = self._insert_batch_generic(object_type, records, f"{self.base_marketing_url}/campaigns/batch/create",
+                                                     start_offset, on_created)
             return created_ids
         else:
-            return self._insert_batch_generic(object_type, records, f"{self.base_crm_url}/{object_type}/batch/create")
-
-    def _insert_batch_generic(self, object_type: str, records: List[Dict[str, Any]], url: str) -> List[str]:
-        total_records = len(records)
-        logger.info(f"Starting batch insert for {total_records} {object_type}...")
-        all_created_ids = []
-
-        for i in range(0, total_records, MAX_BATCH_SIZE):
-            chunk = records[i:i + MAX_BATCH_SIZE]
-            inputs = [{"properties": record} for record in chunk]
-            payload = {"inputs": inputs}
-            
-            try:
-                response = self._post_with_retry(url, payload)
-                data = response.json()
-                
-                # Collect IDs
-                if "results" in data:
-                    ids = [item["id"] for item in data["results"]]
-                    all_created_ids.extend(ids)
-                    
-                logger.info(f"Successfully inserted batch {i // MAX_BATCH_SIZE + 1} ({len(chunk)} records).")
-            except requests.exceptions.RequestException as e:
-                self._log_hubspot_error(e, f"inserting batch {i // MAX_BATCH_SIZE + 1}")
-                # Don't create 'response' variable as it's not needed with helper
-            
-            # Rate Limit Sleep (Basic throttle on top of retry)
-            time.sleep(1.0) 
-        
+            return self._insert_batch_generic(object_type, records, self._crm_batch_url(object_type), start_offset,
+                                              on_created)
+
+    def _insert_batch_generic(self, object_type: str, records: Iterable[Dict[str, Any]], url: str,
+                              start_offset: int = 0,
+                              on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        total = f"{len(records)} " if hasattr(records, "__len__") else ""
+        logger.info(f"Starting batch insert for {total}{object_type} "
+                    f"(concurrency={self.concurrency}, rate limit={self.limiter.rate}/10s)...")
+        all_created_ids = self._resumed_ids(object_type, start_offset)
+        if all_created_ids and on_created:
+            on_created(list(all_created_ids))
+
+        jobs = self._batch_jobs(object_type, records, url, start_offset)
+        for placed in self._dispatch(lambda job: self._send_batch(*job), jobs):
+            ids = [record_id for _, record_id in placed]
+            all_created_ids.extend(ids)
+            if on_created:
+                on_created(ids)
+
+        logger.info(f"Finished batch insert for {object_type}: {len(all_created_ids)} records created.")
         return all_created_ids
 
-    def _insert_sequential(self, object_type: str, records: List[Dict[str, Any]], url: str) -> List[str]:
-        logger.info(f"Starting sequential insert for {len(records)} {object_type}...")
-        created_ids = []
-        for index, record in enumerate(records):
-            try:
-                response = self._post_with_retry(url, record)
-                data = response.json()
-                if "id" in data:
-                    created_ids.append(data["id"])
-                elif "externalEventId" in record:
-                     created_ids.append(record["externalEventId"])
-                
-                logger.info(f"Created {object_type} {index + 1}/{len(records)}")
-            except requests.exceptions.RequestException as e:
-                self._log_hubspot_error(e, f"creating {object_type} {index + 1}")
-            
-            # Rate Limit Sleep for sequential
-            time.sleep(0.3)
-            
+    def batch_insert_many(self, datasets: Dict[str, Iterable[Dict[str, Any]]],
+                          start_offsets: Optional[Dict[str, int]] = None) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Batch insert several independent CRM object types at once. Their chunks are interleaved
+        into one dispatch window, so a small object type doesn't leave workers idle while the
+        others finish. Returns the (position, ID) of every created record per object type, in
+        record order; positions of rejected records are missing.
+        """
+        start_offsets = start_offsets or {}
+        logger.info(f"Starting batch insert for {', '.join(datasets)} "
+                    f"(concurrency={self.concurrency}, rate limit={self.limiter.rate}/10s)...")
+        created = {
+            object_type: self._resumed_placed_ids(object_type, start_offsets.get(object_type, 0))
+            for object_type in datasets
+        }
+
+        streams = [
+            self._batch_jobs(object_type, records, self._crm_batch_url(object_type), start_offsets.get(object_type, 0))
+            for object_type, records in datasets.items()
+        ]
+        jobs = (job for round_jobs in zip_longest(*streams) for job in round_jobs if job is not None)
+        for object_type, placed in self._dispatch(lambda job: (job[0], self._send_batch(*job)), jobs):
+            created[object_type].extend(placed)
+
+        for object_type, placed in created.items():
+            logger.info(f"Finished batch insert for {object_type}: {len(placed)} records created.")
+        return created
+
+    def _batch_jobs(self, object_type: str, records: Iterable[Dict[str, Any]], url: str,
+                    start_offset: int = 0) -> Iterator[Tuple[str, str, int, List[Dict[str, Any]]]]:
+        """
+        Lazily yield (object_type, url, offset, chunk) for each batch of `records`, sized by the
+        object type's AdaptiveBatchSizer at the time the chunk is cut.
+        Chunks completed in an earlier attempt of the run are cut exactly as journaled, and new chunks
+        end where those begin, so a resumed run skips them whatever batch sizes it settles on.
+        """
+        sizer = self._sizer(object_type)
+        completed = self.journal.completed_chunks(object_type) if self.journal else {}
+        boundaries = sorted(completed)
+        iterator = iter(records)
+        if sizer.needs_sample():
+            # Size the first batches from one encoded record instead of waiting for a response
+            first = next(iterator, None)
+            if first is None:
+                return
+            sizer.sample(len(dumps(self._batch_input(object_type, first))))
+            iterator = chain([first], iterator)
+
+        offset = start_offset
+        while True:
+            size = completed.get(offset)
+            if not size:
+                size = sizer.size()
+                following = bisect_right(boundaries, offset)
+                if following < len(boundaries):
+                    size = min(size, boundaries[following] - offset)
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield object_type, url, offset, chunk
+            offset += len(chunk)
+
+    def _sizer(self, object_type: str) -> AdaptiveBatchSizer:
+        with self._sizers_lock:
+            if object_type not in self._sizers:
+                self._sizers[object_type] = AdaptiveBatchSizer(MAX_BATCH_SIZE, self.max_batch_bytes)
+            return self._sizers[object_type]
+
+    def _dispatch(self, fn: Callable[[Any], Any], jobs: Iterable[Any]) -> Iterator[Any]:
+        """
+        Run `fn` over `jobs` on `concurrency` threads, yielding results in job order.
+        Jobs are pulled lazily into a bounded window of 2 x concurrency, so a streaming
+        producer keeps generating while requests are in flight without running ahead of them.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = deque()
+            for job in jobs:
+                pending.append(executor.submit(fn, job))
+                if len(pending) >= self.concurrency * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _send_batch(self, object_type: str, url: str, offset: int, chunk: List[Dict[str, Any]],
+                    validated: bool = False) -> List[Tuple[int, str]]:
+        """
+        Send a single batch/create request. Returns the (position, ID) of each created record (none on failure).
+        `validated` means invalid records of the chunk were already dead-lettered (when it is half of a split batch).
+        """
+        label = f"batch of records {offset + 1}-{offset + len(chunk)}"
+        key = str(offset)
+        payload_hash, done = self._journal_lookup(object_type, key, chunk)
+        if done:
+            logger.info(f"Skipping {label} (completed in run {self.journal.run_id}).")
+            return RunJournal.placed_ids(done)
+
+        positions, settled = [], []
+        try:
+            # Offsets and counts in the journal stay those of the whole chunk, dropped records included
+            positions, records = self._preflight_positions(object_type, chunk, report=not validated)
+            if records:
+                self._create_with_bisection(object_type, url, records, label, settled, split_too_large=True)
+        except BatchTooLarge:
+            # Each half is journaled on its own, so one failing doesn't lose the other's IDs on resume
+            middle = len(chunk) // 2
+            return (self._send_batch(object_type, url, offset, chunk[:middle], validated=True) +
+                    self._send_batch(object_type, url, offset + middle, chunk[middle:], validated=True))
+        except requests.exceptions.RequestException as e:
+            return self._batch_failed(object_type, label, e, offset, chunk, positions, settled)
+        placed = [pair for sub in sorted(settled) for pair in self._placed(offset, positions, sub)]
+        self._chunk_created(object_type, key, placed, payload_hash, offset, len(chunk))
+        return placed
+
+    def _batch_failed(self, object_type: str, label: str, e: Exception, offset: int, chunk: List[Dict[str, Any]],
+                      positions: List[int], settled: List[SubBatch]) -> List[Tuple[int, str]]:
+        """
+        Log and journal a batch that failed with an error splitting can't fix. Sub-batches its bisection
+        had already settled are journaled as completed chunks of their own, so a resumed run doesn't
+        create them again, and their (position, ID) pairs are returned. The rest of the chunk is journaled as failed.
+        `positions` are those in `chunk` of the records that were sent.
+        """
+        self._log_hubspot_error(e, f"inserting {label}")
+        self.metrics.inc("batches_failed_total", object_type=object_type)
+
+        # Settled sub-batches as ranges of `chunk`, merged when adjacent. Records dropped by the
+        # preflight check were dead-lettered already, so they join the range before them.
+        ranges: List[Tuple[int, int, List[Tuple[int, str]]]] = []
+        for sub in sorted(settled):
+            begin = positions[sub.start] if sub.start else 0
+            end = positions[sub.start + sub.count] if sub.start + sub.count < len(positions) else len(chunk)
+            placed = self._placed(offset, positions, sub)
+            if ranges and ranges[-1][1] == begin:
+                begin, _, previous = ranges.pop()
+                placed = previous + placed
+            ranges.append((begin, end, placed))
+
+        created = []
+        failed_from = 0
+        for begin, end, placed in ranges:
+            self._journal_failed(object_type, offset, chunk, failed_from, begin, e)
+            self._chunk_created(object_type, str(offset + begin), placed, self._payload_hash(chunk[begin:end]),
+                                offset + begin, end - begin)
+            created.extend(placed)
+            failed_from = end
+        self._journal_failed(object_type, offset, chunk, failed_from, len(chunk), e)
+        if created:
+            logger.warning(f"Kept {len(created)} records of {label} created before it failed.")
+        return created
+
+    def _journal_failed(self, object_type: str, offset: int, chunk: List[Dict[str, Any]], begin: int, end: int,
+                        e: Exception):
+        """Journal records begin..end of the chunk at `offset` as failed, so a resumed run sends them again."""
+        if begin < end:
+            self._journal_record(object_type, str(offset + begin), "failed", None, self._payload_hash(chunk[begin:end]),
+                                 offset + begin, end - begin, str(e))
+
+    def _created(self, object_type: str, key: str, ids: List[str], payload_hash: Optional[str], offset: int,
+                 count: int, positions: Optional[List[int]] = None):
+        """Journal and count records created by a batch (or a single-record request)."""
+        self._journal_record(object_type, key, "ok", ids, payload_hash, offset, count, positions=positions)
+        self.metrics.inc("records_created_total", len(ids), object_type=object_type)
+
+    def _chunk_created(self, object_type: str, key: str, placed: List[Tuple[int, str]], payload_hash: Optional[str],
+                       offset: int, count: int):
+        """_created for a batch chunk's (position, ID) pairs; positions are journaled when records were rejected."""
+        positions = [position for position, _ in placed] if len(placed) != count else None
+        self._created(object_type, key, [record_id for _, record_id in placed], payload_hash, offset, count, positions)
+
+    @staticmethod
+    def _placed(offset: int, positions: List[int], sub: SubBatch) -> List[Tuple[int, str]]:
+        """(position, ID) of the records a sub-batch created; `positions` map records sent to the chunk."""
+        return [(offset + positions[sub.start + i], record_id) for i, record_id in enumerate(sub.ids)]
+
+    def _preflight(self, object_type: str, chunk: List[Dict[str, Any]], report: bool = True) -> List[Dict[str, Any]]:
+        """
+        Records of `chunk` that pass schema validation (with unwritable properties removed).
+        With `report`, the others go to the dead-letter file without costing an API call.
+        """
+        return self._preflight_positions(object_type, chunk, report)[1]
+
+    def _preflight_positions(self, object_type: str, chunk: List[Dict[str, Any]],
+                             report: bool = True) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """Like _preflight, with the positions in `chunk` of the records that passed first."""
+        if self.schema is None or object_type in MARKETING_OBJECT_TYPES:
+            return list(range(len(chunk))), chunk
+        validator = self.schema.validator(object_type)
+        if validator is None:
+            return list(range(len(chunk))), chunk
+        id_property = self._upsert_id_property(object_type)
+        if id_property and not validator.has(id_property):
+            raise ValueError(f"Upserting {object_type} needs a unique '{id_property}' property in the portal; "
+                             f"create it before running with --upsert.")
+
+        positions, valid, invalid = validator.validate_positions(chunk)
+        if invalid and report:
+            logger.warning(f"{len(invalid)} of {len(chunk)} {object_type} failed schema validation and won't be sent, e.g. "
+                           f"{invalid[0][1]['errors'][0]['message']}.")
+            self._dead_letter_each(object_type, invalid)
+        return positions, valid
+
+    def _create_with_bisection(self, object_type: str, url: str, chunk: List[Dict[str, Any]], label: str,
+                               settled: List[SubBatch], start: int = 0, split_too_large: bool = False) -> List[str]:
+        """
+        POST a batch/create. If HubSpot rejects the batch as invalid, split it in halves until the
+        offending records are isolated: they go to the dead-letter file and the rest still get created.
+        With `split_too_large`, a batch that is too large (413) or times out raises BatchTooLarge
+        instead of being retried as it is, and later batches of the type shrink.
+        Errors that splitting can't fix (auth, exhausted retries, network) are raised; sub-batches
+        done by then are in `settled` (`start` is the position of `chunk` among the records sent).
+        """
+        body = self._batch_body(object_type, chunk)
+        try:
+            response = self._batch_poster(chunk, split_too_large)(url, body)
+        except requests.exceptions.RequestException as e:
+            if not self._should_split(object_type, chunk, body, label, e, split_too_large, settled, start):
+                return []
+            middle = len(chunk) // 2
+            return (self._create_with_bisection(object_type, url, chunk[:middle], label, settled, start) +
+                    self._create_with_bisection(object_type, url, chunk[middle:], label, settled, start + middle))
+        return self._batch_created(object_type, chunk, body, label, response, settled, start)
+
+    # Decisions shared by both backends around a batch/create; the backends only send the requests
+
+    def _batch_body(self, object_type: str, chunk: List[Dict[str, Any]]) -> EncodedBody:
+        return self._encode({"inputs": [self._batch_input(object_type, record) for record in chunk]})
+
+    def _batch_poster(self, chunk: List[Dict[str, Any]], split_too_large: bool) -> Callable[[str, EncodedBody], Any]:
+        """POST method for a batch: one that raises too-large batches at once when they can still be split."""
+        if split_too_large and len(chunk) > 1:
+            return self._post_batch_with_retry
+        return self._post_encoded_with_retry
+
+    def _should_split(self, object_type: str, chunk: List[Dict[str, Any]], body: EncodedBody, label: str,
+                      e: requests.exceptions.RequestException, split_too_large: bool, settled: List[SubBatch],
+                      start: int) -> bool:
+        """
+        What a failed batch/create becomes. True when the chunk should be bisected to isolate invalid
+        records; False when its records were dead-lettered (and added to `settled`). Raises BatchTooLarge
+        when the chunk must be resent in smaller batches, and `e` when splitting can't fix it.
+        """
+        if split_too_large and len(chunk) > 1 and is_payload_too_large(e):
+            ceiling = self._sizer(object_type).shrink(len(chunk), body.size)
+            self.metrics.inc("batch_splits_total", object_type=object_type)
+            reason = e.response.status_code if e.response is not None else "timed out"
+            logger.warning(f"{label.capitalize()} too large ({len(chunk)} records, {body.size} bytes, {reason}), "
+                           f"splitting it; {object_type} batches now capped at {ceiling} records.")
+            raise BatchTooLarge(label) from e
+        if e.response is None or e.response.status_code not in SPLITTABLE_STATUS_CODES:
+            raise e
+        details = self._parse_hubspot_error(e)
+        if len(chunk) == 1 or self._fails_every_record(details, chunk):
+            self._log_hubspot_error(e, f"inserting {label}")
+            self._dead_letter(object_type, chunk, details)
+            settled.append(SubBatch(start, len(chunk), []))
+            return False
+
+        self.metrics.inc("batch_splits_total", object_type=object_type)
+        logger.warning(f"{label.capitalize()} rejected ({e.response.status_code}), "
+                       f"splitting {len(chunk)} records to isolate the invalid ones...")
+        return True
+
+    def _batch_created(self, object_type: str, chunk: List[Dict[str, Any]], body: EncodedBody, label: str,
+                       response: requests.Response, settled: List[SubBatch], start: int) -> List[str]:
+        """IDs from a successful batch/create, whose timing also tunes later batch sizes."""
+        self._sizer(object_type).observe(len(chunk), body.size, response.elapsed.total_seconds())
+        data = response.json()
+        logger.info(f"Successfully inserted {label} ({len(chunk)} records).")
+        ids = [item["id"] for item in data.get("results", [])]
+        settled.append(SubBatch(start, len(chunk), ids))
+        return ids
+
+    def _crm_batch_url(self, object_type: str) -> str:
+        action = "upsert" if self._upsert_id_property(object_type) else "create"
+        return f"{self.base_crm_url}/{object_type}/batch/{action}"
+
+    def _upsert_id_property(self, object_type: str) -> Optional[str]:
+        """Unique property batch/upsert matches `object_type` records on, or None when records are created."""
+        if not self.upsert or object_type in MARKETING_OBJECT_TYPES:
+            return None
+        return UPSERT_ID_PROPERTIES.get(object_type, EXTERNAL_ID_PROPERTY)
+
+    def _batch_input(self, object_type: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Batch input for a record. Plain property dicts are wrapped; records already shaped
+        as inputs (with "properties" and e.g. inline "associations") are sent as they are.
+        """
+        item = record if "properties" in record else {"properties": record}
+        id_property = self._upsert_id_property(object_type)
+        if id_property:
+            key = item["properties"].get(id_property)
+            if not key:
+                raise ValueError(f"Upserting {object_type} needs '{id_property}' on every record "
+                                 f"(generate them with keyed=True).")
+            item = {"idProperty": id_property, "id": key, **item}
+        return item
+
+    @staticmethod
+    def _fails_every_record(details: Dict[str, Any], chunk: List[Dict[str, Any]]) -> bool:
+        """
+        True when a property HubSpot rejects outright (unknown or read-only) appears in every record, so
+        bisecting would only waste calls. Invalid values (a bad dealstage or email) fail only the records
+        that carry them, so those batches are always bisected.
+        """
+        properties = {err["property"] for err in details.get("errors", [])
+                      if err.get("code") in PROPERTY_ERROR_CODES and err.get("property")}
+        return bool(properties) and all(properties & record.get("properties", record).keys() for record in chunk)
+
+    def _dead_letter(self, object_type: str, records: List[Dict[str, Any]], details: Dict[str, Any]):
+        """Append rejected records with HubSpot's parsed error details to the dead-letter file."""
+        self._dead_letter_each(object_type, [(record, details) for record in records])
+
+    def _dead_letter_each(self, object_type: str, rejected: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        """Append (record, error details) pairs to the dead-letter file."""
+        self.metrics.inc("records_rejected_total", len(rejected), object_type=object_type)
+        if not self.dead_letter_path:
+            return
+        with self._dead_letter_lock:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for record, details in rejected:
+                    f.write(json.dumps({"object_type": object_type, "record": record, "error": details},
+                                       default=str) + "\n")
+        logger.warning(f"Wrote {len(rejected)} rejected {object_type} to {self.dead_letter_path}")
+
+    def _insert_sequential(self, object_type: str, records: Iterable[Dict[str, Any]], url: str,
+                           start_offset: int = 0,
+                           on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        total = f"/{start_offset + len(records)}" if hasattr(records, "__len__") else ""
+        logger.info(f"Starting sequential insert for {object_type}...")
+        created_ids = self._resumed_ids(object_type, start_offset)
+        if created_ids and on_created:
+            on_created(list(created_ids))
+        for index, record in enumerate(records, start=start_offset):
+            ids = self._insert_one(object_type, url, index, record, total)
+            created_ids.extend(ids)
+            if on_created and ids:
+                on_created(ids)
         return created_ids
 
+    def _insert_one(self, object_type: str, url: str, index: int, record: Dict[str, Any],
+                    total: str = "") -> List[str]:
+        """POST a single record to an endpoint without a batch API. Returns its ID (empty on failure)."""
+        key = str(index)
+        payload_hash, done = self._journal_lookup(object_type, key, record)
+        if done:
+            return done["ids"]
+
+        try:
+            response = self._post_with_retry(url, record)
+        except requests.exceptions.RequestException as e:
+            self._insert_one_failed(object_type, key, index, record, e, payload_hash)
+            return []
+        return self._inserted_one(object_type, key, index, record, response, payload_hash, total)
+
+    def _inserted_one(self, object_type: str, key: str, index: int, record: Dict[str, Any],
+                      response: requests.Response, payload_hash: Optional[str], total: str = "") -> List[str]:
+        data = response.json()
+        ids = []
+        if "id" in data:
+            ids = [data["id"]]
+        elif "externalEventId" in record:
+            ids = [record["externalEventId"]]
+        self._created(object_type, key, ids, payload_hash, index, 1)
+        logger.info(f"Created {object_type} {index + 1}{total}")
+        return ids
+
+    def _insert_one_failed(self, object_type: str, key: str, index: int, record: Dict[str, Any], e: Exception,
+                           payload_hash: Optional[str]):
+        self._log_hubspot_error(e, f"creating {object_type} {index + 1}")
+        self._journal_record(object_type, key, "failed", None, payload_hash, index, 1, str(e))
+        if getattr(e, "response", None) is not None and e.response.status_code in SPLITTABLE_STATUS_CODES:
+            self._dead_letter(object_type, [record], self._parse_hubspot_error(e))
+
     def insert_campaign_sub_items(self, campaign_ids: List[str], generator):
         """Add Budget and Spend items to created campaigns."""
         logger.info(f"Adding Budget and Spend items to {len(campaign_ids)} campaigns...")
-        
+        jobs = self._campaign_sub_item_jobs(campaign_ids, generator)
+        for _ in self._dispatch(lambda job: self._add_campaign_sub_item(*job), jobs):
+            pass
+
+    def _campaign_sub_item_jobs(self, campaign_ids: List[str], generator) -> List[Tuple[str, str, Dict[str, Any]]]:
+        # Items are generated up front on this thread (generators aren't thread-safe),
+        # then every budget and spend POST is an independent job on the shared, rate-limited pool.
+        jobs = []
         for campaign_id in campaign_ids:
-            # Add Budget
-            try:
-                budget = generator.generate_budget_item()
-                url = f"{self.base_marketing_url}/campaigns/{campaign_id}/budget"
-                self._post_with_retry(url, budget)
-            except Exception as e:
-                logger.error(f"Failed to add budget to campaign {campaign_id}: {e}")
+            if not self._already_done("campaign_budget", campaign_id):
+                jobs.append(("budget", campaign_id, generator.generate_budget_item()))
+            if not self._already_done("campaign_spend", campaign_id):
+                jobs.append(("spend", campaign_id, generator.generate_spend_item()))
+        return jobs
 
-            # Add Spend
-            try:
-                spend = generator.generate_spend_item()
-                url = f"{self.base_marketing_url}/campaigns/{campaign_id}/spend"
-                self._post_with_retry(url, spend)
-            except Exception as e:
-                logger.error(f"Failed to add spend to campaign {campaign_id}: {e}")
-            
-            time.sleep(0.2) 
+    def _add_campaign_sub_item(self, kind: str, campaign_id: str, item: Dict[str, Any]) -> bool:
+        try:
+            self._post_with_retry(f"{self.base_marketing_url}/campaigns/{campaign_id}/{kind}", item)
+        except Exception as e:
+            return self._link_finished(f"campaign_{kind}", campaign_id, f"adding {kind} to campaign {campaign_id}", e)
+        return self._link_finished(f"campaign_{kind}", campaign_id)
 
     def associate_assets_to_campaigns(self, campaign_ids: List[str], asset_map: Dict[str, List[str]]):
         """Associate assets to campaigns."""
         logger.info("Associating assets to campaigns...")
-        
-        for asset_type, asset_ids in asset_map.items():
-            if not asset_ids:
-                continue
-                
-            for i, asset_id in enumerate(asset_ids):
-                if not campaign_ids: break
-                campaign_id = campaign_ids[i % len(campaign_ids)]
-                
-                url = f"{self.base_marketing_url}/campaigns/{campaign_id}/assets/{asset_type}/{asset_id}"
-                
-                try:
-                    self._put_with_retry(url)
-                    logger.info(f"Linked {asset_type} {asset_id} to campaign {campaign_id}")
-                except Exception as e:
-                    self._log_hubspot_error(e, f"linking {asset_type} {asset_id} to {campaign_id}")
-                
-                time.sleep(0.2)
+        if not campaign_ids:
+            return
+        self.link_assets(self._asset_links(campaign_ids, asset_map))
+
+    def link_assets(self, links: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Link (campaign_id, asset_type, asset_id) triples, skipping those journaled as done. `links` may be
+        a lazy iterator that yields them as they become known; they all go through one dispatch window.
+        Returns the number of links made.
+        """
+        # The campaign assets API has no batch endpoint, so each PUT is a job on the shared pool
+        jobs = ((campaign_id, asset_type, asset_id) for campaign_id, asset_type, asset_id in links
+                if not self._already_done("campaign_asset", f"{campaign_id}/{asset_type}/{asset_id}"))
+        results = list(self._dispatch(lambda job: self._link_asset(*job), jobs))
+        logger.info(f"Linked {sum(results)}/{len(results)} assets to campaigns.")
+        return sum(results)
+
+    @staticmethod
+    def _asset_links(campaign_ids: List[str], asset_map: Dict[str, List[str]]) -> List[Tuple[str, str, str]]:
+        """Assets of each type spread round-robin over the campaigns, as link triples."""
+        return [(campaign_ids[i % len(campaign_ids)], asset_type, asset_id)
+                for asset_type, asset_ids in asset_map.items() for i, asset_id in enumerate(asset_ids or [])]
+
+    def _link_asset(self, campaign_id: str, asset_type: str, asset_id: str) -> bool:
+        url = f"{self.base_marketing_url}/campaigns/{campaign_id}/assets/{asset_type}/{asset_id}"
+        key = f"{campaign_id}/{asset_type}/{asset_id}"
+        try:
+            self._put_with_retry(url)
+        except Exception as e:
+            return self._link_finished("campaign_asset", key, f"linking {asset_type} {asset_id} to {campaign_id}", e)
+        logger.info(f"Linked {asset_type} {asset_id} to campaign {campaign_id}")
+        return self._link_finished("campaign_asset", key)
+
+    def _link_finished(self, object_type: str, key: str, context: str = "", error: Optional[Exception] = None) -> bool:
+        """Journal a campaign budget/spend item or asset link, logging `error` if it failed. True on success."""
+        if error is None:
+            self._journal_record(object_type, key, "ok")
+            return True
+        self._log_hubspot_error(error, context)
+        self._journal_record(object_type, key, "failed", error=str(error))
+        return False
+
+    def archive(self, object_type: str, ids: List[str]) -> int:
+        """
+        Remove records created by an earlier run. CRM objects and campaigns are archived with
+        batch/archive, 100 IDs per call; forms, marketing emails and marketing events have no
+        batch endpoint and are deleted one by one. Returns the number of records removed.
+        """
+        logger.info(f"Removing {len(ids)} {object_type} (concurrency={self.concurrency})...")
+        if object_type == "forms":
+            removed = self._delete_each(f"{self.base_marketing_url}/forms", object_type, ids)
+        elif object_type == "marketing_emails":
+            removed = self._delete_each(f"{self.base_marketing_url}/emails", object_type, ids)
+        elif object_type == "marketing_events":
+            removed = self._delete_each(f"{self.base_marketing_url}/marketing-events", object_type, ids)
+        elif object_type == "campaigns":
+            removed = self._archive_batches(f"{self.base_marketing_url}/campaigns/batch/archive", object_type, ids)
+        else:
+            removed = self._archive_batches(f"{self.base_crm_url}/{object_type}/batch/archive", object_type, ids)
+        logger.info(f"Removed {removed}/{len(ids)} {object_type}.")
+        return removed
+
+    def _archive_batches(self, url: str, object_type: str, ids: List[str]) -> int:
+        return sum(self._dispatch(lambda chunk: self._send_archive_batch(url, object_type, chunk),
+                                  chunked(ids, MAX_BATCH_SIZE)))
+
+    def _send_archive_batch(self, url: str, object_type: str, chunk: List[str]) -> int:
+        try:
+            self._post_with_retry(url, {"inputs": [{"id": record_id} for record_id in chunk]})
+            return len(chunk)
+        except requests.exceptions.RequestException as e:
+            self._log_hubspot_error(e, f"archiving {len(chunk)} {object_type}")
+            return 0
+
+    def _delete_each(self, url: str, object_type: str, ids: List[str]) -> int:
+        return sum(self._dispatch(lambda record_id: self._delete_record(url, object_type, record_id), ids))
+
+    def _delete_record(self, url: str, object_type: str, record_id: str) -> bool:
+        try:
+            self._delete_with_retry(f"{url}/{record_id}")
+            return True
+        except requests.exceptions.RequestException as e:
+            if getattr(e, "response", None) is not None and e.response.status_code == 404:
+                # Deleted by hand or by an earlier purge
+                logger.info(f"{object_type} {record_id} no longer exists.")
+                return True
+            self._log_hubspot_error(e, f"deleting {object_type} {record_id}")
+            return False
+
+    def _already_done(self, object_type: str, key: str, payload_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Journal entry if this unit of work completed in an earlier attempt of the run."""
+        if not self.journal:
+            return None
+        done = self.journal.get_completed(object_type, key)
+        if done and payload_hash and done.get("hash") != payload_hash \
+                and object_type not in self._hash_mismatch_warned:
+            # Usually just wall-clock timestamps; the chunk was created already so it is still skipped
+            self._hash_mismatch_warned.add(object_type)
+            logger.warning(f"Regenerated {object_type} payloads differ from the journal of run "
+                           f"{self.journal.run_id}; skipping completed chunks by position.")
+        return done
+
+    def _journal_lookup(self, object_type: str, key: str, payload: Any) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """(payload hash, journal entry if already completed) for a chunk or record; (None, None) without a journal."""
+        if not self.journal:
+            return None, None
+        payload_hash = RunJournal.payload_hash(payload)
+        return payload_hash, self._already_done(object_type, key, payload_hash)
+
+    def _payload_hash(self, payload: Any) -> Optional[str]:
+        return RunJournal.payload_hash(payload) if self.journal else None
+
+    def _journal_record(self, object_type: str, key: str, status: str, ids: Optional[List[str]] = None,
+                        payload_hash: Optional[str] = None, offset: Optional[int] = None,
+                        count: Optional[int] = None, error: Optional[str] = None,
+                        positions: Optional[List[int]] = None):
+        if self.journal:
+            self.journal.record(object_type, key, status, ids, payload_hash, offset, count, error, positions)
+
+    def _resumed_ids(self, object_type: str, start_offset: int) -> List[str]:
+        """IDs of records before `start_offset`, which the caller skipped regenerating."""
+        return [record_id for _, record_id in self._resumed_placed_ids(object_type, start_offset)]
+
+    def _resumed_placed_ids(self, object_type: str, start_offset: int) -> List[Tuple[int, str]]:
+        """(position, ID) of the records before `start_offset`, which the caller skipped regenerating."""
+        if not start_offset:
+            return []
+        if not self.journal:
+            raise ValueError("start_offset requires a journal to recover the IDs of skipped records.")
+        return self.journal.placed_ids_before(object_type, start_offset)
+
+    @staticmethod
+    def _parse_hubspot_error(e: Exception) -> Dict[str, Any]:
+        """Extract HubSpot's error body into a flat dict (message, category, per-field errors, batch failures)."""
+        details: Dict[str, Any] = {"error": str(e)}
+        response = getattr(e, 'response', None)
+        if response is None:
+            return details
+
+        details["status"] = response.status_code
+        try:
+            error_data = response.json()
+        except ValueError:
+            # Not JSON
+            details["raw"] = response.text
+            return details
+
+        details["body"] = error_data
+        details["message"] = error_data.get('message', 'No message')
+        details["category"] = error_data.get('category')
+
+        if 'failures' in error_data: # Batch failures
+            details["failures"] = error_data['failures']
+
+        if 'errors' in error_data: # Standard validation errors
+            details["errors"] = [
+                {
+                    "property": err.get('context', {}).get('propertyName', ['Unknown Property'])[0],
+                    "code": err.get('code'),
+                    "message": err.get('message', ''),
+                }
+                for err in error_data['errors']
+            ]
+        return details
 
     def _log_hubspot_error(self, e: Exception, context: str):
         """Helper to log detailed HubSpot errors."""
         logger.error(f"Failed {context}: {e}")
-        
-        if hasattr(e, 'response') and e.response is not None:
-            try:
-                error_data = e.response.json()
-                logger.error(f"Full Error Response: {json.dumps(error_data, indent=2)}")
-                
-                message = error_data.get('message', 'No message')
-                
-                logger.error(f"HubSpot Message: {message}")
-                
-                if 'failures' in error_data: # Batch failures
-                    for failure in error_data['failures']:
-                        logger.error(f"Failure Detail: {failure}")
-
-                if 'errors' in error_data: # Standard validation errors
-                    for err in error_data['errors']:
-                        prop_name = err.get('context', {}).get('propertyName', ['Unknown Property'])[0]
-                        err_msg = err.get('message', '')
-                        logger.error(f"-> Field '{prop_name}': {err_msg}")
-                        
-            except ValueError:
-                # Not JSON
-                logger.error(f"Raw Response: {e.response.text}")
+
+        details = self._parse_hubspot_error(e)
+        if "raw" in details:
+            logger.error(f"Raw Response: {details['raw']}")
+        if "body" not in details:
+            return
+
+        logger.error(f"Full Error Response: {json.dumps(details['body'], indent=2)}")
+        logger.error(f"HubSpot Message: {details['message']}")
+
+        for failure in details.get("failures", []):
+            logger.error(f"Failure Detail: {failure}")
+
+        for err in details.get("errors", []):
+            logger.error(f"-> Field '{err['property']}': {err['message']}")
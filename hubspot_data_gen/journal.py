@@ -0,0 +1,157 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from .config import JOURNAL_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal of an ingestion run.
+    The first line holds the run parameters (so the same data can be regenerated on resume),
+    every following line records one unit of work: a batch chunk, a sequential record,
+    or a campaign sub-item/link, keyed by (object_type, key).
+    """
+
+    def __init__(self, run_id: str, directory: str = JOURNAL_DIR):
+        self.run_id = run_id
+        self.directory = directory
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        self.file = None
+        self.params: Dict[str, Any] = {}
+        self.completed: Dict[tuple, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            self._load()
+
+    @staticmethod
+    def new_run_id() -> str:
+        return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    @staticmethod
+    def payload_hash(payload: Any) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave a truncated last line; that unit simply gets replayed
+                    logger.warning(f"Ignoring corrupt journal line in {self.path}")
+                    continue
+                if entry.get("type") == "params":
+                    self.params = entry["params"]
+                elif entry.get("status") == "ok":
+                    self.completed[(entry["object_type"], entry["key"])] = entry
+
+    def _append(self, entry: Dict[str, Any]):
+        with self.lock:
+            if self.file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+
+    def write_params(self, params: Dict[str, Any]):
+        self.params = params
+        self._append({"type": "params", "params": params})
+
+    def record(self, object_type: str, key: str, status: str, ids: Optional[List[str]] = None,
+               payload_hash: Optional[str] = None, offset: Optional[int] = None, count: Optional[int] = None,
+               error: Optional[str] = None, positions: Optional[List[int]] = None):
+        """
+        Journal one unit of work. `positions` are the record positions of `ids` when not every
+        record of the chunk was created (the others were rejected); otherwise they are implied.
+        """
+        entry = {
+            "type": "chunk",
+            "object_type": object_type,
+            "key": key,
+            "offset": offset,
+            "count": count,
+            "hash": payload_hash,
+            "status": status,
+            "ids": ids or [],
+            "error": error,
+            "ts": datetime.now().isoformat(timespec="seconds"),
+        }
+        if positions is not None:
+            entry["positions"] = positions
+        if status == "ok":
+            with self.lock:
+                self.completed[(object_type, key)] = entry
+        self._append(entry)
+
+    def get_completed(self, object_type: str, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.completed.get((object_type, key))
+
+    def completed_chunks(self, object_type: str) -> Dict[int, int]:
+        """Record count of every completed chunk of `object_type`, by offset."""
+        with self.lock:
+            return {entry["offset"]: entry["count"] for (obj, _), entry in self.completed.items()
+                    if obj == object_type and entry.get("offset") is not None}
+
+    def completed_prefix(self, object_type: str) -> int:
+        """Number of leading records of `object_type` covered by contiguous completed chunks."""
+        chunks = self.completed_chunks(object_type)
+        offset = 0
+        while offset in chunks and chunks[offset]:
+            offset += chunks[offset]
+        return offset
+
+    def ids_before(self, object_type: str, offset: int) -> List[str]:
+        """IDs created by completed chunks that start before `offset`, in record order."""
+        return [record_id for _, record_id in self.placed_ids_before(object_type, offset)]
+
+    def placed_ids_before(self, object_type: str, offset: int) -> List[Tuple[int, str]]:
+        """(position, ID) of the records created by completed chunks that start before `offset`."""
+        with self.lock:
+            entries = sorted(
+                (entry for (obj, _), entry in self.completed.items()
+                 if obj == object_type and entry.get("offset") is not None and entry["offset"] < offset),
+                key=lambda entry: entry["offset"]
+            )
+        return [pair for entry in entries for pair in self.placed_ids(entry)]
+
+    @staticmethod
+    def placed_ids(entry: Dict[str, Any]) -> List[Tuple[int, str]]:
+        """(position, ID) of the records a completed chunk created."""
+        positions = entry.get("positions") or range(entry["offset"], entry["offset"] + len(entry["ids"]))
+        return list(zip(positions, entry["ids"]))
+
+    def manifest(self) -> Dict[str, List[str]]:
+        """IDs of every record this run created, per object type, in creation order."""
+        with self.lock:
+            entries = [entry for entry in self.completed.values() if entry.get("offset") is not None]
+        # Object types in the order the run reached them, IDs in record order
+        manifest: Dict[str, List[str]] = {}
+        for entry in sorted(entries, key=lambda entry: entry["ts"]):
+            manifest.setdefault(entry["object_type"], [])
+        for entry in sorted(entries, key=lambda entry: entry["offset"]):
+            manifest[entry["object_type"]].extend(entry["ids"])
+        return manifest
+
+    def write_manifest(self) -> str:
+        """Write manifest() next to the journal as <run_id>.manifest.json. Returns its path."""
+        path = os.path.join(self.directory, f"{self.run_id}.manifest.json")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"run_id": self.run_id, "params": self.params, "ids": self.manifest()}, f, indent=2)
+        return path
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
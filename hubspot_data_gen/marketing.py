@@ -0,0 +1,137 @@
+import logging
+import threading
+from typing import List, Dict, Optional, Tuple, Iterator
+from .generators import FormGenerator, CampaignGenerator
+from .scheduler import TaskGraph
+from .timeline import Timeline
+
+logger = logging.getLogger(__name__)
+
+
+class MarketingOrchestrator:
+    """
+    Builds the Marketing Hub dataset: forms, campaigns with budget and spend items, and forms linked
+    to campaigns. The steps are tasks of a TaskGraph rather than phases:
+
+        forms ------------------------> links (each form as soon as it and the campaigns exist)
+        campaigns --+-----------------> links
+                    +-> budget/spend (each batch of campaigns as soon as it is created)
+
+    Forms and campaigns are created side by side, and follow-up calls start from the first IDs that
+    come back, so a run takes about as long as its longest chain (usually the forms, created one per
+    request) instead of the sum of every step. Links are streamed into one link task, so they share
+    a single dispatch window however the form and campaign IDs trickle in.
+    """
+
+    def __init__(self, inserter, seed: Optional[int] = None, workers: int = 1, timeline: Optional[Timeline] = None):
+        self.inserter = inserter
+        self.seed = seed
+        self.workers = workers
+        self.form_generator = FormGenerator(seed=seed)
+        self.campaign_generator = CampaignGenerator(seed=seed, timeline=timeline)
+        self.graph = TaskGraph()
+
+        self.form_ids: List[str] = []
+        self.campaign_ids: List[str] = []
+        self.campaign_count = 0
+        self.lock = threading.Lock()
+        # Next form to link, (campaign, form) pairs waiting for the link task, and the steps still
+        # producing IDs to link (the link task ends once both forms and campaigns are done)
+        self.next_form = 0
+        self.pending_links: List[Tuple[str, str]] = []
+        self.links_ready = threading.Condition(self.lock)
+        self.producers = {"forms", "campaigns"}
+        self.item_tasks: List[str] = []
+
+    def run(self, count: int, dry_run: bool = False) -> Dict[str, List[str]]:
+        """Generate and insert the marketing dataset for `count`. Returns created IDs per object type."""
+        logger.info("=== Starting Marketing Hub Orchestration ===")
+        form_count = max(1, count // 2)
+        self.campaign_count = max(1, count // 5)
+
+        if dry_run:
+            logger.info("Generating forms...")
+            forms = self.form_generator.generate(form_count, workers=self.workers)
+            logger.info(f"[Dry Run] Generated {len(forms)} forms.")
+            logger.info("Generating campaigns...")
+            campaigns = self.campaign_generator.generate(self.campaign_count, workers=self.workers)
+            logger.info(f"[Dry Run] Generated {len(campaigns)} campaigns + Budget/Spend simulation.")
+            logger.info(f"[Dry Run] Would link {len(forms)} forms to these campaigns.")
+            return {"forms": [], "campaigns": []}
+
+        self.graph.add("forms", lambda: self._insert_forms(form_count))
+        self.graph.add("campaigns", self._insert_campaigns)
+        self.graph.add("links", lambda: self.inserter.link_assets(self._links()))
+        self.graph.run()
+
+        logger.info(f"=== Marketing Hub Orchestration complete: {len(self.form_ids)} forms, "
+                    f"{len(self.campaign_ids)} campaigns ===")
+        return {"forms": self.form_ids, "campaigns": self.campaign_ids}
+
+    def _insert_forms(self, count: int):
+        try:
+            logger.info("Generating forms...")
+            forms = self.form_generator.generate(count, workers=self.workers)
+            self.inserter.batch_insert("forms", forms, on_created=self._forms_created)
+        finally:
+            self._producer_done("forms")
+
+    def _insert_campaigns(self):
+        try:
+            logger.info("Generating campaigns...")
+            campaigns = self.campaign_generator.generate(self.campaign_count, workers=self.workers)
+            self.inserter.batch_insert("campaigns", campaigns, on_created=self._campaigns_created)
+            if not self.campaign_ids:
+                logger.warning("No campaigns created, skipping linking.")
+        finally:
+            self._producer_done("campaigns")
+
+    def _producer_done(self, step: str):
+        # Also when the step failed, so the link task doesn't wait for IDs that will never come
+        with self.lock:
+            self.producers.discard(step)
+            self._queue_links()
+            self.links_ready.notify()
+
+    def _forms_created(self, ids: List[str]):
+        with self.lock:
+            self.form_ids.extend(ids)
+            self._queue_links()
+
+    def _campaigns_created(self, ids: List[str]):
+        if not ids:
+            return
+        with self.lock:
+            self.campaign_ids.extend(ids)
+            # Budget/spend tasks run one after the other: they share the (not thread-safe) generator
+            name = f"budget/spend {len(self.item_tasks) + 1}"
+            self.item_tasks.append(self.graph.add(
+                name, lambda: self.inserter.insert_campaign_sub_items(ids, self.campaign_generator),
+                after=self.item_tasks[-1:]))
+
+    def _queue_links(self):
+        """
+        Once every campaign is created, pair the forms created so far with them round-robin (form i goes
+        to campaign i modulo the number created), and wake the link task (called with the lock held).
+        Only IDs HubSpot returned are used, so rejected campaigns are never linked to, and a resumed run
+        pairs the journaled forms and campaigns the same way.
+        """
+        if "campaigns" in self.producers or not self.campaign_ids:
+            return
+        while self.next_form < len(self.form_ids):
+            self.pending_links.append((self.campaign_ids[self.next_form % len(self.campaign_ids)],
+                                       self.form_ids[self.next_form]))
+            self.next_form += 1
+        self.links_ready.notify()
+
+    def _links(self) -> Iterator[Tuple[str, str, str]]:
+        """Link triples for the link task, as they are queued, until forms and campaigns are both done."""
+        while True:
+            with self.lock:
+                while not self.pending_links and self.producers:
+                    self.links_ready.wait()
+                if not self.pending_links:
+                    return
+                pairs, self.pending_links = self.pending_links, []
+            for campaign_id, form_id in pairs:
+                yield campaign_id, "form", form_id
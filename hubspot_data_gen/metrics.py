@@ -0,0 +1,181 @@
+import json
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported Prometheus metric name
+METRIC_PREFIX = "hubspot_data_gen_"
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def percentile(values: List[float], quantile: float) -> float:
+    """Nearest-rank percentile of already sorted `values`."""
+    return values[min(len(values) - 1, max(0, math.ceil(len(values) * quantile) - 1))]
+
+
+class Metrics:
+    """
+    Thread-safe counters and timings for one run, labelled like Prometheus metrics
+    (e.g. http_requests_total{endpoint=..., status=...}). Timings keep every observation,
+    so summaries report exact percentiles.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = {}
+        self.timings: Dict[LabelKey, List[float]] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        key = _key(name, labels)
+        with self.lock:
+            self.timings.setdefault(key, []).append(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_total(self, name: str, **labels: Any) -> float:
+        """Sum of a counter over every label set that includes `labels`."""
+        wanted = {(label, str(value)) for label, value in labels.items()}
+        with self.lock:
+            return sum(value for (metric, key), value in self.counters.items()
+                       if metric == name and wanted <= set(key))
+
+    def values(self, name: str) -> List[float]:
+        """All observations of a timing across its label sets, sorted."""
+        with self.lock:
+            return sorted(value for (metric, _), values in self.timings.items() if metric == name for value in values)
+
+    def merge(self, other: "Metrics", **labels: Any):
+        """Add everything recorded in `other` to this registry, with `labels` added to every series."""
+        with other.lock:
+            counters = list(other.counters.items())
+            timings = [(key, list(values)) for key, values in other.timings.items()]
+        for (name, key), value in counters:
+            self.inc(name, value, **dict(key), **labels)
+        for (name, key), values in timings:
+            merged = _key(name, {**dict(key), **labels})
+            with self.lock:
+                self.timings.setdefault(merged, []).extend(values)
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.timings.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable view: counter values and per-label-set timing statistics."""
+        with self.lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            timings = []
+            for (name, labels), values in sorted(self.timings.items()):
+                values = sorted(values)
+                timings.append({
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": len(values),
+                    "sum": sum(values),
+                    **{f"p{int(quantile * 100)}": percentile(values, quantile) for quantile in SUMMARY_QUANTILES},
+                    "max": values[-1],
+                })
+        return {"started": self.started, "exported": time.time(), "counters": counters, "timings": timings}
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format: counters as counters, timings as summaries."""
+        snapshot = self.snapshot()
+        lines = []
+        declared = set()
+
+        def declare(name: str, kind: str):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for counter in snapshot["counters"]:
+            name = METRIC_PREFIX + counter["name"]
+            declare(name, "counter")
+            lines.append(f"{name}{_labels(counter['labels'])} {counter['value']}")
+        for timing in snapshot["timings"]:
+            name = METRIC_PREFIX + timing["name"]
+            declare(name, "summary")
+            for quantile in SUMMARY_QUANTILES:
+                labels = {**timing["labels"], "quantile": str(quantile)}
+                lines.append(f"{name}{_labels(labels)} {timing[f'p{int(quantile * 100)}']}")
+            lines.append(f"{name}_sum{_labels(timing['labels'])} {timing['sum']}")
+            lines.append(f"{name}_count{_labels(timing['labels'])} {timing['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Export to `path`: Prometheus text for .prom/.txt files, JSON otherwise."""
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith((".prom", ".txt")):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=2)
+        logger.info(f"Metrics written to {path}")
+
+    def log_summary(self):
+        """End-of-run summary: where the time went and what happened to requests."""
+        requests = self.counter_total("http_requests_total")
+        if requests:
+            statuses: Dict[str, float] = {}
+            with self.lock:
+                for (name, labels), value in self.counters.items():
+                    if name == "http_requests_total":
+                        status = dict(labels).get("status", "?")
+                        statuses[status] = statuses.get(status, 0) + value
+            logger.info("Requests by status: "
+                        + ", ".join(f"{status}: {count:.0f}" for status, count in sorted(statuses.items())))
+
+        seconds = {
+            "generating": self.counter_total("generation_seconds_total"),
+            "in requests": sum(self.values("http_request_duration_seconds")),
+            "rate-limit waits": self.counter_total("rate_limit_wait_seconds_total"),
+            "retry backoff": self.counter_total("retry_sleep_seconds_total"),
+            "encoding": self.counter_total("encode_seconds_total"),
+            "writing files": self.counter_total("sink_write_seconds_total"),
+        }
+        parts = [f"{label} {value:.2f}s" for label, value in seconds.items() if value]
+        retries = self.counter_total("retries_total")
+        if retries:
+            parts.append(f"{retries:.0f} retries")
+        if parts:
+            # Request and wait times are summed over worker threads, so they can exceed wall time
+            logger.info(f"Time {time.time() - self.started:.1f}s wall: " + ", ".join(parts))
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        label + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for label, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+# Process-wide registry shared by the inserter, generators and sinks unless they are given their own
+METRICS = Metrics()
@@ -0,0 +1,352 @@
+import re
+import gzip
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from collections import deque, Counter
+from itertools import count
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+from .config import RATE_LIMIT_WINDOW
+
+logger = logging.getLogger(__name__)
+
+# Paths the inserter, importer and purge use, mapped to a route name
+ROUTES = [
+    ("POST", re.compile(r"^/crm/v3/objects/[^/]+/batch/(create|upsert)$"), "crm_batch"),
+    ("POST", re.compile(r"^/crm/v3/objects/[^/]+/batch/archive$"), "archive"),
+    ("POST", re.compile(r"^/crm/v3/imports/?$"), "import"),
+    ("GET", re.compile(r"^/crm/v3/imports/[^/]+/errors"), "import_errors"),
+    ("GET", re.compile(r"^/crm/v3/imports/[^/]+$"), "import_status"),
+    ("GET", re.compile(r"^/crm/v3/properties/[^/]+/?$"), "properties"),
+    ("POST", re.compile(r"^/marketing/v3/campaigns/batch/create$"), "crm_batch"),
+    ("POST", re.compile(r"^/marketing/v3/campaigns/batch/archive$"), "archive"),
+    ("POST", re.compile(r"^/marketing/v3/campaigns/[^/]+/(budget|spend)$"), "campaign_item"),
+    ("PUT", re.compile(r"^/marketing/v3/campaigns/[^/]+/assets/[^/]+/[^/]+$"), "campaign_asset"),
+    ("POST", re.compile(r"^/marketing/v3/(forms|emails|marketing-events/events)/?$"), "create_one"),
+    ("DELETE", re.compile(r"^/marketing/v3/(forms|emails|marketing-events)/[^/]+$"), "delete"),
+]
+
+
+# Rows per page of an import's error report
+IMPORT_ERROR_PAGE_SIZE = 10
+
+
+class MockHubSpotServer:
+    """
+    Local stand-in for the HubSpot endpoints this package calls, for offline benchmarks and tests.
+    Every request waits `latency` (+ up to `jitter`) seconds. Requests beyond `rate_limit` per
+    10 seconds get HubSpot's 429, `throttle_rate` / `error_rate` of requests randomly fail with
+    429 / 5xx, and `reject_rate` of records are rejected as invalid (always the same records,
+    so bisection can isolate them). Bodies over `max_body_bytes` get a 413, and `latency_per_kb`
+    adds processing time proportional to the body size, like HubSpot's on large batches.
+    `properties` maps object types to the property definitions served for schema validation.
+    Imports report PROCESSING for `import_polls` status checks, then `import_state`, and serve
+    `import_errors` as their error report, IMPORT_ERROR_PAGE_SIZE rows per page.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05, jitter: float = 0.0,
+                 rate_limit: Optional[int] = None, throttle_rate: float = 0.0, error_rate: float = 0.0,
+                 reject_rate: float = 0.0, seed: Optional[int] = None, max_body_bytes: Optional[int] = None,
+                 latency_per_kb: float = 0.0, properties: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 import_polls: int = 0, import_state: str = "DONE",
+                 import_errors: Optional[List[Dict[str, Any]]] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.reject_rate = reject_rate
+        self.max_body_bytes = max_body_bytes
+        self.latency_per_kb = latency_per_kb
+        self.properties = properties or {}
+        self.import_polls = import_polls
+        self.import_state = import_state
+        self.import_errors = import_errors or []
+        self.random = random.Random(seed)
+        # Import request specs by import ID, and the status checks each import has had
+        self.imports: Dict[str, Dict[str, Any]] = {}
+        self.import_checks: Counter = Counter()
+
+        self.ids = count(1)
+        self.lock = threading.Lock()
+        self.window: deque = deque()
+        self.stats: Counter = Counter()
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockHubSpotServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-hubspot", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Request and record counters since start (or the last reset)."""
+        with self.lock:
+            return dict(self.stats)
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+
+    def count(self, **counters: int):
+        with self.lock:
+            self.stats.update(counters)
+
+    def next_id(self) -> str:
+        with self.lock:
+            return str(next(self.ids))
+
+    def admit(self) -> Tuple[bool, float, int]:
+        """Sliding-window rate limit. Returns (allowed, retry_after, remaining)."""
+        if not self.rate_limit:
+            return True, 0.0, 0
+        now = time.monotonic()
+        with self.lock:
+            while self.window and now - self.window[0] >= RATE_LIMIT_WINDOW:
+                self.window.popleft()
+            if len(self.window) >= self.rate_limit:
+                return False, RATE_LIMIT_WINDOW - (now - self.window[0]), 0
+            self.window.append(now)
+            return True, 0.0, self.rate_limit - len(self.window)
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def rejects(self, record: Any) -> bool:
+        """Deterministic per record, so a rejected record fails again in every split batch."""
+        if self.reject_rate <= 0:
+            return False
+        digest = hashlib.md5(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 < self.reject_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body leave in one segment (flushed per request), so delayed ACKs don't add latency
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _read_body(self) -> Tuple[Any, int]:
+        """
+        Decoded JSON body and its uncompressed size. Multipart bodies (import uploads) are decoded
+        to {field name: content}; other content types to None.
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        if body and content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+            return {part.get_param("name", header="content-disposition"): part.get_content()
+                    for part in message.iter_parts()}, len(body)
+        if not body or not content_type.startswith("application/json"):
+            return None, len(body)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body), len(body)
+
+    def _send(self, status: int, data: Any = None, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        mock: MockHubSpotServer = self.server.mock
+        body, size = self._read_body()
+        path = self.path.split("?", 1)[0]
+        route = next((name for method, pattern, name in ROUTES
+                      if method == self.command and pattern.match(path)), None)
+        mock.count(requests=1, **{f"route:{route or 'unknown'}": 1})
+
+        time.sleep(mock.latency + (mock.random.uniform(0, mock.jitter) if mock.jitter else 0)
+                   + mock.latency_per_kb * size / 1024)
+
+        allowed, retry_after, remaining = mock.admit()
+        headers = {}
+        if mock.rate_limit:
+            headers = {
+                "X-HubSpot-RateLimit-Max": str(mock.rate_limit),
+                "X-HubSpot-RateLimit-Remaining": str(remaining),
+                "X-HubSpot-RateLimit-Interval-Milliseconds": str(int(RATE_LIMIT_WINDOW * 1000)),
+            }
+        if not allowed or mock.roll(mock.throttle_rate):
+            mock.count(throttled=1)
+            headers["Retry-After"] = str(max(1, round(retry_after)))
+            return self._send(429, {
+                "status": "error",
+                "message": "You have reached your ten_secondly_rolling limit.",
+                "errorType": "RATE_LIMIT",
+                "policyName": "TEN_SECONDLY_ROLLING",
+            }, headers)
+        if mock.max_body_bytes and size > mock.max_body_bytes:
+            mock.count(too_large=1)
+            return self._send(413, {"status": "error", "message": "Request body too large",
+                                    "category": "VALIDATION_ERROR"}, headers)
+        if mock.roll(mock.error_rate):
+            mock.count(errors=1)
+            return self._send(mock.random.choice([500, 502, 503]), {"status": "error", "message": "Internal error"})
+
+        if route is None:
+            return self._send(404, {"status": "error", "message": f"No mock for {self.command} {path}",
+                                    "category": "OBJECT_NOT_FOUND"})
+        getattr(self, f"_route_{route}")(mock, body or {}, headers)
+
+    def _route_crm_batch(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        inputs = body.get("inputs", [])
+        rejected = [item for item in inputs if mock.rejects(item.get("properties", item))]
+        if rejected:
+            mock.count(rejected=len(rejected))
+            return self._send(400, {
+                "status": "error",
+                "message": "Property values were not valid",
+                "category": "VALIDATION_ERROR",
+                "errors": [{"message": "Mock validation failure", "code": "INVALID_OPTION", "context": {}}
+                           for _ in rejected],
+            }, headers)
+
+        mock.count(records=len(inputs))
+        results = [{"id": mock.next_id(), "properties": {}} for _ in inputs]
+        upsert = self.path.rstrip("/").endswith("upsert")
+        if upsert:
+            for result in results:
+                result["new"] = True
+        self._send(200 if upsert else 201, {"status": "COMPLETE", "results": results}, headers)
+
+    def _route_create_one(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        if mock.rejects(body):
+            mock.count(rejected=1)
+            return self._send(400, {"status": "error", "message": "Mock validation failure",
+                                    "category": "VALIDATION_ERROR"}, headers)
+        mock.count(records=1)
+        record_id = mock.next_id()
+        self._send(201, {"id": record_id, "objectId": record_id, **{
+            key: body[key] for key in ("externalEventId", "name") if key in body
+        }}, headers)
+
+    def _route_archive(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        mock.count(archived=len(body.get("inputs", [])))
+        self._send(204, None, headers)
+
+    def _route_delete(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        mock.count(archived=1)
+        self._send(204, None, headers)
+
+    def _route_campaign_item(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        self._send(201, {"id": mock.next_id(), **body}, headers)
+
+    def _route_campaign_asset(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        self._send(204, None, headers)
+
+    def _route_properties(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        object_type = self.path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+        if object_type not in mock.properties:
+            return self._send(404, {"status": "error", "message": f"Unknown object type {object_type}",
+                                    "category": "OBJECT_NOT_FOUND"}, headers)
+        self._send(200, {"results": mock.properties[object_type]}, headers)
+
+    def _route_import(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        import_id = mock.next_id()
+        rows = max(0, len(str(body.get("files", "")).splitlines()) - 1)  # Minus the header row
+        with mock.lock:
+            mock.imports[import_id] = json.loads(body.get("importRequest", "{}"))
+        mock.count(imported=rows)
+        self._send(200, {"id": import_id, "state": "STARTED"}, headers)
+
+    def _route_import_status(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        import_id = self.path.rstrip("/").rsplit("/", 1)[-1]
+        with mock.lock:
+            mock.import_checks[import_id] += 1
+            checks = mock.import_checks[import_id]
+        state = "PROCESSING" if checks <= mock.import_polls else mock.import_state
+        self._send(200, {"id": import_id, "state": state, "metadata": {"counters": {}}}, headers)
+
+    def _route_import_errors(self, mock: MockHubSpotServer, body: Dict[str, Any], headers: Dict[str, str]):
+        query = self.path.partition("?")[2]
+        start = int(dict(pair.partition("=")[::2] for pair in query.split("&") if pair).get("after") or 0)
+        end = start + IMPORT_ERROR_PAGE_SIZE
+        data: Dict[str, Any] = {"results": mock.import_errors[start:end]}
+        if end < len(mock.import_errors):
+            data["paging"] = {"next": {"after": str(end)}}
+        self._send(200, data, headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock of the HubSpot API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds.")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Requests allowed per 10 seconds (429 beyond).")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 5xx.")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Fraction of records rejected as invalid.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-body-bytes", type=int, default=None, help="Answer larger request bodies with 413.")
+    parser.add_argument("--latency-per-kb", type=float, default=0.0, help="Seconds added per KB of request body.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = MockHubSpotServer(args.host, args.port, args.latency, args.jitter, args.rate_limit,
+                               args.throttle_rate, args.error_rate, args.reject_rate, args.seed,
+                               args.max_body_bytes, args.latency_per_kb)
+    logger.info(f"Mock HubSpot API listening on {server.url} "
+                f"(set HUBSPOT_API_BASE_URL={server.url}); Ctrl-C to stop.")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        logger.info(f"Served: {server.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import os
+import re
+import json
+import queue
+import logging
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Callable, NamedTuple
+from .config import PORTAL_QUEUE_SIZE
+
+try:
+    import yaml
+except ImportError:  # Optional: only needed for YAML portal files
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+# Settings a portal entry (or the file's "defaults") may set besides its name and token
+PORTAL_SETTINGS = {"rate_limit", "concurrency", "pool_size", "base_url"}
+
+# Portal names become part of journal file names
+PORTAL_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class Portal(NamedTuple):
+    """A target portal. Unset limits fall back to the command line ones."""
+    name: str
+    token: str
+    rate_limit: Optional[int] = None
+    concurrency: Optional[int] = None
+    pool_size: Optional[int] = None
+    base_url: Optional[str] = None
+
+
+def load_portals(path: str) -> List[Portal]:
+    """
+    Read the portals of a multi-portal run from a JSON or YAML file:
+
+        {"defaults": {"rate_limit": 100, "concurrency": 4},
+         "portals": [{"name": "sandbox-1", "token_env": "SANDBOX_1_TOKEN", "rate_limit": 190},
+                     {"name": "sandbox-2", "token": "pat-..."}]}
+
+    `token_env` names an environment variable holding the token, so the file can be committed.
+    Raises ValueError for malformed files.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("YAML portal files require PyYAML. Install it with: pip install pyyaml")
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    if not isinstance(config, dict) or not isinstance(config.get("portals"), list) or not config["portals"]:
+        raise ValueError(f"{path}: expected a 'portals' list.")
+    defaults = config.get("defaults", {})
+    unknown = set(defaults) - PORTAL_SETTINGS
+    if unknown:
+        raise ValueError(f"{path}: unknown defaults {', '.join(sorted(unknown))}.")
+
+    portals = []
+    for index, entry in enumerate(config["portals"]):
+        name = str(entry.get("name") or f"portal-{index + 1}")
+        if not PORTAL_NAME.match(name):
+            raise ValueError(f"{path}: portal name '{name}' may only contain letters, digits, '.', '_' and '-'.")
+        unknown = set(entry) - PORTAL_SETTINGS - {"name", "token", "token_env"}
+        if unknown:
+            raise ValueError(f"{path}: unknown settings {', '.join(sorted(unknown))} for portal {name}.")
+        token = entry.get("token") or (os.getenv(entry["token_env"], "") if entry.get("token_env") else "")
+        if not token:
+            raise ValueError(f"{path}: no token for portal {name}"
+                             + (f" ({entry['token_env']} is not set)." if entry.get("token_env") else "."))
+        settings = {**defaults, **{key: value for key, value in entry.items() if key in PORTAL_SETTINGS}}
+        portals.append(Portal(name, token, **settings))
+
+    names = [portal.name for portal in portals]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"{path}: duplicate portal names {', '.join(sorted(duplicates))}.")
+    return portals
+
+
+class _End:
+    """Queue sentinel: the shared stream is exhausted, or failed with `error`."""
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class _QueueStream:
+    """One consumer's view of a split stream. close() releases the feeder from waiting on it."""
+
+    def __init__(self, maxsize: int):
+        self.queue = queue.Queue(maxsize)
+        self.closed = threading.Event()
+
+    def __iter__(self) -> "_QueueStream":
+        return self
+
+    def __next__(self) -> Any:
+        item = self.queue.get()
+        if isinstance(item, _End):
+            self.close()
+            if item.error is not None:
+                raise item.error
+            raise StopIteration
+        return item
+
+    def put(self, item: Any):
+        while not self.closed.is_set():
+            try:
+                self.queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def close(self):
+        self.closed.set()
+
+
+def split_stream(records: Iterable[Any], consumers: int, maxsize: int = PORTAL_QUEUE_SIZE) -> List[_QueueStream]:
+    """
+    One iterator per consumer over the same `records`, pulled once by a feeder thread.
+    Each consumer has a bounded queue, so the stream runs at most `maxsize` records ahead of the
+    slowest consumer. A consumer that is closed (e.g. its portal failed) no longer holds the others back.
+    """
+    source = iter(records)
+    streams = [_QueueStream(maxsize) for _ in range(consumers)]
+
+    def feed():
+        try:
+            for record in source:
+                for stream in streams:
+                    stream.put(record)
+        except BaseException as e:
+            for stream in streams:
+                stream.put(_End(e))
+            return
+        for stream in streams:
+            stream.put(_End())
+
+    threading.Thread(target=feed, name="portal-feed", daemon=True).start()
+    return streams
+
+
+class PortalFanOut:
+    """
+    Sends one generated dataset to several HubSpot portals at once. Each portal has its own inserter
+    (so its own token, rate limiter, connection pool and journal) and runs on its own thread, so
+    a run takes about as long as the slowest portal instead of the sum of all of them.
+    Exposes the batch_insert surface the single-object flow uses; flows that need the IDs one
+    step creates for the next (marketing orchestration, graph) are run per portal with run_each.
+    """
+    journal = None  # Each portal's inserter resumes from its own journal
+
+    def __init__(self, inserters: Dict[str, Any]):
+        self.inserters = inserters
+
+    def batch_insert(self, object_type: str, records: Iterable[Dict[str, Any]],
+                     start_offset: int = 0) -> Dict[str, List[str]]:
+        """
+        Insert `records` (starting at `start_offset` of the dataset) into every portal.
+        A list is shared as it is; a lazy iterator is generated once and split between the portals.
+        Portals resuming a run skip the records their journal already covers. Returns IDs per portal.
+        """
+        if isinstance(records, list):
+            streams = [records] * len(self.inserters)
+        else:
+            streams = split_stream(records, len(self.inserters))
+
+        def insert(name: str, inserter: Any, stream: Iterable[Dict[str, Any]]) -> List[str]:
+            try:
+                done = inserter.journal.completed_prefix(object_type) if inserter.journal else 0
+                skip = max(0, done - start_offset)
+                if skip:
+                    logger.info(f"Portal {name}: skipping {skip} {object_type} already inserted.")
+                remaining = stream[skip:] if isinstance(stream, list) else islice(stream, skip, None)
+                return inserter.batch_insert(object_type, remaining, start_offset=start_offset + skip)
+            finally:
+                if isinstance(stream, _QueueStream):
+                    stream.close()
+
+        return self._run({name: (lambda inserter, stream=stream, name=name: insert(name, inserter, stream))
+                          for name, stream in zip(self.inserters, streams)})
+
+    def run_each(self, flow: Callable[[Any], Any]) -> Dict[str, Any]:
+        """Run `flow(inserter)` for every portal concurrently. Returns results per portal."""
+        return self._run({name: flow for name in self.inserters})
+
+    def _run(self, tasks: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="portal") as executor:
+            futures = {name: executor.submit(task, self.inserters[name]) for name, task in tasks.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    # One portal failing (bad token, quota) doesn't stop the others
+                    logger.error(f"Portal {name} failed: {e}")
+                    results[name] = None
+        return results
+
+    def merge_metrics(self, metrics: Any):
+        """Add every portal's metrics to `metrics`, labelled with the portal name."""
+        for name, inserter in self.inserters.items():
+            metrics.merge(getattr(inserter, "inserter", inserter).metrics, portal=name)
+
+    def log_timing_summary(self):
+        for name, inserter in self.inserters.items():
+            logger.info(f"Portal {name}:")
+            inserter.log_timing_summary()
+
+    def close(self):
+        for inserter in self.inserters.values():
+            inserter.close()
@@ -0,0 +1,81 @@
+import time
+import asyncio
+import threading
+from typing import Optional
+from .config import DEFAULT_RATE_LIMIT, RATE_LIMIT_WINDOW
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all requests of an inserter.
+    `rate` is the number of requests allowed per `window` seconds (HubSpot's limit unit).
+    """
+
+    def __init__(self, rate: int = DEFAULT_RATE_LIMIT, window: float = RATE_LIMIT_WINDOW,
+                 burst: Optional[int] = None):
+        if rate <= 0 or window <= 0:
+            raise ValueError("Rate limit and window must be positive.")
+        self.rate = rate
+        self.window = window
+        self.capacity = float(burst or rate)
+        self.fill_rate = rate / window  # tokens per second
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.fill_rate)
+        self.last_refill = now
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` if available and return 0, otherwise return how long to wait before trying again."""
+        with self.lock:
+            pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                return pause
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.fill_rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns the time spent waiting in seconds."""
+        waited = 0.0
+        while True:
+            delay = self._reserve(tokens)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def update_remaining(self, remaining: int):
+        """
+        Reconcile with HubSpot's X-HubSpot-RateLimit-Remaining header.
+        The server-side window is shared with every other client of the app, so never assume
+        more budget than it reports.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, float(max(remaining, 0)))
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self.lock:
+            self.tokens = 0.0
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AsyncTokenBucket(TokenBucket):
+    """TokenBucket for asyncio code: acquire() suspends the waiting task instead of blocking the thread."""
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        waited = 0.0
+        while True:
+            delay = self._reserve(tokens)
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
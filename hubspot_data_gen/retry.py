@@ -0,0 +1,74 @@
+import logging
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+import requests
+from tenacity import RetryCallState
+from tenacity.wait import wait_base
+
+logger = logging.getLogger(__name__)
+
+# 429 plus transient server-side failures. Anything else in the 4xx range is a
+# configuration/payload problem (bad property, missing scope, bad token) and retrying won't fix it.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    response = getattr(exc, "response", None)
+    return response.status_code if response is not None else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Retry connection errors, timeouts, 429s and 5xx. Fail fast on everything else."""
+    if not isinstance(exc, requests.exceptions.RequestException):
+        return False
+
+    status = _status_code(exc)
+    if status is None:
+        return True  # Connection reset, timeout, DNS... no response at all
+
+    if status == 429:
+        # The daily quota won't reset within any sensible retry window
+        try:
+            return exc.response.json().get("policyName") != "DAILY"
+        except ValueError:
+            return True
+
+    return status in RETRYABLE_STATUS_CODES
+
+
+def is_payload_too_large(exc: BaseException) -> bool:
+    """413, or no response within the timeout: a smaller batch may succeed where resending this one won't."""
+    return isinstance(exc, requests.exceptions.ReadTimeout) or _status_code(exc) == 413
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as delta-seconds or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class wait_retry_after(wait_base):
+    """Sleep exactly as long as a 429's Retry-After asks, otherwise defer to `fallback`."""
+
+    def __init__(self, fallback: wait_base):
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if exc is not None and _status_code(exc) == 429:
+            delay = retry_after_seconds(exc.response)
+            if delay is not None:
+                logger.warning(f"Rate limited by HubSpot, retrying in {delay:.1f}s (Retry-After).")
+                return delay
+        return self.fallback(retry_state)
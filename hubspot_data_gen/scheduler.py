@@ -0,0 +1,90 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Tuple, Set
+from .config import ORCHESTRATION_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class TaskGraph:
+    """
+    Runs named tasks on a thread pool, each as soon as every task it depends on has finished,
+    so independent chains of steps overlap instead of running one phase after another.
+    Tasks may be added while the graph runs (e.g. by a task as its first results arrive).
+    A task that fails is logged and the tasks depending on it are skipped; the others go on.
+    """
+
+    def __init__(self, workers: int = ORCHESTRATION_WORKERS):
+        self.workers = workers
+        self.lock = threading.Condition()
+        self.waiting: Dict[str, Tuple[Callable[[], Any], Set[str]]] = {}
+        self.results: Dict[str, Any] = {}
+        self.failed: Set[str] = set()
+        self.started: Set[str] = set()
+        self.running = 0
+        self.executor = None
+
+    def add(self, name: str, fn: Callable[[], Any], after: Iterable[str] = ()) -> str:
+        """Schedule `fn` to run once the tasks named in `after` have finished. Returns `name`."""
+        with self.lock:
+            if name in self.waiting or name in self.started or name in self.failed:
+                raise ValueError(f"Task '{name}' already exists.")
+            self.waiting[name] = (fn, set(after))
+            self._start_ready()
+        return name
+
+    def run(self) -> Dict[str, Any]:
+        """Run every task, including those added along the way, and return their results by name."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="task") as executor:
+            with self.lock:
+                self.executor = executor
+                self._start_ready()
+                while self.running:
+                    self.lock.wait()
+                self.executor = None
+                unknown = {name: after - self.results.keys() for name, (_, after) in self.waiting.items()}
+        for name, missing in unknown.items():
+            logger.error(f"Task {name} never ran: it waits on unknown tasks {', '.join(sorted(missing))}.")
+        return self.results
+
+    def _start_ready(self):
+        """Submit the waiting tasks whose dependencies have finished (called with the lock held)."""
+        if self.executor is None:
+            return
+        changed = True
+        while changed:
+            changed = False
+            for name, (fn, after) in list(self.waiting.items()):
+                if after & self.failed:
+                    # Skipping a task also skips everything waiting on it, hence the outer loop
+                    del self.waiting[name]
+                    self.failed.add(name)
+                    logger.warning(f"Skipping {name}: {', '.join(sorted(after & self.failed))} failed.")
+                    changed = True
+                elif after <= self.results.keys():
+                    del self.waiting[name]
+                    self.started.add(name)
+                    self.running += 1
+                    self.executor.submit(self._execute, name, fn)
+
+    def _execute(self, name: str, fn: Callable[[], Any]):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            logger.error(f"Task {name} failed: {e}")
+            with self.lock:
+                self.failed.add(name)
+                self._finish()
+            return
+        logger.debug(f"Task {name} finished in {time.perf_counter() - start:.2f}s")
+        with self.lock:
+            self.results[name] = result
+            self._finish()
+
+    def _finish(self):
+        self.running -= 1
+        self._start_ready()
+        self.lock.notify_all()
@@ -0,0 +1,209 @@
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Callable, Tuple
+import requests
+from .config import SCHEMA_CACHE_DIR, SCHEMA_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    try:
+        return math.isfinite(float(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_epoch_ms(value: Any) -> bool:
+    return (isinstance(value, int) and not isinstance(value, bool)) or (isinstance(value, str) and value.isdigit())
+
+
+def _is_date(value: Any) -> bool:
+    """HubSpot date properties take YYYY-MM-DD or epoch milliseconds at midnight UTC."""
+    if _is_epoch_ms(value):
+        return int(value) % DAY_MS == 0
+    return isinstance(value, str) and bool(DATE_PATTERN.match(value))
+
+
+def _is_datetime(value: Any) -> bool:
+    """Epoch milliseconds or an ISO 8601 timestamp."""
+    if _is_epoch_ms(value):
+        return True
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+def _is_bool(value: Any) -> bool:
+    return isinstance(value, bool) or str(value).lower() in ("true", "false")
+
+
+TYPE_CHECKS = {"number": _is_number, "date": _is_date, "datetime": _is_datetime}
+
+
+def _enumeration_check(definition: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    options = {str(option["value"]) for option in definition.get("options", []) if "value" in option}
+    if not options or definition.get("referencedObjectType"):
+        # Options resolved from other objects (owners, pipelines of another type...) can't be checked offline
+        return None
+    if definition.get("fieldType") == "checkbox":
+        # Multi-select: values joined with semicolons
+        return lambda value: all(part in options for part in str(value).split(";") if part)
+    return lambda value: str(value) in options
+
+
+def _without(record: Dict[str, Any], names: set) -> Dict[str, Any]:
+    if "properties" in record:
+        return {**record, "properties": {key: value for key, value in record["properties"].items() if key not in names}}
+    return {key: value for key, value in record.items() if key not in names}
+
+
+class RecordValidator:
+    """
+    Checks generated records against the property definitions of one object type, a property at a
+    time across the whole batch. Properties the portal doesn't have, or that are read-only, are
+    stripped from the records; records with values HubSpot would reject (unknown enumeration options
+    such as a dealstage or hs_pipeline_stage, malformed numbers and dates) are returned as invalid.
+    """
+
+    def __init__(self, object_type: str, definitions: List[Dict[str, Any]]):
+        self.object_type = object_type
+        self.writable = set()
+        self.checks: Dict[str, Tuple[str, Callable[[Any], bool]]] = {}
+        for definition in definitions:
+            name = definition["name"]
+            if definition.get("modificationMetadata", {}).get("readOnlyValue") or definition.get("calculated"):
+                continue
+            self.writable.add(name)
+            kind = definition.get("type")
+            if kind == "bool" or definition.get("fieldType") == "booleancheckbox":
+                check = _is_bool
+            elif kind == "enumeration":
+                check = _enumeration_check(definition)
+            else:
+                check = TYPE_CHECKS.get(kind)
+            if check is not None:
+                self.checks[name] = (kind, check)
+        self._stripped_warned = set()
+        self._lock = threading.Lock()
+
+    def has(self, name: str) -> bool:
+        return name in self.writable
+
+    def validate(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Split `records` (plain property dicts, or batch inputs with "properties") into the valid ones
+        and (record, error details) pairs for the invalid ones. Unwritable properties are removed from
+        copies: the same records may also be sent to other portals, with other schemas.
+        """
+        _, valid, invalid = self.validate_positions(records)
+        return valid, invalid
+
+    def validate_positions(self, records: List[Dict[str, Any]]) -> Tuple[List[int], List[Dict[str, Any]],
+                                                                       List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """Like validate, with the positions of the valid records in `records` first."""
+        properties = [record.get("properties", record) for record in records]
+        names = set().union(*properties) if properties else set()
+
+        unwritable = names - self.writable
+        if unwritable:
+            records = [_without(record, unwritable) if unwritable & values.keys() else record
+                       for record, values in zip(records, properties)]
+            properties = [record.get("properties", record) for record in records]
+            names -= unwritable
+            self._warn_stripped(unwritable)
+
+        errors: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for name in names & self.checks.keys():
+            kind, check = self.checks[name]
+            for index, values in enumerate(properties):
+                value = values.get(name)
+                if value is not None and value != "" and not check(value):
+                    errors[index].append({"property": name, "code": "INVALID_" + kind.upper(),
+                                          "message": f"{value!r} is not a valid {kind} for {name}"})
+
+        positions = [index for index in range(len(records)) if index not in errors]
+        valid = [records[index] for index in positions]
+        invalid = [(records[index], {"category": "PREFLIGHT_VALIDATION",
+                                     "message": "Rejected before sending by schema validation",
+                                     "errors": record_errors})
+                   for index, record_errors in sorted(errors.items())]
+        return positions, valid, invalid
+
+    def _warn_stripped(self, names: set):
+        with self._lock:
+            new = names - self._stripped_warned
+            self._stripped_warned |= new
+        if new:
+            logger.warning(f"Dropping {', '.join(sorted(new))} from {self.object_type}: "
+                           f"not a writable property in this portal.")
+
+
+class SchemaCache:
+    """
+    Property definitions per object type, fetched from /crm/v3/properties/{object_type} at most
+    once per `ttl` seconds. Definitions are kept on disk per portal (keyed by a hash of the token,
+    never the token itself), so repeated runs don't refetch them.
+    `fetch` sends a GET with the caller's retries and rate limiting (HubSpotInserter._get_with_retry).
+    """
+
+    def __init__(self, base_url: str, token: str, fetch: Callable[[str], requests.Response],
+                 directory: str = SCHEMA_CACHE_DIR, ttl: float = SCHEMA_CACHE_TTL):
+        self.base_url = base_url.rstrip("/")
+        self.fetch = fetch
+        self.directory = directory
+        self.ttl = ttl
+        self.portal_key = hashlib.sha256(f"{self.base_url}:{token}".encode("utf-8")).hexdigest()[:12]
+        self.validators: Dict[str, Optional[RecordValidator]] = {}
+        self.lock = threading.Lock()
+
+    def validator(self, object_type: str) -> Optional[RecordValidator]:
+        """Validator for `object_type`, or None when its schema can't be loaded (validation is then skipped)."""
+        with self.lock:
+            if object_type not in self.validators:
+                definitions = self.properties(object_type)
+                self.validators[object_type] = RecordValidator(object_type, definitions) if definitions else None
+            return self.validators[object_type]
+
+    def properties(self, object_type: str) -> Optional[List[Dict[str, Any]]]:
+        path = os.path.join(self.directory, f"{self.portal_key}.{object_type}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if time.time() - cached["fetched"] < self.ttl:
+                return cached["results"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        try:
+            response = self.fetch(f"{self.base_url}/crm/v3/properties/{object_type}")
+            results = response.json().get("results", [])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Could not load the {object_type} schema ({e}); sending {object_type} unvalidated. "
+                           f"Validation needs read access to its properties (crm.schemas.*.read scopes).")
+            return None
+        if not results:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"object_type": object_type, "fetched": time.time(), "results": results}, f)
+        logger.info(f"Fetched {len(results)} {object_type} properties (cached for {self.ttl / 3600:g}h).")
+        return results
@@ -0,0 +1,28 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional: faster request body encoding when installed
+    orjson = None
+
+# Name of the encoder in use, reported in metrics
+ENCODER = "orjson" if orjson is not None else "json"
+
+
+def dumps(data: Any) -> bytes:
+    """Compact JSON as UTF-8 bytes, with orjson when it is installed."""
+    if orjson is not None:
+        # Non-string keys are stringified like the json module does instead of being rejected
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_payload(data: Any) -> bytes:
+    """Request body for `data`. Records rendered from a PayloadTemplate reuse its pre-encoded constant part."""
+    template = getattr(data, "template", None)
+    if template is not None:
+        encoded = template.encode(data)
+        if encoded is not None:
+            return encoded
+    return dumps(data)
@@ -0,0 +1,165 @@
+import os
+import csv
+import gzip
+import json
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Optional, Callable
+from .config import SINK_OUTPUT_DIR, SINK_CHUNK_SIZE
+from .utils import chunked
+from .metrics import METRICS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: only needed for --sink parquet
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+
+class BaseSink(ABC):
+    """
+    Offline alternative to HubSpotInserter: writes generated records to one file per object type
+    instead of calling the API. Records are consumed in chunks, so a streamed dataset never has
+    to be held in memory.
+    """
+    extension = ""
+    journal = None  # Sinks are re-runnable from the seed, nothing to resume
+
+    def __init__(self, output_dir: str = SINK_OUTPUT_DIR, chunk_size: int = SINK_CHUNK_SIZE):
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.written: Dict[str, int] = {}
+        self.write_time = 0.0
+
+    def path_for(self, object_type: str) -> str:
+        return os.path.join(self.output_dir, f"{object_type}{self.extension}")
+
+    def batch_insert(self, object_type: str, records: Iterable[Dict[str, Any]], start_offset: int = 0,
+                     on_created: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        """Write all records for `object_type`. Returns no IDs since nothing is created in HubSpot."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = self.path_for(object_type)
+        logger.info(f"Writing {object_type} to {path}...")
+
+        count = 0
+        elapsed = 0.0
+        with self._open(path) as f:
+            for index, chunk in enumerate(chunked(records, self.chunk_size)):
+                # Timed per chunk: with a streamed dataset, pulling the chunk includes generating it
+                start = time.perf_counter()
+                self._write_chunk(f, chunk, first=index == 0)
+                elapsed += time.perf_counter() - start
+                count += len(chunk)
+        self.write_time += elapsed
+        METRICS.inc("sink_write_seconds_total", elapsed, sink=type(self).__name__)
+        METRICS.inc("records_written_total", count, object_type=object_type)
+
+        self.written[object_type] = self.written.get(object_type, 0) + count
+        logger.info(f"Wrote {count} {object_type} to {path}.")
+        return []
+
+    @abstractmethod
+    def _open(self, path: str):
+        """Open the output file; the returned object must be a context manager."""
+
+    @abstractmethod
+    def _write_chunk(self, f, chunk: List[Dict[str, Any]], first: bool):
+        """Write one chunk of records."""
+
+    def log_timing_summary(self):
+        total = sum(self.written.values())
+        if total:
+            logger.info(f"Wrote {total} records in {self.write_time:.2f}s "
+                        f"({total / max(self.write_time, 1e-9):.0f} records/sec).")
+
+    def close(self):
+        pass
+
+
+class NDJSONSink(BaseSink):
+    """One JSON document per line, exactly the dicts the generators produce."""
+    extension = ".ndjson"
+
+    def _open(self, path: str):
+        return open(path, "w", encoding="utf-8")
+
+    def _write_chunk(self, f, chunk: List[Dict[str, Any]], first: bool):
+        f.write("".join(json.dumps(record, default=str) + "\n" for record in chunk))
+
+
+class CSVSink(BaseSink):
+    """
+    Gzipped CSV in HubSpot's import layout: a header row of property internal names,
+    one record per row. Nested values (e.g. form configuration) are JSON-encoded.
+    """
+    extension = ".csv.gz"
+
+    def __init__(self, output_dir: str = SINK_OUTPUT_DIR, chunk_size: int = SINK_CHUNK_SIZE, compress: bool = True):
+        super().__init__(output_dir, chunk_size)
+        self.compress = compress
+        if not compress:
+            self.extension = ".csv"
+        self.columns: Optional[List[str]] = None
+        self.writer = None
+
+    def _open(self, path: str):
+        if self.compress:
+            return gzip.open(path, "wt", encoding="utf-8", newline="")
+        return open(path, "w", encoding="utf-8", newline="")
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return "" if value is None else value
+
+    def _write_chunk(self, f, chunk: List[Dict[str, Any]], first: bool):
+        if first:
+            # Column set is fixed by the first chunk: generators emit the same keys for every record
+            self.columns = list(dict.fromkeys(key for record in chunk for key in record))
+            self.writer = csv.writer(f)
+            self.writer.writerow(self.columns)
+        self.writer.writerows([self._cell(record.get(column)) for column in self.columns] for record in chunk)
+
+
+class ParquetSink(BaseSink):
+    """Columnar Parquet, one row group per chunk. Requires pyarrow."""
+    extension = ".parquet"
+
+    def __init__(self, output_dir: str = SINK_OUTPUT_DIR, chunk_size: int = SINK_CHUNK_SIZE):
+        if pa is None:
+            raise ImportError("The parquet sink requires pyarrow. Install it with: pip install pyarrow")
+        super().__init__(output_dir, chunk_size)
+        self.path: Optional[str] = None
+        self.writer = None
+
+    def _open(self, path: str):
+        self.path = path
+        self.writer = None
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.writer is not None:
+            self.writer.close()
+
+    def _write_chunk(self, f, chunk: List[Dict[str, Any]], first: bool):
+        if first:
+            table = pa.Table.from_pylist(chunk)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pylist(chunk, schema=self.writer.schema)
+        self.writer.write_table(table)
+
+
+SINKS = {
+    "ndjson": NDJSONSink,
+    "csv": CSVSink,
+    "parquet": ParquetSink,
+}
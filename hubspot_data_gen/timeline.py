@@ -0,0 +1,161 @@
+import time
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Tuple
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+
+# Relative activity per hour of the day for "business-hours": office hours, shoulders, night
+BUSINESS_HOUR_WEIGHTS = [0.02] * 7 + [0.2, 0.6] + [1.0] * 8 + [0.6, 0.3, 0.2] + [0.05] * 4
+# Relative activity per day of the week (Monday first) for "weekdays"
+WEEKDAY_WEIGHTS = [1.0, 1.1, 1.1, 1.0, 0.8, 0.15, 0.1]
+
+PROFILE_TERMS = ("uniform", "business-hours", "weekdays", "growth=FACTOR", "exp-growth=FACTOR", "tz=HOURS")
+
+
+def _parse_moment(value: str, end: bool = False) -> datetime:
+    """ISO date or datetime (UTC unless it has an offset). A bare end date includes that whole day."""
+    moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    if end and len(value.strip()) == 10:
+        moment += timedelta(days=1)
+    return moment
+
+
+def parse_time_range(value: str, now: Optional[float] = None) -> Tuple[int, int]:
+    """
+    (start, end) epoch milliseconds of a --time-range: "2024-01-01..2024-12-31" (dates or ISO datetimes),
+    or "90d" for the last 90 days up to now. Both ends are rounded down to the hour.
+    Raises ValueError for anything else.
+    """
+    value = value.strip()
+    if value.endswith("d") and value[:-1].isdigit():
+        end = int((time.time() if now is None else now) * 1000)
+        start = end - int(value[:-1]) * DAY_MS
+    elif ".." in value:
+        first, last = value.split("..", 1)
+        start = int(_parse_moment(first).timestamp() * 1000)
+        end = int(_parse_moment(last, end=True).timestamp() * 1000)
+    else:
+        raise ValueError(f"'{value}' is not START..END or a number of days like 90d.")
+    start -= start % HOUR_MS
+    end -= end % HOUR_MS
+    if end <= start:
+        raise ValueError(f"'{value}' must span at least one hour.")
+    return start, end
+
+
+class Timeline:
+    """
+    Distribution of record timestamps over a period. Each hour of the period gets a weight, the product
+    of the profile's terms:
+
+        business-hours     activity peaks 9:00-17:00 and is low at night
+        weekdays           busier Monday to Thursday, quiet at weekends
+        growth=F           activity grows linearly, ending F times higher than it started
+        exp-growth=F       activity grows exponentially, ending F times higher
+        tz=H               hours and days above are local to UTC+H (UTC by default)
+
+    sample() draws a whole block of timestamps at once: one weighted choice of hours over the
+    precomputed cumulative weights, plus a uniform offset within each hour.
+    """
+
+    def __init__(self, start_ms: int, end_ms: int, profile: str = "uniform"):
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.profile = profile
+        self.terms = self.parse_profile(profile)
+        self._build()
+
+    @classmethod
+    def from_spec(cls, time_range: str, profile: Optional[str] = None) -> "Timeline":
+        """Timeline for the --time-range and --time-profile options. Raises ValueError for invalid ones."""
+        start_ms, end_ms = parse_time_range(time_range)
+        return cls(start_ms, end_ms, profile or "uniform")
+
+    @staticmethod
+    def parse_profile(profile: str) -> Dict[str, float]:
+        terms: Dict[str, float] = {}
+        for term in filter(None, (part.strip() for part in profile.split(","))):
+            name, _, value = term.partition("=")
+            if name in ("uniform", "business-hours", "weekdays") and not value:
+                terms[name] = 1.0
+            elif name in ("growth", "exp-growth", "tz") and value:
+                try:
+                    terms[name] = float(value)
+                except ValueError:
+                    raise ValueError(f"'{term}': {value} is not a number.") from None
+                if name != "tz" and terms[name] <= 0:
+                    raise ValueError(f"'{term}': the growth factor must be positive.")
+            else:
+                raise ValueError(f"Unknown time profile term '{term}' (use {', '.join(PROFILE_TERMS)}).")
+        return terms
+
+    def _build(self):
+        """Weight every hour of the period and keep the running totals random.choices draws from."""
+        hours = (self.end_ms - self.start_ms) // HOUR_MS
+        offset_ms = int(self.terms.get("tz", 0) * HOUR_MS)
+        growth = self.terms.get("growth")
+        exp_growth = self.terms.get("exp-growth")
+
+        weights = []
+        for index in range(hours):
+            local_ms = self.start_ms + index * HOUR_MS + offset_ms
+            weight = 1.0
+            if "business-hours" in self.terms:
+                weight *= BUSINESS_HOUR_WEIGHTS[local_ms // HOUR_MS % 24]
+            if "weekdays" in self.terms:
+                # The epoch was a Thursday
+                weight *= WEEKDAY_WEIGHTS[(local_ms // DAY_MS + 3) % 7]
+            position = index / max(1, hours - 1)
+            if growth is not None:
+                weight *= 1 + (growth - 1) * position
+            if exp_growth is not None:
+                weight *= exp_growth ** position
+            weights.append(weight)
+
+        self.hour_starts = range(self.start_ms, self.end_ms, HOUR_MS)
+        self.cum_weights = list(accumulate(weights))
+
+    def sample(self, rng: random.Random, count: int) -> List[int]:
+        """`count` timestamps (epoch milliseconds) drawn from the distribution, in no particular order."""
+        hours = rng.choices(self.hour_starts, cum_weights=self.cum_weights, k=count)
+        return [hour + int(rng.random() * HOUR_MS) for hour in hours]
+
+    # Generators are rebuilt in worker processes and cached by their constructor arguments,
+    # so timelines are pickled as their spec and compared by it
+
+    def _spec(self) -> Tuple[int, int, str]:
+        return self.start_ms, self.end_ms, self.profile
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Timeline) and self._spec() == other._spec()
+
+    def __hash__(self) -> int:
+        return hash(self._spec())
+
+    def __getstate__(self) -> Tuple[int, int, str]:
+        return self._spec()
+
+    def __setstate__(self, state: Tuple[int, int, str]):
+        self.__init__(*state)
+
+    def range_spec(self) -> str:
+        """The period as an absolute START..END --time-range, e.g. to pin "90d" for a later --resume."""
+        return f"{to_datetime(self.start_ms)}..{to_datetime(self.end_ms)}"
+
+    def __repr__(self) -> str:
+        return f"Timeline({self.start_ms}, {self.end_ms}, {self.profile!r})"
+
+
+def to_date(epoch_ms: int) -> str:
+    """YYYY-MM-DD (UTC) of an epoch milliseconds timestamp."""
+    return (datetime(1970, 1, 1) + timedelta(milliseconds=epoch_ms)).strftime("%Y-%m-%d")
+
+
+def to_datetime(epoch_ms: int) -> str:
+    """ISO datetime (UTC) of an epoch milliseconds timestamp."""
+    return (datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(milliseconds=epoch_ms)).isoformat()
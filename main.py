@@ -1,8 +1,9 @@
 import argparse
 import sys
 import os
+import random
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Configure logging
 root_logger = logging.getLogger()
@@ -28,14 +29,23 @@ root_logger.addHandler(file_handler)
 
 logger = logging.getLogger(__name__)
 
-from hubspot_data_gen.generators import (
-    ContactGenerator, CompanyGenerator, DealGenerator, TicketGenerator,
-    CampaignGenerator, FormGenerator, MeetingGenerator, 
-    EmailEngagementGenerator, MarketingEventGenerator,
-    CallGenerator, TaskGenerator, NoteGenerator, ProductGenerator,
-    MarketingEmailGenerator
-)
 from hubspot_data_gen.inserter import HubSpotInserter
+from hubspot_data_gen.async_inserter import AsyncHubSpotInserter, BlockingAsyncInserter
+from hubspot_data_gen.journal import RunJournal
+from hubspot_data_gen.importer import HubSpotImporter
+from hubspot_data_gen.flows import run_single_object, run_graph, run_marketing_orchestration
+from hubspot_data_gen.sinks import SINKS
+from hubspot_data_gen.metrics import METRICS, Metrics
+from hubspot_data_gen.portals import PortalFanOut, load_portals
+from hubspot_data_gen.timeline import Timeline, PROFILE_TERMS
+from hubspot_data_gen.config import (
+    DEFAULT_CONCURRENCY, DEFAULT_RATE_LIMIT, JOURNAL_DIR, SINK_OUTPUT_DIR, IMPORT_THRESHOLD, GRAPH_FAN_OUT,
+    MAX_BATCH_BYTES, SCHEMA_CACHE_TTL, API_BASE_URL
+)
+
+# Arguments that determine the generated dataset; stored in the journal so --resume regenerates it exactly
+RESUMABLE_PARAMS = ("object", "count", "all_marketing", "graph", "fan_out", "seed", "fast", "upsert", "portals",
+                    "time_range", "time_profile")
 
 def main():
     parser = argparse.ArgumentParser(description="Generate and insert dummy data into HubSpot.")
@@ -50,111 +60,285 @@ def main():
                         help="Generate data but do not insert into HubSpot.")
     parser.add_argument("--all-marketing", action="store_true",
                         help="Run full marketing flow: Assets -> Campaigns -> Linking.")
+    parser.add_argument("--graph", action="store_true",
+                        help="Generate associated CRM records: --count companies, with contacts, deals and "
+                             "engagements fanned out beneath them.")
+    parser.add_argument("--fan-out", nargs="+", metavar="TYPE=RATIO", default=None,
+                        help="Override --graph ratios, e.g. contacts=5 (per company) deals=0.2 notes=2 (per contact).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Number of batch requests to keep in flight at once.")
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT,
+                        help="Maximum API requests per 10 seconds (HubSpot's burst limit unit).")
+    parser.add_argument("--pool-size", type=int, default=None,
+                        help="HTTP connection pool size (defaults to --concurrency).")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Gzip-compress large request bodies.")
+    parser.add_argument("--batch-bytes", type=int, default=MAX_BATCH_BYTES,
+                        help="Target request body size per batch; large records get fewer than 100 per batch.")
+    parser.add_argument("--validate", action="store_true",
+                        help="Check CRM records against the portal's property definitions before sending them.")
+    parser.add_argument("--schema-ttl", type=float, default=SCHEMA_CACHE_TTL,
+                        help="Seconds cached property definitions stay valid (0 refetches them).")
+    parser.add_argument("--async-io", action="store_true",
+                        help="Send requests from asyncio tasks (requires aiohttp); speeds up forms, marketing "
+                             "emails and events, which have no batch API. Use a higher --concurrency.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to generate records.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Master seed for reproducible output (independent of --workers).")
+    parser.add_argument("--fast", action="store_true",
+                        help="Sample field values from pre-generated pools instead of calling Faker per record.")
+    parser.add_argument("--time-range", metavar="RANGE", default=None,
+                        help="Spread record dates (hs_timestamp, closedate, campaign dates) over a period: "
+                             "START..END (ISO dates or datetimes, UTC) or e.g. 90d for the last 90 days.")
+    parser.add_argument("--time-profile", metavar="TERMS", default=None,
+                        help=f"How dates are distributed over --time-range, comma-separated: "
+                             f"{', '.join(PROFILE_TERMS)}. Default: uniform.")
+    parser.add_argument("--upsert", action="store_true",
+                        help="Upsert CRM records on a unique key (email for contacts, data_gen_id otherwise) so "
+                             "reruns with the same --seed update records instead of duplicating them.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream records from the generator into the inserter instead of building the full list first.")
+    parser.add_argument("--sink", choices=["api", "import"] + list(SINKS), default="api",
+                        help="Where records go: the HubSpot API (batch/create or the bulk Imports API), "
+                             "or local NDJSON / gzipped CSV / Parquet files.")
+    parser.add_argument("--import-threshold", type=int, default=IMPORT_THRESHOLD,
+                        help="Use the bulk Imports API automatically at or above this many CRM records (0 disables).")
+    parser.add_argument("--output-dir", default=SINK_OUTPUT_DIR,
+                        help="Directory for file sinks (one file per object type).")
+    parser.add_argument("--resume", metavar="RUN_ID", default=None,
+                        help="Resume an interrupted run, skipping chunks its journal records as completed.")
+    parser.add_argument("--purge", metavar="RUN_ID", default=None,
+                        help="Archive/delete every record an earlier run created, using its journal.")
+    parser.add_argument("--portals", metavar="FILE", default=None,
+                        help="JSON/YAML file listing portals (tokens and limits) to seed concurrently with the same data.")
+    parser.add_argument("--metrics-out", metavar="PATH", default=None,
+                        help="Export run metrics (latency, statuses, retries, waits) as Prometheus text "
+                             "(.prom/.txt) or JSON.")
 
     args = parser.parse_args()
+
+    if args.purge:
+        run_purge(args)
+        return
+
+    journal = None
+    if args.resume:
+        journal = RunJournal(args.resume)
+        if not journal.params:
+            logger.error(f"No journal found for run {args.resume} in '{JOURNAL_DIR}'.")
+            sys.exit(1)
+        for name, value in journal.params.items():
+            setattr(args, name, value)
+        logger.info(f"Resuming run {args.resume}...")
     
     # Validation
-    if not args.object and not args.all_marketing:
+    if not args.object and not args.all_marketing and not args.graph:
         parser.print_help()
         sys.exit(1)
 
+    if args.graph:
+        if args.upsert:
+            parser.error("--graph can't be combined with --upsert: batch/upsert doesn't accept inline associations.")
+        if args.sink != "api":
+            # Later layers need the IDs created by earlier ones, which only batch/create returns
+            parser.error("--graph requires --sink api.")
+        if args.fan_out and not args.resume:
+            args.fan_out = parse_fan_out(parser, args.fan_out)
+
+    timeline = None
+    if args.time_range:
+        try:
+            timeline = Timeline.from_spec(args.time_range, args.time_profile)
+        except ValueError as e:
+            parser.error(f"--time-range/--time-profile: {e}")
+        # The journal keeps the resolved period, so resuming a "90d" run regenerates the same dates
+        args.time_range = timeline.range_spec()
+    elif args.time_profile:
+        parser.error("--time-profile requires --time-range.")
+
+    if args.async_io and (args.graph or args.sink != "api"):
+        parser.error("--async-io supports --object and --all-marketing with --sink api.")
+
+    portals = None
+    if args.portals:
+        if args.sink not in ("api", "import"):
+            parser.error("--portals requires --sink api or import.")
+        try:
+            portals = load_portals(args.portals)
+        except (OSError, ValueError, ImportError) as e:
+            parser.error(f"--portals: {e}")
+
     # Pre-flight Check: Token
-    if not args.dry_run:
-        token = os.getenv("HUBSPOT_ACCESS_TOKEN")
-        if not token:
-            logger.error("HUBSPOT_ACCESS_TOKEN environment variable not set.")
-            logger.error("Please set it before running in live mode.")
-            logger.error("Example (PowerShell): $env:HUBSPOT_ACCESS_TOKEN = 'your-token'")
-            sys.exit(1)
+    if not args.dry_run and args.sink in ("api", "import"):
+        if not portals:
+            check_token()
 
-    inserter = HubSpotInserter()
+        if journal is None:
+            if args.seed is None:
+                # Resuming regenerates the same records, so every journaled run needs a seed
+                args.seed = random.SystemRandom().randrange(2 ** 32)
+                if args.upsert:
+                    logger.info(f"Upsert keys derive from seed {args.seed}; pass --seed {args.seed} "
+                                f"to update these records in later runs.")
+            journal = RunJournal(RunJournal.new_run_id())
+            journal.write_params({name: getattr(args, name) for name in RESUMABLE_PARAMS})
+        logger.info(f"Run ID: {journal.run_id} (resume with --resume {journal.run_id})")
+
+    portal_journals = []
+    try:
+        if portals:
+            # Every portal gets its own inserter and journal (<run-id>-<portal>), fed from one generated dataset
+            inserters = {}
+            for portal in portals:
+                portal_journal = None
+                if journal:
+                    portal_journal = RunJournal(f"{journal.run_id}-{portal.name}")
+                    if not portal_journal.params:
+                        portal_journal.write_params({**journal.params, "portal": portal.name})
+                    portal_journals.append(portal_journal)
+                inserters[portal.name] = build_inserter(args, portal_journal, portal)
+            logger.info(f"Seeding {len(portals)} portals: {', '.join(inserters)}")
+            inserter = PortalFanOut(inserters)
+        elif args.sink in ("api", "import"):
+            inserter = build_inserter(args, journal)
+        else:
+            # File sinks expose the same batch_insert surface, so the run functions don't change
+            inserter = SINKS[args.sink](output_dir=args.output_dir)
+    except ImportError as e:
+        # Optional dependency of the chosen sink or backend (pyarrow, aiohttp)
+        logger.error(str(e))
+        sys.exit(1)
 
     try:
-        if args.all_marketing:
-            run_marketing_orchestration(inserter, args.count, args.dry_run)
+        if args.graph:
+            for_each_portal(inserter, lambda target: run_graph(
+                target, args.count, args.dry_run, args.workers, args.seed, args.fast, args.fan_out, timeline))
+        elif args.all_marketing:
+            for_each_portal(inserter, lambda target: run_marketing_orchestration(
+                target, args.count, args.dry_run, args.workers, args.seed, timeline))
         else:
-            run_single_object(inserter, args.object, args.count, args.dry_run)
+            # Given a PortalFanOut, the records are generated once and sent to every portal
+            run_single_object(inserter, args.object, args.count, args.dry_run, args.workers, args.seed,
+                              args.stream, args.fast, args.upsert, timeline)
     except Exception as e:
         logger.critical(f"An unexpected error occurred: {e}")
         # In debug mode (or if user wants) we could re-raise.
         # raise e 
+    finally:
+        inserter.log_timing_summary()
+        inserter.close()
+        if isinstance(inserter, PortalFanOut):
+            inserter.merge_metrics(METRICS)
+        write_metrics(args.metrics_out)
+        for portal_journal in portal_journals:
+            portal_journal.close()
+            portal_journal.write_manifest()
+        if journal:
+            journal.close()
+            logger.info(f"Created IDs saved to {journal.write_manifest()} (remove them with --purge {journal.run_id})")
 
-def get_generator(obj_type: str):
-    if obj_type == "contacts": return ContactGenerator()
-    elif obj_type == "companies": return CompanyGenerator()
-    elif obj_type == "deals": return DealGenerator()
-    elif obj_type == "tickets": return TicketGenerator()
-    elif obj_type == "campaigns": return CampaignGenerator()
-    elif obj_type == "forms": return FormGenerator()
-    elif obj_type == "meetings": return MeetingGenerator()
-    elif obj_type == "emails": return EmailEngagementGenerator()
-    elif obj_type == "marketing_events": return MarketingEventGenerator()
-    elif obj_type == "calls": return CallGenerator()
-    elif obj_type == "tasks": return TaskGenerator()
-    elif obj_type == "notes": return NoteGenerator()
-    elif obj_type == "products": return ProductGenerator()
-    elif obj_type == "marketing_emails": return MarketingEmailGenerator()
-    return None
-
-def run_single_object(inserter, obj_type, count, dry_run):
-    generator = get_generator(obj_type)
-    if not generator:
-        logger.error(f"Unknown Object: {obj_type}")
+def build_inserter(args, journal: Optional[RunJournal], portal=None):
+    """API inserter for the run, for one portal of a --portals run when `portal` is given."""
+    dead_letter_path = os.path.join(JOURNAL_DIR, f"{journal.run_id}.dead_letter.jsonl") if journal else None
+    settings = {}
+    if portal:
+        settings = {"token": portal.token, "base_url": portal.base_url or API_BASE_URL, "metrics": Metrics()}
+    inserter_class = AsyncHubSpotInserter if args.async_io else HubSpotInserter
+    inserter = inserter_class(concurrency=(portal and portal.concurrency) or args.concurrency,
+                              rate_limit=(portal and portal.rate_limit) or args.rate_limit,
+                              pool_size=(portal and portal.pool_size) or args.pool_size,
+                              gzip_requests=args.gzip, journal=journal,
+                              dead_letter_path=dead_letter_path, upsert=args.upsert,
+                              max_batch_bytes=args.batch_bytes, validate=args.validate,
+                              schema_ttl=args.schema_ttl, **settings)
+    if args.async_io:
+        # The run functions are synchronous; the asyncio inserter runs on its own event loop thread
+        return BlockingAsyncInserter(inserter)
+    large_load = bool(args.import_threshold) and args.count >= args.import_threshold
+    if args.sink == "import" or (large_load and args.object and HubSpotImporter.supports(args.object)):
+        # One CSV upload instead of a batch/create call per 100 records
+        logger.info("Using the HubSpot Imports API for CRM objects.")
+        inserter = HubSpotImporter(inserter)
+    return inserter
+
+def for_each_portal(inserter, flow):
+    """Run `flow(inserter)`, concurrently for every portal of a --portals run."""
+    if isinstance(inserter, PortalFanOut):
+        return inserter.run_each(flow)
+    return flow(inserter)
+
+def write_metrics(path: Optional[str]):
+    METRICS.log_summary()
+    if path:
+        METRICS.write(path)
+
+def check_token():
+    if not os.getenv("HUBSPOT_ACCESS_TOKEN"):
+        logger.error("HUBSPOT_ACCESS_TOKEN environment variable not set.")
+        logger.error("Please set it before running in live mode.")
+        logger.error("Example (PowerShell): $env:HUBSPOT_ACCESS_TOKEN = 'your-token'")
+        sys.exit(1)
+
+def run_purge(args):
+    journal = RunJournal(args.purge)
+    if not journal.params:
+        logger.error(f"No journal found for run {args.purge} in '{JOURNAL_DIR}'.")
+        sys.exit(1)
+
+    if journal.params.get("portals"):
+        # Each portal's records are in its own journal and removed with its own token
+        try:
+            portals = load_portals(journal.params["portals"])
+        except (OSError, ValueError, ImportError) as e:
+            logger.error(f"Can't read the portals of run {args.purge}: {e}")
+            sys.exit(1)
+        for portal in portals:
+            purge_journal(args, RunJournal(f"{args.purge}-{portal.name}"), portal)
         return
 
-    logger.info(f"Generating {count} {obj_type}...")
-    try:
-        data = generator.generate(count)
-    except Exception as e:
-         logger.error(f"Failed to generate data for {obj_type}: {e}")
-         return
+    if not args.dry_run:
+        check_token()
+    purge_journal(args, journal)
 
-    if dry_run:
-        logger.info(f"Dry run for {obj_type}. Example:")
-        print(data[0] if data else "No data") # Keep print for data output to be clean
-    else:
-        inserter.batch_insert(obj_type, data)
+def purge_journal(args, journal: RunJournal, portal=None):
+    manifest = journal.manifest()
+    if any(object_type == "import" for object_type, _ in journal.completed):
+        logger.warning("Records loaded through the Imports API have no IDs in the journal and are not purged.")
+    if not manifest:
+        logger.warning(f"Run {journal.run_id} created no records.")
+        return
 
-def run_marketing_orchestration(inserter, count, dry_run):
-    logger.info("=== Starting Marketing Hub Orchestration ===")
-    
-    # 1. Generate Assets
-    # Forms
-    form_gen = FormGenerator()
-    logger.info(f"Generating forms...")
-    forms_data = form_gen.generate(max(1, count // 2))
-    form_ids = []
-    
-    if not dry_run:
-        form_ids = inserter.batch_insert("forms", forms_data)
-    else:
-        logger.info(f"[Dry Run] Generated {len(forms_data)} forms.")
-
-    # 2. Generate Campaigns
-    camp_gen = CampaignGenerator()
-    logger.info(f"Generating campaigns...")
-    camp_data = camp_gen.generate(max(1, count // 5)) 
-    camp_ids = []
-    
-    if not dry_run:
-        camp_ids = inserter.batch_insert("campaigns", camp_data)
-        
-        # 3. Add Budget/Spend
-        if camp_ids:
-            inserter.insert_campaign_sub_items(camp_ids, camp_gen)
-        
-        # 4. Link Assets
-        if camp_ids and form_ids:
-            asset_map = {
-                "form": form_ids 
-            }
-            inserter.associate_assets_to_campaigns(camp_ids, asset_map)
-        elif not camp_ids:
-            logger.warning("No campaigns created, skipping linking.")
-        
-    else:
-        logger.info(f"[Dry Run] Generated {len(camp_data)} campaigns + Budget/Spend simulation.")
-        logger.info(f"[Dry Run] Would link {len(forms_data)} forms to these campaigns.")
+    logger.info(f"=== Purging run {journal.run_id}: "
+                + ", ".join(f"{len(ids)} {object_type}" for object_type, ids in manifest.items()) + " ===")
+    settings = {"token": portal.token, "base_url": portal.base_url or API_BASE_URL} if portal else {}
+    inserter = HubSpotInserter(concurrency=(portal and portal.concurrency) or args.concurrency,
+                               rate_limit=(portal and portal.rate_limit) or args.rate_limit,
+                               pool_size=(portal and portal.pool_size) or args.pool_size,
+                               gzip_requests=args.gzip, **settings)
+    try:
+        # Latest object types first, so engagements go before the contacts they hang off
+        for object_type, ids in reversed(list(manifest.items())):
+            if args.dry_run:
+                logger.info(f"[Dry Run] Would remove {len(ids)} {object_type}.")
+            else:
+                inserter.archive(object_type, ids)
+    finally:
+        inserter.log_timing_summary()
+        inserter.close()
+        write_metrics(args.metrics_out)
+
+def parse_fan_out(parser, values: List[str]) -> Dict[str, float]:
+    fan_out = {}
+    for value in values:
+        object_type, _, ratio = value.partition("=")
+        if object_type not in GRAPH_FAN_OUT:
+            parser.error(f"--fan-out: unknown object type '{object_type}' (choose from {', '.join(GRAPH_FAN_OUT)}).")
+        try:
+            fan_out[object_type] = float(ratio)
+        except ValueError:
+            parser.error(f"--fan-out: '{value}' is not TYPE=RATIO.")
+    return fan_out
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,48 @@
+import json
+import pytest
+import requests
+
+
+def _error(url, status, body):
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response._content = json.dumps(body).encode("utf-8")
+    return requests.exceptions.HTTPError(f"{status} Client Error for url: {url}", response=response)
+
+
+class FakePortal:
+    """
+    Stands in for HubSpotInserter._request. Batch/create calls fail like HubSpot's: with a 400 listing
+    the errors `reject` returns for invalid records, or a 403 for batches holding a record `forbid` matches.
+    IDs are numbered from `first_id` in creation order.
+    """
+
+    def __init__(self, reject=None, forbid=None, first_id=0):
+        self.reject = reject or (lambda properties: [])
+        self.forbid = forbid or (lambda properties: False)
+        self.first_id = first_id
+        self.calls = 0
+        self.created = []
+
+    def __call__(self, method, url, json_data=None, files=None):
+        self.calls += 1
+        records = [item["properties"] for item in json.loads(json_data.data)["inputs"]]
+        errors = [error for properties in records for error in self.reject(properties)]
+        if errors:
+            raise _error(url, 400, {"status": "error", "message": "Property values were not valid",
+                                    "category": "VALIDATION_ERROR", "errors": errors})
+        if any(self.forbid(properties) for properties in records):
+            raise _error(url, 403, {"status": "error", "message": "Missing scopes", "category": "MISSING_SCOPES"})
+
+        ids = [str(self.first_id + len(self.created) + i) for i in range(len(records))]
+        self.created.extend(records)
+        response = requests.Response()
+        response.status_code = 201
+        response._content = json.dumps({"results": [{"id": record_id} for record_id in ids]}).encode("utf-8")
+        return response
+
+
+@pytest.fixture
+def fake_portal():
+    return FakePortal
@@ -0,0 +1,136 @@
+import json
+import asyncio
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from hubspot_data_gen.async_inserter import AsyncHubSpotInserter
+from hubspot_data_gen.inserter import HubSpotInserter
+from hubspot_data_gen.journal import RunJournal
+from hubspot_data_gen.schema import RecordValidator
+from hubspot_data_gen.generators import ContactGenerator
+from hubspot_data_gen.mock_server import MockHubSpotServer
+from hubspot_data_gen.metrics import Metrics
+
+DEAL_PROPERTIES = [
+    {"name": "dealname", "type": "string"},
+    {"name": "amount", "type": "number"},
+    {"name": "dealstage", "type": "enumeration",
+     "options": [{"value": "appointmentscheduled"}, {"value": "closedwon"}]},
+]
+
+
+def test_validate_with_async_backend(tmp_path):
+    deals = [{"dealname": f"Deal {i}", "amount": str(i * 100), "dealstage": "closedwon"} for i in range(20)]
+    deals[7]["dealstage"] = "bogus"
+    dead_letter = tmp_path / "dead_letter.jsonl"
+
+    async def insert(server):
+        inserter = AsyncHubSpotInserter(token="mock", base_url=server.url, concurrency=4, rate_limit=1000,
+                                        metrics=Metrics(), dead_letter_path=str(dead_letter), validate=True)
+        inserter.schema.directory = str(tmp_path / "schemas")
+        try:
+            return await inserter.batch_insert("deals", deals)
+        finally:
+            await inserter.close()
+
+    with MockHubSpotServer(latency=0, properties={"deals": DEAL_PROPERTIES}) as server:
+        ids = asyncio.run(insert(server))
+        stats = server.snapshot()
+
+    assert len(ids) == 19
+    assert stats["route:properties"] == 1
+    rejected = [json.loads(line) for line in dead_letter.read_text().splitlines()]
+    assert [entry["record"]["dealname"] for entry in rejected] == ["Deal 7"]
+
+
+def test_backends_agree_on_rejected_batches(tmp_path):
+    contacts = ContactGenerator(seed=3).generate(300)
+    created = {}
+    with MockHubSpotServer(latency=0, reject_rate=0.05) as server:
+        settings = {"token": "mock", "base_url": server.url, "concurrency": 4, "rate_limit": 1000}
+
+        inserter = HubSpotInserter(metrics=Metrics(), dead_letter_path=str(tmp_path / "sync.jsonl"), **settings)
+        created["sync"] = inserter.batch_insert("contacts", contacts)
+        inserter.close()
+
+        async def insert():
+            inserter = AsyncHubSpotInserter(metrics=Metrics(), dead_letter_path=str(tmp_path / "async.jsonl"),
+                                            **settings)
+            try:
+                return await inserter.batch_insert("contacts", contacts)
+            finally:
+                await inserter.close()
+        created["async"] = asyncio.run(insert())
+
+    rejected = {backend: len((tmp_path / f"{backend}.jsonl").read_text().splitlines()) for backend in created}
+    assert rejected["sync"] > 0
+    assert rejected["sync"] == rejected["async"]
+    assert len(created["sync"]) == len(created["async"]) == len(contacts) - rejected["sync"]
+
+
+def test_records_created_before_a_failed_split_are_kept_on_resume(tmp_path, fake_portal):
+    deals = [{"dealname": f"Deal {i}", "dealstage": "closedwon"} for i in range(100)]
+    deals[10]["dealstage"] = "bogus"  # Dropped by schema validation
+    # Deal 20 splits the batch; the half with Deal 70 then fails with an error splitting can't fix
+    portal = fake_portal(reject=lambda properties: [{"message": "Invalid", "code": "INVALID_OPTION", "context": {}}]
+                         if properties["dealname"] == "Deal 20" else [],
+                         forbid=lambda properties: properties["dealname"] == "Deal 70")
+
+    async def insert(portal, journal):
+        inserter = AsyncHubSpotInserter(token="mock", base_url="http://hubspot.test", concurrency=4,
+                                        rate_limit=100000, metrics=Metrics(), journal=journal, validate=True)
+        inserter.schema.validators["deals"] = RecordValidator("deals", DEAL_PROPERTIES)
+
+        async def request(method, url, json_data=None):
+            return portal(method, url, json_data)
+        inserter._request = request
+        try:
+            return await inserter.batch_insert("deals", deals)
+        finally:
+            await inserter.close()
+            journal.close()
+
+    ids = asyncio.run(insert(portal, RunJournal("partial", str(tmp_path))))
+
+    assert len(ids) == 48
+    assert {record["dealname"] for record in portal.created} == {f"Deal {i}" for i in range(50)} - {"Deal 10", "Deal 20"}
+
+    retry = fake_portal()
+    ids = asyncio.run(insert(retry, RunJournal("partial", str(tmp_path))))
+
+    assert len(ids) == 98
+    assert [record["dealname"] for record in retry.created] == [f"Deal {i}" for i in range(50, 100)]
+
+
+def test_inherited_entry_points_are_coroutines_or_blocked():
+    # Sync helpers that send no requests themselves
+    sync_methods = {"close", "timing_summary", "log_timing_summary"}
+    inserter = AsyncHubSpotInserter(token="mock", base_url="http://hubspot.test", metrics=Metrics())
+    for name in dir(HubSpotInserter):
+        if name.startswith("_") or name in sync_methods or not callable(getattr(HubSpotInserter, name)):
+            continue
+        method = getattr(AsyncHubSpotInserter, name)
+        if asyncio.iscoroutinefunction(method):
+            continue
+        with pytest.raises(NotImplementedError):
+            getattr(inserter, name)("contacts", ["1"])
+
+
+def test_batch_insert_many_with_async_backend():
+    datasets = {"contacts": ContactGenerator(seed=5).generate(120),
+                "deals": [{"dealname": f"Deal {i}", "dealstage": "closedwon"} for i in range(30)]}
+
+    async def insert(server):
+        inserter = AsyncHubSpotInserter(token="mock", base_url=server.url, concurrency=4, rate_limit=1000,
+                                        metrics=Metrics())
+        try:
+            return await inserter.batch_insert_many(datasets)
+        finally:
+            await inserter.close()
+
+    with MockHubSpotServer(latency=0) as server:
+        created = asyncio.run(insert(server))
+
+    assert {object_type: [position for position, _ in placed] for object_type, placed in created.items()} == \
+        {object_type: list(range(len(records))) for object_type, records in datasets.items()}
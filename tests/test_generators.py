@@ -0,0 +1,38 @@
+import pytest
+
+from hubspot_data_gen.generators import ContactGenerator, NoteGenerator, TicketGenerator
+from hubspot_data_gen.config import GENERATION_SHARD_SIZE
+from hubspot_data_gen.timeline import Timeline
+
+COUNT = GENERATION_SHARD_SIZE * 2 + 17
+# Fixed dates instead of ones relative to now, and small pools so fast mode sets up quickly
+SETTINGS = {"timeline": Timeline.from_spec("2024-01-01..2024-06-30"), "pool_size": 200}
+
+
+@pytest.mark.parametrize("generator_cls, fast", [
+    (ContactGenerator, False), (ContactGenerator, True), (NoteGenerator, True), (TicketGenerator, False),
+])
+def test_output_is_the_same_for_any_number_of_workers(generator_cls, fast):
+    single = generator_cls(seed=42, fast=fast, **SETTINGS).generate(COUNT, workers=1)
+    parallel = generator_cls(seed=42, fast=fast, **SETTINGS).generate(COUNT, workers=3)
+
+    assert len(single) == COUNT
+    assert parallel == single
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_start_offset_skips_the_leading_records(workers):
+    full = ContactGenerator(seed=7, fast=True, **SETTINGS).generate(COUNT)
+    start = GENERATION_SHARD_SIZE + 5  # Inside the second shard
+
+    resumed = ContactGenerator(seed=7, fast=True, **SETTINGS)
+    assert resumed.generate(COUNT, workers=workers, start=start) == full[start:]
+    assert list(resumed.iter_generate(COUNT, workers=workers, start=start)) == full[start:]
+
+
+def test_keys_follow_record_positions():
+    full = ContactGenerator(seed=3, keyed=True).generate(50)
+    resumed = ContactGenerator(seed=3, keyed=True).generate(50, start=20)
+
+    assert resumed == full[20:]
+    assert len({record["email"] for record in full}) == 50
@@ -0,0 +1,60 @@
+from hubspot_data_gen.graph import GraphOrchestrator, ENGAGEMENT_TYPES
+from hubspot_data_gen.inserter import HubSpotInserter
+from hubspot_data_gen.journal import RunJournal
+from hubspot_data_gen.metrics import Metrics
+
+
+class _Generator:
+    def __init__(self, object_type):
+        self.object_type = object_type
+
+    def generate(self, count, workers=1, start=0):
+        return [{"name": f"{self.object_type} {i}"} for i in range(start, count)]
+
+
+def _rejected_contact(properties):
+    if properties["name"] != "contacts 7":
+        return []
+    return [{"message": "Email address is invalid", "code": "INVALID_EMAIL",
+             "context": {"propertyName": ["email"]}}]
+
+
+def _graph(tmp_path, portal, journal=None):
+    inserter = HubSpotInserter(token="mock", base_url="http://hubspot.test", rate_limit=100000, metrics=Metrics(),
+                               dead_letter_path=str(tmp_path / "dead_letter.jsonl"), journal=journal)
+    inserter._request = portal
+    fan_out = {"contacts": 10, "deals": 1, **{object_type: 0 for object_type in ENGAGEMENT_TYPES}}
+    return GraphOrchestrator(inserter, lambda object_type, seed, fast: _Generator(object_type), fan_out, seed=1)
+
+
+def test_rejected_contact_only_loses_its_own_edges(tmp_path, fake_portal):
+    portal = fake_portal(reject=_rejected_contact)
+    graph = _graph(tmp_path, portal)
+
+    ids = graph.run(2)
+
+    def position(record_id):
+        return int(portal.created[int(record_id)]["name"].split()[1])
+
+    assert len(ids["contacts"]) == 19
+    assert len(graph.contact_company) == 19
+    for contact_id, company_id in graph.contact_company.items():
+        assert company_id == graph.parents["contacts"][position(contact_id)]
+    for contact_id, deal_ids in graph.contact_deals.items():
+        for deal_id in deal_ids:
+            assert graph.parents["deals"][position(deal_id)] == contact_id
+
+
+def test_resumed_graph_keeps_edges_of_records_after_a_rejected_one(tmp_path, fake_portal):
+    journal = RunJournal("graph", str(tmp_path))
+    graph = _graph(tmp_path, fake_portal(reject=_rejected_contact), journal)
+    graph.run(2)
+    journal.close()
+
+    retry = fake_portal()
+    resumed = _graph(tmp_path, retry, RunJournal("graph", str(tmp_path)))
+    resumed.run(2)
+
+    assert retry.created == []
+    assert resumed.contact_company == graph.contact_company
+    assert resumed.contact_deals == graph.contact_deals
@@ -0,0 +1,70 @@
+import json
+
+from hubspot_data_gen.importer import HubSpotImporter
+from hubspot_data_gen.inserter import HubSpotInserter
+from hubspot_data_gen.journal import RunJournal
+from hubspot_data_gen.generators import ContactGenerator
+from hubspot_data_gen.mock_server import MockHubSpotServer
+from hubspot_data_gen.metrics import Metrics
+
+
+def _importer(tmp_path, server, journal=None):
+    inserter = HubSpotInserter(token="mock", base_url=server.url, rate_limit=100000, metrics=Metrics(),
+                               journal=journal)
+    return HubSpotImporter(inserter, poll_interval=0, report_dir=str(tmp_path))
+
+
+def _row_errors(count):
+    return [{"errorType": "INVALID_EMAIL", "sourceData": {"lineNumber": line}} for line in range(2, count + 2)]
+
+
+def test_import_is_uploaded_polled_and_its_errors_saved(tmp_path):
+    contacts = ContactGenerator(seed=1).generate(25)
+    with MockHubSpotServer(latency=0, import_polls=2, import_errors=_row_errors(15)) as server:
+        importer = _importer(tmp_path, server)
+        ids = importer.batch_insert("contacts", contacts)
+        importer.close()
+        stats = server.snapshot()
+        (import_id, request), = server.imports.items()
+
+    assert ids == []
+    assert stats["imported"] == 25
+    assert stats["route:import"] == 1
+    assert stats["route:import_status"] == 3  # Two PROCESSING replies, then DONE
+    assert stats["route:import_errors"] == 2  # Pages of 10 and 5 rows
+    mappings = request["files"][0]["fileImportPage"]["columnMappings"]
+    assert {mapping["columnName"] for mapping in mappings} == set(contacts[0])
+    assert [mapping["columnName"] for mapping in mappings if "idColumnType" in mapping] == ["email"]
+
+    report = (tmp_path / f"import_{import_id}.errors.jsonl").read_text().splitlines()
+    assert [json.loads(line)["sourceData"]["lineNumber"] for line in report] == list(range(2, 17))
+
+
+def test_resumed_import_is_polled_not_uploaded_again(tmp_path):
+    contacts = ContactGenerator(seed=1).generate(10)
+    with MockHubSpotServer(latency=0, import_state="FAILED") as server:
+        journal = RunJournal("import", str(tmp_path))
+        _importer(tmp_path, server, journal).batch_insert("contacts", contacts)
+        journal.close()
+        server.reset()
+
+        resumed = RunJournal("import", str(tmp_path))
+        _importer(tmp_path, server, resumed).batch_insert("contacts", contacts)
+        resumed.close()
+        stats = server.snapshot()
+
+    assert stats.get("route:import", 0) == 0
+    assert stats["route:import_status"] == 1
+
+
+def test_failed_upload_is_not_polled(tmp_path, monkeypatch):
+    contacts = ContactGenerator(seed=1).generate(10)
+    monkeypatch.setattr(HubSpotInserter._post_file_with_retry.retry, "sleep", lambda seconds: None)
+    with MockHubSpotServer(latency=0, error_rate=1.0) as server:
+        importer = _importer(tmp_path, server)
+        ids = importer.batch_insert("contacts", contacts)
+        stats = server.snapshot()
+
+    assert ids == []
+    assert stats["route:import"] == 3  # Retried, then given up
+    assert "route:import_status" not in stats
@@ -0,0 +1,101 @@
+import json
+
+from hubspot_data_gen.inserter import HubSpotInserter
+from hubspot_data_gen.journal import RunJournal
+from hubspot_data_gen.metrics import Metrics
+
+
+def _inserter(tmp_path, portal, journal=None):
+    inserter = HubSpotInserter(token="mock", base_url="http://hubspot.test", rate_limit=100000, metrics=Metrics(),
+                               dead_letter_path=str(tmp_path / "dead_letter.jsonl"), journal=journal)
+    inserter._request = portal
+    return inserter
+
+
+def _dead_lettered(tmp_path):
+    return [json.loads(line)["record"] for line in (tmp_path / "dead_letter.jsonl").read_text().splitlines()]
+
+
+def _bogus_stage(properties):
+    if properties["dealstage"] != "bogus":
+        return []
+    return [{"message": "bogus is not a valid option", "code": "INVALID_OPTION",
+             "context": {"propertyName": ["dealstage"]}}]
+
+
+def _deals(count):
+    return [{"dealname": f"Deal {i}", "dealstage": "closedwon"} for i in range(count)]
+
+
+def test_one_invalid_value_in_a_large_chunk_is_isolated(tmp_path, fake_portal):
+    deals = _deals(100)
+    deals[42]["dealstage"] = "bogus"
+
+    ids = _inserter(tmp_path, fake_portal(reject=_bogus_stage)).batch_insert("deals", deals)
+
+    assert len(ids) == 99
+    assert [record["dealname"] for record in _dead_lettered(tmp_path)] == ["Deal 42"]
+
+
+def test_unknown_property_in_every_record_is_not_bisected(tmp_path, fake_portal):
+    deals = [{"dealname": f"Deal {i}", "not_a_property": "x"} for i in range(100)]
+    portal = fake_portal(reject=lambda properties: [
+        {"message": "Property \"not_a_property\" does not exist", "code": "PROPERTY_DOESNT_EXIST",
+         "context": {"propertyName": ["not_a_property"]}}
+    ])
+
+    ids = _inserter(tmp_path, portal).batch_insert("deals", deals)
+
+    assert ids == []
+    assert portal.calls == 1
+    assert len(_dead_lettered(tmp_path)) == 100
+
+
+def test_records_created_before_a_failed_split_are_kept_on_resume(tmp_path, fake_portal):
+    deals = _deals(100)
+    deals[10]["dealstage"] = "bogus"
+    # The bogus deal splits the batch; the second half then fails with an error splitting can't fix
+    portal = fake_portal(reject=_bogus_stage, forbid=lambda properties: properties["dealname"] == "Deal 70")
+    journal = RunJournal("partial", str(tmp_path))
+
+    ids = _inserter(tmp_path, portal, journal).batch_insert("deals", deals)
+    journal.close()
+
+    assert len(ids) == 49
+    assert [record["dealname"] for record in portal.created] == [f"Deal {i}" for i in range(50) if i != 10]
+
+    resumed = RunJournal("partial", str(tmp_path))
+    retry = fake_portal(reject=_bogus_stage)
+    ids = _inserter(tmp_path, retry, resumed).batch_insert("deals", deals)
+
+    assert len(ids) == 99
+    assert [record["dealname"] for record in retry.created] == [f"Deal {i}" for i in range(50, 100)]
+
+
+def test_resume_after_nested_split_failures_creates_every_record_once(tmp_path, fake_portal):
+    deals = _deals(250)
+    for i in (10, 30, 160):
+        deals[i]["dealstage"] = "bogus"
+    # Fails part-way through bisecting the first chunk and in the middle of the second
+    portal = fake_portal(reject=_bogus_stage,
+                         forbid=lambda properties: properties["dealname"] in ("Deal 40", "Deal 180"))
+    journal = RunJournal("nested", str(tmp_path))
+    first = _inserter(tmp_path, portal, journal).batch_insert("deals", deals)
+    journal.close()
+
+    retry = fake_portal(reject=_bogus_stage, first_id=len(portal.created))
+    journal = RunJournal("nested", str(tmp_path))
+    ids = _inserter(tmp_path, retry, journal).batch_insert("deals", deals)
+    journal.close()
+
+    valid = [f"Deal {i}" for i in range(250) if i not in (10, 30, 160)]
+    created = [record["dealname"] for record in portal.created + retry.created]
+    assert 0 < len(first) < len(valid)
+    assert sorted(created) == sorted(valid)
+    assert set(first) <= set(ids)
+    # The retry numbers its IDs after the first run's, so each ID names the record created for it
+    assert [created[int(record_id)] for record_id in ids] == valid
+
+    again = fake_portal(reject=_bogus_stage)
+    assert len(_inserter(tmp_path, again, RunJournal("nested", str(tmp_path))).batch_insert("deals", deals)) == 247
+    assert again.calls == 0
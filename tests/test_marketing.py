@@ -0,0 +1,47 @@
+import pytest
+
+from hubspot_data_gen.inserter import HubSpotInserter
+from hubspot_data_gen.marketing import MarketingOrchestrator
+from hubspot_data_gen.mock_server import MockHubSpotServer
+from hubspot_data_gen.metrics import Metrics
+
+
+def _inserter(backend, server):
+    settings = {"token": "mock", "base_url": server.url, "concurrency": 4, "rate_limit": 100000, "metrics": Metrics()}
+    if backend == "sync":
+        return HubSpotInserter(**settings)
+    pytest.importorskip("aiohttp")
+    from hubspot_data_gen.async_inserter import AsyncHubSpotInserter, BlockingAsyncInserter
+    return BlockingAsyncInserter(AsyncHubSpotInserter(**settings))
+
+
+@pytest.mark.parametrize("backend", ["sync", "async"])
+def test_forms_are_linked_to_campaigns_that_were_created(backend):
+    with MockHubSpotServer(latency=0.01, reject_rate=0.3, seed=1) as server:
+        inserter = _inserter(backend, server)
+        target = getattr(inserter, "inserter", inserter)
+        links, calls = [], []
+        link_assets = inserter.link_assets
+
+        def spy(triples):
+            def recorded():
+                for triple in triples:
+                    links.append(triple)
+                    yield triple
+            calls.append(1)
+            return link_assets(recorded())
+        inserter.link_assets = spy
+        try:
+            created = MarketingOrchestrator(inserter, seed=5).run(60)
+        finally:
+            inserter.close()
+        stats = server.snapshot()
+
+    # Some of the 12 campaigns and 30 forms were rejected
+    assert 0 < len(created["campaigns"]) < 12
+    assert 0 < len(created["forms"]) < 30
+    assert [form_id for _, _, form_id in links] == created["forms"]
+    assert {campaign_id for campaign_id, _, _ in links} == set(created["campaigns"])
+    assert calls == [1]
+    assert stats["route:campaign_asset"] == len(created["forms"])
+    assert target.metrics.counter_total("http_requests_total") == stats["requests"]
@@ -0,0 +1,50 @@
+import time
+import asyncio
+
+from hubspot_data_gen.rate_limiter import TokenBucket, AsyncTokenBucket
+
+
+def test_burst_is_served_at_once_then_paced():
+    bucket = TokenBucket(rate=20, window=1.0, burst=5)
+
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # 4 more requests at 20/s need 0.2s once the burst is spent
+    assert 0.18 <= elapsed < 0.4
+
+
+def test_idle_time_refills_only_up_to_the_burst():
+    bucket = TokenBucket(rate=100, window=1.0, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    time.sleep(0.1)  # Worth 10 tokens, capped at 3
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0] * 3
+    assert bucket.acquire() > 0
+
+
+def test_pause_and_remaining_budget_hold_back_tokens():
+    bucket = TokenBucket(rate=1000, window=1.0)
+    bucket.update_remaining(0)
+    assert bucket.acquire() > 0
+
+    bucket.pause(0.1)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_async_bucket_paces_concurrent_tasks():
+    bucket = AsyncTokenBucket(rate=50, window=1.0, burst=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        return time.monotonic() - start
+
+    # One token at once, the other 5 at 50/s
+    assert 0.09 <= asyncio.run(run()) < 0.3